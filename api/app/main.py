@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -5,10 +6,12 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app import models
+from app import models, tastytrade
 from app.db import engine
 from app.settings import settings
+from app.services.cache_service import get_cache, run_cache_sweeper
 from app.routers.v1 import (
+    admin as admin_v1,
     broker as broker_v1,
     hello as hello_v1,
     entries as entries_v1,
@@ -21,7 +24,12 @@ from app.routers.v1 import (
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 App starting…")
+    sweeper = asyncio.create_task(run_cache_sweeper())
     yield
+    sweeper.cancel()
+    get_cache().close()
+    tastytrade.get_token_manager().clear()
+    tastytrade.close_client()
 
 models.Base.metadata.create_all(bind=engine)
 app = FastAPI(
@@ -41,6 +49,7 @@ app.add_middleware(
 logging.basicConfig(level=logging.ERROR)
 
 app.include_router(hello_v1.router)
+app.include_router(admin_v1.router)
 app.include_router(broker_v1.router)
 app.include_router(entries_v1.router)
 app.include_router(trades_v1.router)
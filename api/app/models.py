@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, Date, Enum as SAEnum, ForeignKey, Integer, DateTime, UniqueConstraint, func
+from sqlalchemy import BigInteger, Column, String, Float, Date, Enum as SAEnum, ForeignKey, Integer, DateTime, Text, UniqueConstraint, func
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -156,3 +156,89 @@ class BrokerActivityDispositionORM(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+
+
+class BrokerActivitySessionORM(Base):
+    """Normalized, enriched review events for one account and completed session."""
+
+    __tablename__ = "broker_activity_sessions"
+    __table_args__ = (
+        UniqueConstraint(
+            "account_number",
+            "session_date",
+            name="uq_broker_activity_session_account_date",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_number = Column(String(32), nullable=False)
+    session_date = Column(Date, nullable=False, index=True)
+    payload = Column(Text, nullable=False)  # BrokerActivityAccountSessionV1 JSON
+    fetched_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class BrokerTransactionORM(Base):
+    """Append-only copy of a broker transaction, keyed by its broker id."""
+
+    __tablename__ = "broker_transactions"
+    __table_args__ = (
+        UniqueConstraint(
+            "account_number",
+            "transaction_id",
+            name="uq_broker_transaction_account_id",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_number = Column(String(32), nullable=False)
+    transaction_id = Column(String(64), nullable=False)
+    transaction_date = Column(Date, nullable=False, index=True)
+    executed_at = Column(DateTime, nullable=False)
+    payload = Column(Text, nullable=False)  # TastyTransaction JSON, by alias
+
+
+class BrokerTransactionSyncORM(Base):
+    """Contiguous window of transaction dates already mirrored for an account."""
+
+    __tablename__ = "broker_transaction_syncs"
+
+    account_number = Column(String(32), primary_key=True)
+    synced_from = Column(Date, nullable=False)
+    synced_through = Column(Date, nullable=False)  # high-water mark, refetched on sync
+    synced_at = Column(DateTime, nullable=False)
+
+
+class ChartBarORM(Base):
+    """Closed OHLCV bar archived from the chart source; never rewritten once stored."""
+
+    __tablename__ = "chart_bars"
+
+    symbol = Column(String(16), primary_key=True)
+    interval = Column(String(8), primary_key=True)
+    time = Column(BigInteger, primary_key=True)  # bar open, Unix milliseconds
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
+
+
+class ChartBarRangeORM(Base):
+    """Window of closed bars known to be complete for one symbol and interval."""
+
+    __tablename__ = "chart_bar_ranges"
+    __table_args__ = (
+        UniqueConstraint(
+            "symbol",
+            "interval",
+            "start_ts",
+            name="uq_chart_bar_range_symbol_interval_start",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(16), nullable=False, index=True)
+    interval = Column(String(8), nullable=False)
+    start_ts = Column(BigInteger, nullable=False)
+    end_ts = Column(BigInteger, nullable=False)
@@ -1 +1 @@
-from . import broker, charts, entries, hello, pivots, trades
+from . import admin, broker, charts, entries, hello, pivots, trades
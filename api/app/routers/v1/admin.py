@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from app.schemas.admin import CacheStatsV1
+from app.services.cache_service import get_cache
+
+router = APIRouter(prefix="/v1/admin", tags=["v1 - admin"])
+
+
+@router.get(
+    "/cache",
+    summary="Get global cache statistics",
+    response_model=CacheStatsV1,
+)
+async def get_cache_stats():
+    """Return hit, miss, eviction and approximate memory counters for the shared cache."""
+    return CacheStatsV1(**get_cache().stats())
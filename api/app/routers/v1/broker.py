@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import date, datetime, timezone
 
@@ -23,6 +24,7 @@ from app.schemas.brokerage import (
 )
 from app.settings import settings
 from app.services.activity_inbox_service import fetch_activity_inbox
+from app.services.activity_inbox_store import load_activity_inbox
 from app.services.activity_disposition_service import (
     apply_activity_dispositions,
     upsert_activity_disposition,
@@ -43,9 +45,9 @@ from app.services.trades_errors import TastytradeFetchError
 router = APIRouter(prefix="/v1/broker", tags=["v1 - broker"])
 
 
-def _token_or_403(db: Session) -> str:
+async def _token_or_403(db: Session) -> str:
     try:
-        return tastytrade.get_active_token(db)
+        return await tastytrade.get_active_token_async(db)
     except Exception as exc:
         logging.exception("Authentication to Tastytrade failed.")
         raise HTTPException(
@@ -71,15 +73,15 @@ def _watchlist_summary(watchlist) -> BrokerWatchlistSummaryV1:
     response_model=HoldingSnapshotV1,
     response_model_exclude_none=True,
 )
-def get_holdings(db: Session = Depends(get_db)):
+async def get_holdings(db: Session = Depends(get_db)):
     """
     Return every brokerage account and asset class. Empty or temporarily
     unavailable accounts remain in the response with explicit source status.
     This route does not replace the option-specific /v1/trades projection.
     """
-    token = _token_or_403(db)
+    token = await _token_or_403(db)
     try:
-        return fetch_holding_snapshot(token)
+        return await tastytrade.run_async(fetch_holding_snapshot, token)
     except TastytradeFetchError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -89,10 +91,10 @@ def get_holdings(db: Session = Depends(get_db)):
     summary="List private brokerage watchlists",
     response_model=BrokerWatchlistListV1,
 )
-def list_watchlists(db: Session = Depends(get_db)):
-    token = _token_or_403(db)
+async def list_watchlists(db: Session = Depends(get_db)):
+    token = await _token_or_403(db)
     try:
-        watchlists = tastytrade.fetch_watchlists(token)
+        watchlists = await tastytrade.fetch_watchlists_async(token)
     except requests.RequestException as exc:
         logging.exception("Fetching Tastytrade watchlists failed.")
         raise HTTPException(
@@ -111,15 +113,15 @@ def list_watchlists(db: Session = Depends(get_db)):
     response_model=BrokerWatchlistResearchV1,
     response_model_exclude_none=True,
 )
-def get_watchlist_research(db: Session = Depends(get_db)):
+async def get_watchlist_research(db: Session = Depends(get_db)):
     """
     Return every private brokerage watchlist with one enriched row per unique
     symbol. Price, volatility, persisted five-session trends, earnings
     availability, and all-account exposure retain explicit source status.
     """
-    token = _token_or_403(db)
+    token = await _token_or_403(db)
     try:
-        watchlists = tastytrade.fetch_watchlists(token)
+        watchlists = await tastytrade.fetch_watchlists_async(token)
     except requests.RequestException as exc:
         logging.exception("Fetching Tastytrade watchlists failed.")
         raise HTTPException(
@@ -144,7 +146,8 @@ def get_watchlist_research(db: Session = Depends(get_db)):
             items=[],
         )
 
-    context = fetch_research_symbol_context(
+    context = await tastytrade.run_async(
+        fetch_research_symbol_context,
         db,
         token,
         symbols,
@@ -166,7 +169,7 @@ def get_watchlist_research(db: Session = Depends(get_db)):
     summary="Add an equity symbol to a private brokerage watchlist",
     response_model=AddWatchlistSymbolResultV1,
 )
-def add_watchlist_symbol(
+async def add_watchlist_symbol(
     watchlist_name: str,
     request: AddWatchlistSymbolRequestV1,
     db: Session = Depends(get_db),
@@ -176,10 +179,10 @@ def add_watchlist_symbol(
             status_code=403,
             detail="Brokerage watchlist writes are disabled.",
         )
-    token = _token_or_403(db)
+    token = await _token_or_403(db)
     symbol = request.symbol.strip().upper()
     try:
-        watchlist, added = tastytrade.add_symbol_to_watchlist(
+        watchlist, added = await tastytrade.add_symbol_to_watchlist_async(
             token,
             watchlist_name,
             symbol,
@@ -208,16 +211,27 @@ def add_watchlist_symbol(
     response_model=BrokerActivityInboxV1,
     response_model_exclude_none=True,
 )
-def get_activity_inbox(
+async def get_activity_inbox(
     session_date: date | None = None,
     db: Session = Depends(get_db),
 ):
-    token = _token_or_403(db)
+    """
+    Return the review inbox for one session. Accounts from settled sessions
+    are served from the local store; only unfinished or missing accounts are
+    fetched from the broker and enriched with market context.
+    """
+    token = await _token_or_403(db)
     session_date = session_date or previous_us_equity_market_session()
     try:
-        inbox = fetch_activity_inbox(token, session_date)
-        inbox = apply_activity_dispositions(db, inbox)
-        return enrich_activity_market_context(inbox)
+        inbox = await tastytrade.run_async(
+            load_activity_inbox,
+            db,
+            token,
+            session_date,
+            fetch=fetch_activity_inbox,
+            enrich=enrich_activity_market_context,
+        )
+        return await asyncio.to_thread(apply_activity_dispositions, db, inbox)
     except TastytradeFetchError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -242,7 +256,7 @@ def put_activity_disposition(
     response_model=ResearchSymbolContextV1,
     response_model_exclude_none=True,
 )
-def get_research_symbol_context(
+async def get_research_symbol_context(
     request: ResearchSymbolContextRequestV1,
     db: Session = Depends(get_db),
 ):
@@ -252,9 +266,10 @@ def get_research_symbol_context(
     source failures remain explicit in the response instead of failing the
     complete batch.
     """
-    token = _token_or_403(db)
+    token = await _token_or_403(db)
     try:
-        return fetch_research_symbol_context(
+        return await tastytrade.run_async(
+            fetch_research_symbol_context,
             db,
             token,
             request.symbols,
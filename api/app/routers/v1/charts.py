@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from typing import Literal, Optional
 
@@ -8,13 +9,20 @@ from sqlalchemy.orm import Session
 from app import tastytrade
 from app.db import get_db
 from app.schemas.charts import (
+    ChartBatchRequest,
+    ChartBatchResponse,
+    ChartColumnsResponse,
     ChartResponse,
     EquityAnalysisPackageV1,
     PortfolioExposure,
     SourceStatus,
     SpotGammaContext,
 )
-from app.services.charts_service import get_chart_history
+from app.services.charts_service import (
+    get_chart_histories,
+    get_chart_history,
+    get_chart_history_columns,
+)
 from app.services.equity_analysis_service import (
     create_package,
     find_portfolio_exposure,
@@ -23,6 +31,10 @@ from app.services.equity_analysis_service import (
     render_markdown,
 )
 from app.routers.v1.trades import _load_positions_data
+from app.services.quote_cache_service import (
+    fetch_market_data_cached,
+    fetch_volatility_data_cached,
+)
 
 router = APIRouter(
     prefix="/v1/charts",
@@ -55,12 +67,48 @@ async def get_symbol_history(
     return get_chart_history(symbol, resolution, from_ts, to_ts)
 
 
+@router.get("/history/{symbol}/columns", response_model=ChartColumnsResponse)
+async def get_symbol_history_columns(
+    symbol: str,
+    resolution: str = Query(default="1d", description="Chart resolution (1d, 1h, 5m, etc.)"),
+    from_ts: Optional[int] = Query(default=None, description="Start timestamp (Unix)"),
+    to_ts: Optional[int] = Query(default=None, description="End timestamp (Unix)")
+) -> ChartColumnsResponse:
+    """
+    Same history as /history/{symbol}, as parallel arrays instead of bar objects.
+
+    Returns status "ok" with t (timestamps in milliseconds), o, h, l, c and v
+    arrays of equal length, ready for the UI chart without per-bar objects.
+    """
+    return await asyncio.to_thread(
+        get_chart_history_columns, symbol, resolution, from_ts, to_ts
+    )
+
+
+@router.post("/history:batch", response_model=ChartBatchResponse)
+async def get_batch_history(request: ChartBatchRequest) -> ChartBatchResponse:
+    """
+    Get chart history for many symbols with a single Yahoo Finance download.
+
+    Symbols already held by the bar store are served from memory. Each item
+    carries its own status, so one unknown symbol does not fail the batch.
+    """
+    items = await asyncio.to_thread(
+        get_chart_histories,
+        request.symbols,
+        request.resolution,
+        request.from_ts,
+        request.to_ts,
+    )
+    return ChartBatchResponse(items=list(items.values()))
+
+
 @router.get(
     "/analysis-package/{symbol}",
     response_model=EquityAnalysisPackageV1,
     response_model_exclude_none=True,
 )
-def get_equity_analysis_package(
+async def get_equity_analysis_package(
     symbol: str,
     resolution: str = Query(default="1d"),
     from_ts: Optional[int] = Query(default=None),
@@ -76,7 +124,12 @@ def get_equity_analysis_package(
     sg_notes: Optional[str] = Query(default=None),
     db: Session = Depends(get_db),
 ):
-    """Build one versioned, LLM-friendly package for single-stock analysis."""
+    """
+    Build one versioned, LLM-friendly package for single-stock analysis.
+
+    Chart history, broker quotes, volatility and portfolio exposure are
+    fetched concurrently; each source reports its own status.
+    """
     symbol = symbol.strip().upper()
     now = datetime.now()
     resolved_to = to_ts or int(now.timestamp())
@@ -90,27 +143,47 @@ def get_equity_analysis_package(
     volatility = None
     exposure = PortfolioExposure()
 
+    chart_task = asyncio.create_task(asyncio.to_thread(
+        get_chart_history,
+        symbol,
+        resolution,
+        resolved_from,
+        resolved_to,
+    ))
     try:
-        bars = get_chart_history(
-            symbol,
-            resolution,
-            resolved_from,
-            resolved_to,
-        ).bars
-        statuses.append(SourceStatus(source="yahoo_chart", status="ok"))
+        token = await tastytrade.get_active_token_async(db)
+        token_error = None
     except Exception as exc:
+        token = None
+        token_error = exc
+
+    if token is not None:
+        market_result, volatility_result, positions_result = await asyncio.gather(
+            tastytrade.run_async(fetch_market_data_cached, token, [symbol], [], [], []),
+            tastytrade.run_async(fetch_volatility_data_cached, token, [symbol]),
+            _load_positions_data(db),
+            return_exceptions=True,
+        )
+    else:
+        market_result = volatility_result = None
+        positions_result = (
+            await asyncio.gather(_load_positions_data(db), return_exceptions=True)
+        )[0]
+    chart_result = (await asyncio.gather(chart_task, return_exceptions=True))[0]
+
+    if isinstance(chart_result, Exception):
         statuses.append(SourceStatus(
             source="yahoo_chart",
             status="unavailable",
-            detail=str(getattr(exc, "detail", exc)),
+            detail=str(getattr(chart_result, "detail", chart_result)),
         ))
         warnings.append("Chart history is unavailable; do not infer price structure.")
+    else:
+        bars = chart_result.bars
+        statuses.append(SourceStatus(source="yahoo_chart", status="ok"))
 
-    token = None
-    try:
-        token = tastytrade.get_active_token(db)
-    except Exception as exc:
-        detail = str(exc)
+    if token_error is not None:
+        detail = str(token_error)
         statuses.extend([
             SourceStatus(source="tastytrade_market", status="unavailable", detail=detail),
             SourceStatus(source="tastytrade_volatility", status="unavailable", detail=detail),
@@ -118,11 +191,17 @@ def get_equity_analysis_package(
         warnings.append("Brokerage market and volatility context are unavailable.")
 
     if token is not None:
-        try:
-            market_items = tastytrade.fetch_market_data(token, [symbol], [], [], [])
+        if isinstance(market_result, Exception):
+            statuses.append(SourceStatus(
+                source="tastytrade_market",
+                status="unavailable",
+                detail=str(market_result),
+            ))
+            warnings.append("Current broker quote is unavailable.")
+        else:
             market_match = next(
                 (
-                    item for item in market_items
+                    item for item in market_result
                     if normalize_market(item).get("symbol", "").upper() == symbol
                 ),
                 None,
@@ -137,19 +216,18 @@ def get_equity_analysis_package(
                     detail="Symbol missing from broker response.",
                 ))
                 warnings.append("Current broker quote is unavailable.")
-        except Exception as exc:
+
+        if isinstance(volatility_result, Exception):
             statuses.append(SourceStatus(
-                source="tastytrade_market",
+                source="tastytrade_volatility",
                 status="unavailable",
-                detail=str(exc),
+                detail=str(volatility_result),
             ))
-            warnings.append("Current broker quote is unavailable.")
-
-        try:
-            volatility_items = tastytrade.fetch_volatility_data(token, [symbol])
+            warnings.append("Volatility and term-structure data are unavailable.")
+        else:
             volatility_match = next(
                 (
-                    item for item in volatility_items
+                    item for item in volatility_result
                     if str(normalize_market(item).get("symbol", "")).upper() == symbol
                     or str(getattr(item, "symbol", "")).upper() == symbol
                     or (
@@ -169,16 +247,11 @@ def get_equity_analysis_package(
                     detail="Symbol missing from broker response.",
                 ))
                 warnings.append("Volatility and term-structure data are unavailable.")
-        except Exception as exc:
-            statuses.append(SourceStatus(
-                source="tastytrade_volatility",
-                status="unavailable",
-                detail=str(exc),
-            ))
-            warnings.append("Volatility and term-structure data are unavailable.")
 
     try:
-        exposure = find_portfolio_exposure(_load_positions_data(db), symbol)
+        if isinstance(positions_result, Exception):
+            raise positions_result
+        exposure = find_portfolio_exposure(positions_result, symbol)
         statuses.append(SourceStatus(source="portfolio_exposure", status="ok"))
     except Exception as exc:
         statuses.append(SourceStatus(
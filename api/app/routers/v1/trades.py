@@ -1,6 +1,6 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import List
@@ -22,16 +22,19 @@ from app.settings import settings
 from app.services.trades_service import (
     acquire_token,
     fetch_accounts,
-    collect_positions_and_symbols,
-    fetch_market_and_beta_data,
-    augment_positions_with_market_data,
-    group_positions_and_compute_totals,
-    apply_volatility,
-    apply_balance,
+    load_positions_data_async,
     build_llm_positions_summary,
     build_market_data_summary,
     build_volatility_data_summary,
 )
+from app.services.positions_snapshot_service import (
+    PositionsSnapshot,
+    get_positions_snapshot_cache,
+)
+from app.services.quote_cache_service import (
+    fetch_market_data_cached,
+    fetch_volatility_data_cached,
+)
 from app.services.trades_errors import TastytradeAuthError, TastytradeFetchError
 
 router = APIRouter(
@@ -116,50 +119,43 @@ def _build_bracket_payload(req: BracketOrderRequest) -> tuple[dict, float, float
     return payload, take_profit_price, stop_loss_price
 
 
-def _load_positions_data(db: Session) -> list[dict]:
+async def _build_positions_data(db: Session) -> list[dict]:
     try:
-        token = acquire_token(db)
-        accounts = fetch_accounts(token)
-
-        (
-            positions_by_account,
-            equity_option_syms,
-            future_option_syms,
-            equity_underlyings,
-            future_underlyings,
-        ) = collect_positions_and_symbols(token, accounts)
-
-        market_map, beta_map = fetch_market_and_beta_data(
-            token,
-            equity_option_syms,
-            future_option_syms,
-            equity_underlyings,
-            future_underlyings,
-        )
-
-        augment_positions_with_market_data(positions_by_account, market_map, beta_map)
-
-        accounts_data = group_positions_and_compute_totals(positions_by_account, beta_map)
-
-        apply_volatility(token, accounts_data)
-        apply_balance(token, accounts_data)
-
-        return accounts_data
+        token = await tastytrade.run_async(acquire_token, db)
+        accounts = await tastytrade.run_async(fetch_accounts, token)
+        return await load_positions_data_async(token, accounts)
     except TastytradeAuthError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
     except TastytradeFetchError as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-def _get_tastytrade_token_or_403(db: Session) -> str:
+async def _positions_snapshot(db: Session, *, fresh: bool = False) -> PositionsSnapshot:
+    return await get_positions_snapshot_cache().get(
+        lambda: _build_positions_data(db),
+        fresh=fresh,
+    )
+
+
+async def _load_positions_data(db: Session, *, fresh: bool = False) -> list[dict]:
+    """Return the shared positions snapshot, rebuilding it once its TTL lapses."""
+    return (await _positions_snapshot(db, fresh=fresh)).accounts_data
+
+
+def _set_snapshot_headers(response: Response, snapshot: PositionsSnapshot) -> None:
+    response.headers["X-Positions-Snapshot-Age"] = f"{snapshot.age_seconds():.1f}"
+    response.headers["X-Positions-Snapshot-Version"] = str(snapshot.version)
+
+
+async def _get_tastytrade_token_or_403(db: Session) -> str:
     try:
-        return tastytrade.get_active_token(db)
+        return await tastytrade.get_active_token_async(db)
     except Exception as e:
         logging.error(f"Authentication to Tastytrade failed: {e}")
         raise HTTPException(status_code=403, detail=f"Authentication to Tastytrade failed: {e}") from e
 
 
-def _fetch_market_data_or_500(
+async def _fetch_market_data_or_500(
     token: str,
     equity: List[str],
     equity_option: List[str],
@@ -167,23 +163,25 @@ def _fetch_market_data_or_500(
     future_option: List[str],
 ):
     try:
-        return tastytrade.fetch_market_data(token, equity, equity_option, future, future_option)
+        return await tastytrade.run_async(
+            fetch_market_data_cached, token, equity, equity_option, future, future_option
+        )
     except Exception as e:
         logging.error(f"Failed to fetch market data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch market data: {e}") from e
 
 
-def _fetch_volatility_data_or_500(token: str, symbols: List[str]):
+async def _fetch_volatility_data_or_500(token: str, symbols: List[str]):
     try:
-        return tastytrade.fetch_volatility_data(token, symbols)
+        return await tastytrade.run_async(fetch_volatility_data_cached, token, symbols)
     except Exception as e:
         logging.error(f"Failed to fetch volatility data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch volatility data: {e}") from e
 
 
-def _place_complex_order_or_500(token: str, account_number: str, payload: dict):
+async def _place_complex_order_or_500(token: str, account_number: str, payload: dict):
     try:
-        return tastytrade.place_complex_order(token, account_number, payload)
+        return await tastytrade.place_complex_order_async(token, account_number, payload)
     except Exception as e:
         logging.error(f"Failed to submit bracket order: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to submit bracket order: {e}") from e
@@ -194,7 +192,11 @@ def _place_complex_order_or_500(token: str, account_number: str, payload: dict):
     summary="Get all non-equity positions grouped into reviewable strategies",
     response_model=PositionsResponse,
 )
-def get_all_positions(db: Session = Depends(get_db)):
+async def get_all_positions(
+    response: Response,
+    fresh: bool = Query(default=False, description="Bypass the cached positions snapshot"),
+    db: Session = Depends(get_db),
+):
     """
     Retrieve all positions across all accounts, excluding:
       - Entire accounts that have no non-Equity positions.
@@ -207,8 +209,12 @@ def get_all_positions(db: Session = Depends(get_db)):
          - total_credit_received using the quantity direction sign and group multiplier
         - current_group_p_l as the sum of the positions' approximate P/L values
         - percent_credit_received = int((current_group_p_l / abs(total_credit_received)) * 100), or None
+    Responses share a short-lived snapshot; X-Positions-Snapshot-Age reports its age
+    in seconds and ?fresh=true forces a rebuild.
     """
-    return PositionsResponse(accounts=_load_positions_data(db))
+    snapshot = await _positions_snapshot(db, fresh=fresh)
+    _set_snapshot_headers(response, snapshot)
+    return PositionsResponse(accounts=snapshot.accounts_data)
 
 
 @router.get(
@@ -216,21 +222,27 @@ def get_all_positions(db: Session = Depends(get_db)):
     summary="Get LLM-friendly positions summary",
     response_model=LlmPositionsSummaryResponse,
 )
-def get_positions_summary(db: Session = Depends(get_db)):
+async def get_positions_summary(
+    response: Response,
+    fresh: bool = Query(default=False, description="Bypass the cached positions snapshot"),
+    db: Session = Depends(get_db),
+):
     """
     Return positions with snake_case field names, numeric values, and no raw broker
     payload nesting. This is intended for LLM context and analysis.
     """
-    return build_llm_positions_summary(_load_positions_data(db))
+    snapshot = await _positions_snapshot(db, fresh=fresh)
+    _set_snapshot_headers(response, snapshot)
+    return build_llm_positions_summary(snapshot.accounts_data)
 
 @router.post("/market-data",summary="Get market data for symbols", response_model=List[dict])
-def get_market_data(equity: List[str], equity_option: List[str], future: List[str], future_option: List[str], db: Session = Depends(get_db)):
+async def get_market_data(equity: List[str], equity_option: List[str], future: List[str], future_option: List[str], db: Session = Depends(get_db)):
     """
     Fetch market data for the given symbols from the Tastytrade API.
     Returns a list of market data dictionaries.
     """
-    token = _get_tastytrade_token_or_403(db)
-    market_data = _fetch_market_data_or_500(token, equity, equity_option, future, future_option)
+    token = await _get_tastytrade_token_or_403(db)
+    market_data = await _fetch_market_data_or_500(token, equity, equity_option, future, future_option)
     return [_jsonable_tasty(item) for item in market_data]
 
 
@@ -240,12 +252,12 @@ def get_market_data(equity: List[str], equity_option: List[str], future: List[st
     response_model=MarketDataSummaryResponse,
     response_model_exclude_none=True,
 )
-def get_market_data_summary(req: MarketDataRequest, db: Session = Depends(get_db)):
+async def get_market_data_summary(req: MarketDataRequest, db: Session = Depends(get_db)):
     """
     Fetch market data and return a compact snake_case response with numeric fields.
     """
-    token = _get_tastytrade_token_or_403(db)
-    market_data = _fetch_market_data_or_500(
+    token = await _get_tastytrade_token_or_403(db)
+    market_data = await _fetch_market_data_or_500(
         token,
         req.equity,
         req.equity_option,
@@ -256,13 +268,13 @@ def get_market_data_summary(req: MarketDataRequest, db: Session = Depends(get_db
     return build_market_data_summary(market_data, requested_symbols)
 
 @router.post("/volatility-data",summary="Get volatility data for symbols", response_model=List[dict])
-def get_volatility_data(symbols: List[str], db: Session = Depends(get_db)):
+async def get_volatility_data(symbols: List[str], db: Session = Depends(get_db)):
     """
     Fetch volatility data for the given symbols from the Tastytrade API.
     Returns a list of volatility data dictionaries.
     """
-    token = _get_tastytrade_token_or_403(db)
-    volatility_data = _fetch_volatility_data_or_500(token, symbols)
+    token = await _get_tastytrade_token_or_403(db)
+    volatility_data = await _fetch_volatility_data_or_500(token, symbols)
     return [_jsonable_tasty(item) for item in volatility_data]
 
 
@@ -272,12 +284,12 @@ def get_volatility_data(symbols: List[str], db: Session = Depends(get_db)):
     response_model=VolatilityDataSummaryResponse,
     response_model_exclude_none=True,
 )
-def get_volatility_data_summary(req: VolatilityDataRequest, db: Session = Depends(get_db)):
+async def get_volatility_data_summary(req: VolatilityDataRequest, db: Session = Depends(get_db)):
     """
     Fetch volatility data and return percentage fields already scaled for humans.
     """
-    token = _get_tastytrade_token_or_403(db)
-    volatility_data = _fetch_volatility_data_or_500(token, req.symbols)
+    token = await _get_tastytrade_token_or_403(db)
+    volatility_data = await _fetch_volatility_data_or_500(token, req.symbols)
     return build_volatility_data_summary(volatility_data, req.symbols)
 
 
@@ -286,7 +298,7 @@ def get_volatility_data_summary(req: VolatilityDataRequest, db: Session = Depend
     summary="Submit a single-leg bracket (OCO) order",
     response_model=BracketOrderResponse,
 )
-def submit_bracket_order(req: BracketOrderRequest, db: Session = Depends(get_db)):
+async def submit_bracket_order(req: BracketOrderRequest, db: Session = Depends(get_db)):
     """
     Build an OCO payload from single-leg inputs and submit to Tastytrade unless dry_run is true.
     """
@@ -311,9 +323,9 @@ def submit_bracket_order(req: BracketOrderRequest, db: Session = Depends(get_db)
                 status_code=400,
                 detail="A reviewed order must be explicitly confirmed before live submission.",
             )
-        token = _get_tastytrade_token_or_403(db)
+        token = await _get_tastytrade_token_or_403(db)
         tasty_response = _jsonable_tasty(
-            _place_complex_order_or_500(token, req.account_number, payload)
+            await _place_complex_order_or_500(token, req.account_number, payload)
         )
 
     return BracketOrderResponse(
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class CacheStatsV1(BaseModel):
+    entries: int
+    max_entries: int
+    approximate_bytes: int
+    max_bytes: int
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    expirations: int
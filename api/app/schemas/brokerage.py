@@ -226,6 +226,20 @@ class BrokerActivityInboxV1(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class BrokerActivityAccountSessionV1(BaseModel):
+    """Stored slice of an inbox for one account and completed session."""
+
+    schema_version: Literal["broker-activity-account-session.v1"] = (
+        "broker-activity-account-session.v1"
+    )
+    account_number: str
+    session_date: date
+    events: list[BrokerActivityReviewEventV1]
+    source_status: list[SourceMetadataV1]
+
+    model_config = {"extra": "forbid"}
+
+
 class BrokerActivityDispositionRequestV1(BaseModel):
     activity_group_id: str = Field(min_length=1, max_length=512)
     session_date: date
@@ -26,6 +26,36 @@ class ChartResponse(BaseModel):
     }
 
 
+class ChartColumnsResponse(BaseModel):
+    """Columnar chart history: parallel arrays in TradingView UDF layout."""
+
+    s: str
+    t: List[int]
+    o: List[float]
+    h: List[float]
+    l: List[float]
+    c: List[float]
+    v: List[int]
+
+
+class ChartBatchRequest(BaseModel):
+    symbols: List[str] = Field(min_length=1, max_length=100)
+    resolution: str = "1d"
+    from_ts: Optional[int] = None
+    to_ts: Optional[int] = None
+
+
+class ChartBatchItem(BaseModel):
+    symbol: str
+    status: Literal["ok", "unavailable"]
+    bars: List[Bar] = Field(default_factory=list)
+    detail: Optional[str] = None
+
+
+class ChartBatchResponse(BaseModel):
+    items: List[ChartBatchItem]
+
+
 class AnalysisWindow(BaseModel):
     resolution: str
     from_ts: int
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -148,6 +149,7 @@ class MarketDataSnapshot(BaseModel):
     gamma: Optional[float] = None
     rho: Optional[float] = None
     implied_volatility: Optional[float] = None
+    as_of: Optional[datetime] = None
 
 
 class MarketDataSummaryResponse(BaseModel):
@@ -164,6 +166,7 @@ class VolatilityDataSnapshot(BaseModel):
     symbol: str
     iv_rank_percent: Optional[float] = None
     iv_5d_change_percent: Optional[float] = None
+    as_of: Optional[datetime] = None
 
 
 class VolatilityDataSummaryResponse(BaseModel):
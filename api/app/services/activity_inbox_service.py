@@ -1,9 +1,11 @@
 import logging
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 
 from app import tastytrade
 from app.schemas.brokerage import (
+    BrokerActivityAccountSessionV1,
     BrokerActivityEventV1,
     BrokerActivityInboxV1,
     BrokerActivityKind,
@@ -14,6 +16,7 @@ from app.schemas.brokerage import (
 )
 from app.services.brokerage_normalizer import normalize_activity_event
 from app.services.trades_errors import TastytradeFetchError
+from app.settings import settings
 from app.tastytrade_schema import TastyOrder, TastyTransaction
 
 
@@ -25,7 +28,20 @@ def fetch_activity_inbox(
     session_date: date,
     *,
     fetched_at: datetime | None = None,
+    max_workers: int = settings.activity_inbox_fetch_workers,
+    prefetch_pages: bool = settings.activity_inbox_prefetch_pages,
+    stored_accounts: Mapping[str, BrokerActivityAccountSessionV1] | None = None,
 ) -> BrokerActivityInboxV1:
+    """
+    Build the review inbox for one session across every account.
+
+    Orders and transactions for all accounts are fetched concurrently;
+    results are still assembled in account order, so source status and
+    warnings read exactly as a serial fetch would produce them. Accounts in
+    stored_accounts are not fetched; their stored events and source status
+    are used in place.
+    """
+    stored_accounts = stored_accounts or {}
     fetched_at = fetched_at or datetime.now(timezone.utc)
     date_text = session_date.isoformat()
     try:
@@ -47,19 +63,57 @@ def fetch_activity_inbox(
     warnings: list[str] = []
     review_events: list[BrokerActivityReviewEventV1] = []
 
+    def fetch_source(fetcher: Callable, account_number: str, per_page: int):
+        return _fetch_pages(
+            fetcher,
+            token,
+            account_number,
+            date_text,
+            per_page=per_page,
+            prefetch=prefetch_pages,
+        )
+
+    fresh_accounts = [
+        account
+        for account in accounts
+        if account.account_number not in stored_accounts
+    ]
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, 2 * len(fresh_accounts))),
+        thread_name_prefix="activity-inbox",
+    ) as executor:
+        pending = {
+            account.account_number: (
+                executor.submit(
+                    fetch_source,
+                    tastytrade.fetch_orders,
+                    account.account_number,
+                    100,
+                ),
+                executor.submit(
+                    fetch_source,
+                    tastytrade.fetch_transactions,
+                    account.account_number,
+                    2000,
+                ),
+            )
+            for account in fresh_accounts
+        }
+
     for account in accounts:
         account_number = account.account_number
+        stored = stored_accounts.get(account_number)
+        if stored is not None:
+            source_status.extend(stored.source_status)
+            review_events.extend(stored.events)
+            continue
+
+        orders_future, transactions_future = pending[account_number]
         orders: list[TastyOrder] = []
         transactions: list[TastyTransaction] = []
 
         try:
-            orders, truncated = _fetch_pages(
-                tastytrade.fetch_orders,
-                token,
-                account_number,
-                date_text,
-                per_page=100,
-            )
+            orders, truncated = orders_future.result()
             source_status.append(
                 _source_status(
                     account_number,
@@ -85,13 +139,7 @@ def fetch_activity_inbox(
             )
 
         try:
-            transactions, truncated = _fetch_pages(
-                tastytrade.fetch_transactions,
-                token,
-                account_number,
-                date_text,
-                per_page=2000,
-            )
+            transactions, truncated = transactions_future.result()
             source_status.append(
                 _source_status(
                     account_number,
@@ -317,11 +365,17 @@ def _fetch_pages(
     date_text: str,
     *,
     per_page: int,
+    prefetch: bool = False,
 ) -> tuple[list, bool]:
-    items = []
-    page_offset = 0
-    for _ in range(MAX_PAGES_PER_SOURCE):
-        page = fetcher(
+    """
+    Walk a paged source, returning its items and whether it was truncated.
+
+    With prefetch, once the first page reports total_pages the remaining
+    pages (up to MAX_PAGES_PER_SOURCE) are requested concurrently.
+    """
+
+    def fetch_page(page_offset: int):
+        return fetcher(
             token,
             account_number,
             start_date=date_text,
@@ -329,10 +383,32 @@ def _fetch_pages(
             page_offset=page_offset,
             per_page=per_page,
         )
+
+    first = fetch_page(0)
+    items = list(first.items)
+    if not first.has_more:
+        return items, False
+
+    if prefetch and first.total_pages:
+        last_offset = min(first.total_pages, MAX_PAGES_PER_SOURCE) - 1
+        with ThreadPoolExecutor(
+            max_workers=min(last_offset, 4) or 1,
+            thread_name_prefix="activity-pages",
+        ) as executor:
+            pages = list(executor.map(fetch_page, range(1, last_offset + 1)))
+        for page in pages:
+            items.extend(page.items)
+            if not page.has_more:
+                return items, False
+        page_offset = last_offset + 1
+    else:
+        page_offset = 1
+
+    for page_offset in range(page_offset, MAX_PAGES_PER_SOURCE):
+        page = fetch_page(page_offset)
         items.extend(page.items)
         if not page.has_more:
             return items, False
-        page_offset += 1
     return items, True
 
 
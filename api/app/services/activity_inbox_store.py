@@ -0,0 +1,150 @@
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import BrokerActivitySessionORM
+from app.schemas.brokerage import (
+    BrokerActivityAccountSessionV1,
+    BrokerActivityInboxV1,
+    DataStatus,
+)
+from app.services.activity_inbox_service import fetch_activity_inbox
+from app.services.activity_market_context_service import (
+    enrich_activity_market_context,
+)
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+# Late fills and corrections have posted by this time on the following day.
+SESSION_SETTLED_AT = time(4, 0)
+
+
+def is_session_settled(session_date: date, now: datetime | None = None) -> bool:
+    now = now or datetime.now(timezone.utc)
+    settled_at = datetime.combine(
+        session_date + timedelta(days=1),
+        SESSION_SETTLED_AT,
+        tzinfo=NEW_YORK,
+    )
+    return now >= settled_at
+
+
+def list_stored_activity(
+    db: Session,
+    session_date: date,
+) -> dict[str, BrokerActivityAccountSessionV1]:
+    rows = db.scalars(
+        select(BrokerActivitySessionORM).where(
+            BrokerActivitySessionORM.session_date == session_date
+        )
+    ).all()
+    return {
+        row.account_number: BrokerActivityAccountSessionV1.model_validate_json(
+            row.payload
+        )
+        for row in rows
+    }
+
+
+def _has_unavailable_context(event) -> bool:
+    context = event.market_context
+    if context is None:
+        return False
+    return any(
+        item is not None and item.status == DataStatus.UNAVAILABLE
+        for item in (context.underlying, context.benchmark)
+    )
+
+
+def store_settled_activity(
+    db: Session,
+    inbox: BrokerActivityInboxV1,
+    *,
+    skip_accounts: set[str] | frozenset[str] = frozenset(),
+) -> list[str]:
+    """
+    Persist every account whose orders and transactions both fetched cleanly.
+
+    Accounts with an unavailable or truncated source, or with an event whose
+    underlying or benchmark chart context is unavailable, are left out so the
+    next request fetches them again; stored events are never re-enriched.
+    Returns the stored account numbers.
+    """
+    statuses: dict[str, list] = {}
+    for source in inbox.source_status:
+        parts = (source.endpoint or "").split("/")
+        if len(parts) == 4 and parts[1] == "accounts":
+            statuses.setdefault(parts[2], []).append(source)
+
+    stored = []
+    for account_number, sources in statuses.items():
+        if account_number in skip_accounts:
+            continue
+        if len(sources) != 2 or any(
+            source.status != DataStatus.OK for source in sources
+        ):
+            continue
+        events = [
+            event
+            for event in inbox.events
+            if event.account_number == account_number
+        ]
+        if any(_has_unavailable_context(event) for event in events):
+            continue
+        record = BrokerActivityAccountSessionV1(
+            account_number=account_number,
+            session_date=inbox.session_date,
+            events=events,
+            source_status=sources,
+        )
+        db.add(
+            BrokerActivitySessionORM(
+                account_number=account_number,
+                session_date=inbox.session_date,
+                payload=record.model_dump_json(),
+                fetched_at=inbox.generated_at,
+            )
+        )
+        stored.append(account_number)
+    if stored:
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored the same session first.
+            db.rollback()
+            return []
+    return stored
+
+
+def load_activity_inbox(
+    db: Session,
+    token: str,
+    session_date: date,
+    *,
+    fetch: Callable[..., BrokerActivityInboxV1] = fetch_activity_inbox,
+    enrich: Callable[
+        [BrokerActivityInboxV1], BrokerActivityInboxV1
+    ] = enrich_activity_market_context,
+    now: datetime | None = None,
+) -> BrokerActivityInboxV1:
+    """
+    Return the enriched inbox, serving settled accounts from the local store.
+
+    Only accounts without a stored record hit the broker. Once the session
+    has settled, freshly fetched accounts whose sources were complete are
+    stored with their market context, so later reads of that session make
+    no broker or chart calls for them.
+    """
+    stored = list_stored_activity(db, session_date)
+    if stored:
+        inbox = fetch(token, session_date, stored_accounts=stored)
+    else:
+        inbox = fetch(token, session_date)
+    inbox = enrich(inbox)
+    if is_session_settled(session_date, now):
+        store_settled_activity(db, inbox, skip_accounts=set(stored))
+    return inbox
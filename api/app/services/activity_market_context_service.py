@@ -1,5 +1,10 @@
+import time as clock
+from bisect import bisect_left
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import date, datetime, time, timezone
+from functools import partial
 from zoneinfo import ZoneInfo
 
 from app.schemas.brokerage import (
@@ -9,8 +14,9 @@ from app.schemas.brokerage import (
     BrokerActivitySymbolContextV1,
     DataStatus,
 )
-from app.schemas.charts import ChartResponse
-from app.services.charts_service import get_chart_history
+from app.schemas.charts import Bar, ChartBatchItem, ChartResponse
+from app.services.charts_service import get_chart_histories
+from app.settings import settings
 
 
 NEW_YORK = ZoneInfo("America/New_York")
@@ -27,21 +33,71 @@ YAHOO_SYMBOLS = {
 
 
 ChartFetcher = Callable[[str, str, int, int], ChartResponse]
+BatchChartFetcher = Callable[[list[str], str, int, int], dict[str, ChartBatchItem]]
+
+
+@dataclass(frozen=True)
+class SessionBars:
+    """Sorted regular-session bars for one symbol with precomputed aggregates."""
+
+    bars: tuple[Bar, ...]
+    times: tuple[float, ...]  # bar open, Unix seconds, ascending
+    session_open: float
+    session_high: float
+    session_low: float
+    session_close: float
+
+    @classmethod
+    def from_bars(cls, bars: list[Bar]) -> "SessionBars":
+        return cls(
+            bars=tuple(bars),
+            times=tuple(bar.time / 1000 for bar in bars),
+            session_open=float(bars[0].open),
+            session_high=max(float(bar.high) for bar in bars),
+            session_low=min(float(bar.low) for bar in bars),
+            session_close=float(bars[-1].close),
+        )
+
+    def nearest(self, timestamp: float) -> Bar:
+        """Return the bar whose open is closest to timestamp; earlier wins ties."""
+        index = bisect_left(self.times, timestamp)
+        if index == 0:
+            return self.bars[0]
+        if index == len(self.times):
+            return self.bars[-1]
+        before, after = self.times[index - 1], self.times[index]
+        if timestamp - before <= after - timestamp:
+            return self.bars[index - 1]
+        return self.bars[index]
 
 
 def enrich_activity_market_context(
     inbox: BrokerActivityInboxV1,
     *,
     chart_fetcher: ChartFetcher | None = None,
+    batch_fetcher: BatchChartFetcher | None = None,
     benchmark_symbol: str = BENCHMARK_SYMBOL,
+    max_workers: int = settings.activity_chart_fetch_workers,
+    fetch_timeout_seconds: float = settings.activity_chart_fetch_timeout_seconds,
+    deadline_seconds: float = settings.activity_chart_fetch_deadline_seconds,
 ) -> BrokerActivityInboxV1:
+    """
+    Attach entry-time price context to every activity event with a symbol.
+
+    By default all underlyings and the benchmark are fetched in one batched
+    chart download; a per-symbol chart_fetcher replaces the batch call and
+    runs on up to max_workers threads. A fetch running longer than
+    fetch_timeout_seconds, or unfinished at deadline_seconds, is abandoned
+    and its symbol is reported unavailable.
+    """
     events_with_symbols = [
-        event for event in inbox.events if event.underlying_symbol
+        event
+        for event in inbox.events
+        if event.underlying_symbol and event.market_context is None
     ]
     if not events_with_symbols:
         return inbox
 
-    fetcher = chart_fetcher or get_chart_history
     symbols = {
         event.underlying_symbol.strip().upper()
         for event in events_with_symbols
@@ -51,23 +107,28 @@ def enrich_activity_market_context(
     symbols.add(benchmark_symbol)
 
     from_ts, to_ts = _session_window(inbox.session_date)
+    responses = _fetch_charts(
+        sorted(symbols),
+        from_ts,
+        to_ts,
+        chart_fetcher=chart_fetcher,
+        batch_fetcher=batch_fetcher or get_chart_histories,
+        max_workers=max_workers,
+        fetch_timeout_seconds=fetch_timeout_seconds,
+        deadline_seconds=deadline_seconds,
+    )
     bars_by_symbol = {}
     unavailable_symbols = set()
     for symbol in sorted(symbols):
-        source_symbol = _source_symbol(symbol)
-        try:
-            response = fetcher(
-                source_symbol,
-                "5m",
-                from_ts,
-                to_ts,
-            )
-            bars = _session_bars(response, inbox.session_date)
-            if bars:
-                bars_by_symbol[symbol] = bars
-            else:
-                unavailable_symbols.add(symbol)
-        except Exception:
+        response = responses.get(symbol)
+        bars = (
+            _session_bars(response, inbox.session_date)
+            if response is not None
+            else []
+        )
+        if bars:
+            bars_by_symbol[symbol] = SessionBars.from_bars(bars)
+        else:
             unavailable_symbols.add(symbol)
 
     for event in events_with_symbols:
@@ -75,13 +136,13 @@ def enrich_activity_market_context(
         underlying = _symbol_context(
             symbol,
             event.occurred_at,
-            bars_by_symbol.get(symbol, []),
+            bars_by_symbol.get(symbol),
             include_bars=True,
         )
         benchmark = _symbol_context(
             benchmark_symbol,
             event.occurred_at,
-            bars_by_symbol.get(benchmark_symbol, []),
+            bars_by_symbol.get(benchmark_symbol),
             include_bars=False,
         )
         warnings = list(dict.fromkeys([
@@ -102,6 +163,121 @@ def enrich_activity_market_context(
     return inbox
 
 
+def _fetch_charts(
+    symbols: list[str],
+    from_ts: int,
+    to_ts: int,
+    *,
+    chart_fetcher: ChartFetcher | None,
+    batch_fetcher: BatchChartFetcher,
+    max_workers: int,
+    fetch_timeout_seconds: float,
+    deadline_seconds: float,
+) -> dict[str, ChartResponse]:
+    """Return five-minute charts keyed by symbol; failed or late symbols are omitted."""
+    if chart_fetcher is not None:
+        return _run_with_deadline(
+            {
+                symbol: partial(
+                    chart_fetcher,
+                    _source_symbol(symbol),
+                    "5m",
+                    from_ts,
+                    to_ts,
+                )
+                for symbol in symbols
+            },
+            max_workers=max_workers,
+            timeout_seconds=fetch_timeout_seconds,
+            deadline_seconds=deadline_seconds,
+        )
+
+    items = _run_with_deadline(
+        {
+            "batch": partial(
+                batch_fetcher,
+                [_source_symbol(symbol) for symbol in symbols],
+                "5m",
+                from_ts,
+                to_ts,
+            )
+        },
+        max_workers=1,
+        timeout_seconds=deadline_seconds,
+        deadline_seconds=deadline_seconds,
+    ).get("batch", {})
+    responses = {}
+    for symbol in symbols:
+        item = items.get(_source_symbol(symbol).upper())
+        if item is not None and item.status == "ok":
+            responses[symbol] = ChartResponse(s="ok", bars=item.bars)
+    return responses
+
+
+def _run_with_deadline(
+    calls: dict[str, Callable[[], object]],
+    *,
+    max_workers: int,
+    timeout_seconds: float,
+    deadline_seconds: float,
+) -> dict:
+    """
+    Run calls on a bounded pool and return the results that arrive in time.
+
+    Each call is timed from when a worker picks it up. Calls that raise, run
+    past timeout_seconds or are unfinished at the deadline are left out;
+    abandoned threads finish in the background without blocking the caller.
+    """
+    started: dict[str, float] = {}
+
+    def run(key: str, call: Callable[[], object]):
+        started[key] = clock.monotonic()
+        return call()
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(calls))),
+        thread_name_prefix="activity-chart",
+    )
+    futures: dict[Future, str] = {
+        executor.submit(run, key, call): key for key, call in calls.items()
+    }
+    deadline = clock.monotonic() + deadline_seconds
+    waiting = set(futures)
+    results = {}
+    try:
+        while waiting:
+            for future in [future for future in waiting if future.done()]:
+                waiting.discard(future)
+                try:
+                    results[futures[future]] = future.result()
+                except Exception:
+                    continue
+            now = clock.monotonic()
+            for future in list(waiting):
+                key = futures[future]
+                if key in started and now - started[key] >= timeout_seconds:
+                    waiting.discard(future)
+            if not waiting or now >= deadline:
+                break
+            wake_at = min(
+                [deadline]
+                + [
+                    started[futures[future]] + timeout_seconds
+                    for future in waiting
+                    if futures[future] in started
+                ]
+            )
+            # Wait on abandoned calls too: a freed worker may start a queued one.
+            wait(
+                [future for future in futures if not future.done()],
+                timeout=max(0.0, wake_at - now),
+                return_when=FIRST_COMPLETED,
+            )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
 def _session_window(session_date: date) -> tuple[int, int]:
     start = datetime.combine(
         session_date,
@@ -137,12 +313,12 @@ def _session_bars(
 def _symbol_context(
     symbol: str,
     occurred_at: datetime,
-    bars,
+    session: SessionBars | None,
     *,
     include_bars: bool,
 ) -> BrokerActivitySymbolContextV1:
     source_symbol = _source_symbol(symbol)
-    if not bars:
+    if session is None:
         return BrokerActivitySymbolContextV1(
             symbol=symbol,
             source_symbol=source_symbol,
@@ -152,17 +328,12 @@ def _symbol_context(
             ],
         )
 
-    session_open = float(bars[0].open)
-    session_close = float(bars[-1].close)
-    session_high = max(float(bar.high) for bar in bars)
-    session_low = min(float(bar.low) for bar in bars)
+    session_open = session.session_open
+    session_close = session.session_close
+    session_high = session.session_high
+    session_low = session.session_low
     occurred_utc = _as_utc(occurred_at)
-    nearest = min(
-        bars,
-        key=lambda bar: abs(
-            (bar.time / 1000) - occurred_utc.timestamp()
-        ),
-    )
+    nearest = session.nearest(occurred_utc.timestamp())
     nearest_at = datetime.fromtimestamp(
         nearest.time / 1000,
         tz=timezone.utc,
@@ -211,7 +382,7 @@ def _symbol_context(
         bars=(
             [
                 BrokerActivityMarketBarV1(**bar.model_dump())
-                for bar in bars
+                for bar in session.bars
             ]
             if include_bars
             else []
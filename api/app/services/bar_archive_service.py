@@ -0,0 +1,160 @@
+import logging
+from threading import Lock
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models import ChartBarORM, ChartBarRangeORM
+from app.schemas.charts import Bar
+from app.services.bar_store_service import BarSeries, CoveredRange, merge_ranges
+
+logger = logging.getLogger(__name__)
+
+# (start, end, fetched_at, bars) as collected by BarStore.get_bars
+FetchedSegment = Tuple[int, int, float, List[Bar]]
+
+# Serializes the read-merge-write of archived ranges across request threads.
+_save_lock = Lock()
+
+
+class SqliteBarArchive:
+    """
+    On-disk archive of closed chart bars, shared across restarts.
+
+    Only bars that had closed when they were fetched are written, together
+    with the windows they are known to cover completely, so archived series
+    never need revalidation. The archive is best-effort: database errors are
+    logged and the caller falls back to the source.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        interval_seconds: int,
+    ) -> Optional[BarSeries]:
+        """Return the archived series, or None when nothing is stored."""
+        symbol = symbol.upper()
+        try:
+            with self.session_factory() as db:
+                ranges = db.execute(
+                    select(ChartBarRangeORM.start_ts, ChartBarRangeORM.end_ts)
+                    .where(
+                        ChartBarRangeORM.symbol == symbol,
+                        ChartBarRangeORM.interval == interval,
+                    )
+                    .order_by(ChartBarRangeORM.start_ts)
+                ).all()
+                if not ranges:
+                    return None
+                rows = db.scalars(
+                    select(ChartBarORM)
+                    .where(
+                        ChartBarORM.symbol == symbol,
+                        ChartBarORM.interval == interval,
+                    )
+                    .order_by(ChartBarORM.time)
+                ).all()
+                bars = tuple(Bar.model_validate(row) for row in rows)
+        except SQLAlchemyError:
+            logger.exception(f"Loading archived {symbol} {interval} bars failed")
+            return None
+
+        # Archived ranges end on a closed bar, so they are already past any ttl.
+        return BarSeries(
+            bars=bars,
+            ranges=tuple(
+                CoveredRange(start=start, end=end, fetched_at=end + interval_seconds)
+                for start, end in ranges
+            ),
+        )
+
+    def save(
+        self,
+        symbol: str,
+        interval: str,
+        segments: Sequence[FetchedSegment],
+        interval_seconds: int,
+    ) -> None:
+        """Archive the closed part of each fetched segment that holds closed bars."""
+        symbol = symbol.upper()
+        bar_rows = []
+        covered = []
+        for start, end, fetched_at, bars in segments:
+            closed_before = int(fetched_at) - interval_seconds
+            end = min(end, closed_before)
+            closed = [bar for bar in bars if bar.time // 1000 <= closed_before]
+            # A range without closed bars proves nothing worth keeping across restarts.
+            if end <= start or not closed:
+                continue
+            covered.append(CoveredRange(start=start, end=end, fetched_at=fetched_at))
+            bar_rows.extend(
+                {
+                    "symbol": symbol,
+                    "interval": interval,
+                    **bar.model_dump(),
+                }
+                for bar in closed
+            )
+        if not covered:
+            return
+
+        try:
+            # One transaction: the bar insert takes SQLite's write lock before
+            # the ranges are read, so other processes cannot interleave either.
+            with _save_lock, self.session_factory() as db:
+                db.execute(
+                    insert(ChartBarORM)
+                    .values(bar_rows)
+                    .on_conflict_do_nothing()
+                )
+                existing = db.execute(
+                    select(ChartBarRangeORM.start_ts, ChartBarRangeORM.end_ts).where(
+                        ChartBarRangeORM.symbol == symbol,
+                        ChartBarRangeORM.interval == interval,
+                    )
+                ).all()
+                merged = merge_ranges(
+                    covered
+                    + [
+                        CoveredRange(start=start, end=end, fetched_at=0)
+                        for start, end in existing
+                    ]
+                )
+                db.execute(
+                    delete(ChartBarRangeORM).where(
+                        ChartBarRangeORM.symbol == symbol,
+                        ChartBarRangeORM.interval == interval,
+                    )
+                )
+                db.add_all(
+                    ChartBarRangeORM(
+                        symbol=symbol,
+                        interval=interval,
+                        start_ts=item.start,
+                        end_ts=item.end,
+                    )
+                    for item in merged
+                )
+                db.commit()
+        except SQLAlchemyError:
+            logger.exception(f"Archiving {symbol} {interval} bars failed")
+
+
+# Global archive instance
+_archive_instance: Optional[SqliteBarArchive] = None
+
+
+def get_bar_archive() -> SqliteBarArchive:
+    """Get the global bar archive (singleton pattern)."""
+    global _archive_instance
+    if _archive_instance is None:
+        _archive_instance = SqliteBarArchive()
+    return _archive_instance
@@ -0,0 +1,326 @@
+import logging
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from typing import Callable, List, Optional, Tuple
+
+from app.schemas.charts import Bar
+from app.services.cache_service import InMemoryCache, approximate_size
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Serializes read-merge-write of a series so concurrent fetches do not drop bars.
+_merge_lock = Lock()
+
+# Seconds per bar for each yfinance interval.
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "1d": 86400,
+    "1wk": 604800,
+    "1mo": 2678400,
+}
+
+
+@dataclass(frozen=True)
+class CoveredRange:
+    """A window [start, end] (Unix seconds) that has been fetched from the source."""
+
+    start: int
+    end: int
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """Every bar fetched so far for one (symbol, interval), plus the windows they cover."""
+
+    bars: Tuple[Bar, ...] = ()
+    ranges: Tuple[CoveredRange, ...] = field(default_factory=tuple)
+
+    def cache_size(self) -> int:
+        """Approximate bytes from the bar and range counts, without walking the bars."""
+        return (
+            _SERIES_BYTES
+            + len(self.bars) * _BAR_BYTES
+            + len(self.ranges) * _RANGE_BYTES
+        )
+
+
+def _marginal_size(first: object, second: object) -> int:
+    # Field names and other shared objects are only counted once per series.
+    return approximate_size((first, second)) - approximate_size((first,))
+
+
+# Per-item footprints, measured once; every bar and range has the same shape.
+_SERIES_BYTES = sys.getsizeof(BarSeries()) + approximate_size(vars(BarSeries()))
+_BAR_BYTES = _marginal_size(
+    Bar(time=60_000, open=1.5, high=2.5, low=0.5, close=1.25, volume=1_000),
+    Bar(time=120_000, open=1.75, high=2.75, low=0.75, close=1.5, volume=2_000),
+)
+_RANGE_BYTES = _marginal_size(
+    CoveredRange(start=0, end=60, fetched_at=60.5),
+    CoveredRange(start=120, end=180, fetched_at=180.5),
+)
+
+
+def _effective_end(
+    covered: CoveredRange,
+    now: float,
+    ttl: int,
+    interval_seconds: int,
+) -> int:
+    """
+    Completed bars never change, but the bar in progress at fetch time may.
+    Once the range is older than ttl, only bars that had closed still count.
+    """
+    if now - covered.fetched_at <= ttl:
+        return covered.end
+    return max(covered.start, min(covered.end, int(covered.fetched_at) - interval_seconds))
+
+
+def missing_segments(
+    series: Optional[BarSeries],
+    from_ts: int,
+    to_ts: int,
+    *,
+    ttl: int,
+    interval_seconds: int,
+    now: Optional[float] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Return the sub-windows of [from_ts, to_ts] the series cannot serve.
+
+    A trailing gap shorter than one interval after a range still inside its
+    ttl, which reaches into the bar in progress at fetch time, is not
+    missing: no new bar can have opened, and the bar in progress is as
+    current as the ttl allows. Windows ending "now" thus reuse a fresh fetch
+    instead of asking the source for the last few seconds. Archived ranges
+    stop short of that bar, so their tail is still fetched.
+    """
+    if series is None or not series.ranges:
+        return [(from_ts, to_ts)]
+    now = time.time() if now is None else now
+    gaps = []
+    cursor = from_ts
+    cursor_is_fresh = False
+    for covered in series.ranges:
+        end = _effective_end(covered, now, ttl, interval_seconds)
+        if end < cursor:
+            continue
+        if covered.start > to_ts:
+            break
+        if covered.start > cursor:
+            gaps.append((cursor, covered.start))
+        if end >= cursor:
+            cursor = end
+            cursor_is_fresh = (
+                now - covered.fetched_at <= ttl
+                and end > covered.fetched_at - interval_seconds
+            )
+        if cursor >= to_ts:
+            break
+    if cursor < to_ts and not (cursor_is_fresh and to_ts - cursor < interval_seconds):
+        gaps.append((cursor, to_ts))
+    return gaps
+
+
+def merge_series(
+    series: Optional[BarSeries],
+    bars: List[Bar],
+    covered: CoveredRange,
+    *,
+    ttl: int,
+    interval_seconds: int,
+    now: Optional[float] = None,
+) -> BarSeries:
+    """Return a new series with the fetched bars and their window merged in."""
+    now = time.time() if now is None else now
+    by_time = {bar.time: bar for bar in (series.bars if series else ())}
+    by_time.update((bar.time, bar) for bar in bars)
+
+    ranges = merge_ranges(
+        [
+            replace(item, end=_effective_end(item, now, ttl, interval_seconds))
+            for item in (series.ranges if series else ())
+        ]
+        + [covered]
+    )
+    return BarSeries(
+        bars=tuple(by_time[key] for key in sorted(by_time)),
+        ranges=tuple(ranges),
+    )
+
+
+def merge_ranges(ranges: List[CoveredRange]) -> List[CoveredRange]:
+    """Sort ranges and join overlapping or touching ones; the later tail wins."""
+    merged: List[CoveredRange] = []
+    for item in sorted(ranges, key=lambda item: item.start):
+        if merged and item.start <= merged[-1].end:
+            last = merged[-1]
+            tail = item if item.end >= last.end else last
+            merged[-1] = CoveredRange(
+                start=last.start,
+                end=tail.end,
+                fetched_at=tail.fetched_at,
+            )
+        else:
+            merged.append(item)
+    return merged
+
+
+def provable_segments(
+    series: Optional[BarSeries],
+    fetched: List[Tuple[int, int, float, List[Bar]]],
+) -> List[Tuple[int, int, float, List[Bar]]]:
+    """
+    Keep the fetched segments that may be recorded as covered.
+
+    The source answers with no rows on transient errors as well as for
+    windows without trading, so an empty segment only counts when it touches
+    an already covered range or a segment that returned bars. A lone empty
+    answer is never cached.
+    """
+    with_bars = [
+        (start, end)
+        for start, end, _, bars in fetched
+        if bars
+    ] + [(item.start, item.end) for item in (series.ranges if series else ())]
+    return [
+        segment
+        for segment in fetched
+        if segment[3]
+        or any(start <= segment[1] and segment[0] <= end for start, end in with_bars)
+    ]
+
+
+def bars_in_window(series: BarSeries, from_ts: int, to_ts: int) -> List[Bar]:
+    from_ms, to_ms = from_ts * 1000, to_ts * 1000
+    return [bar for bar in series.bars if from_ms <= bar.time <= to_ms]
+
+
+class BarStore:
+    """
+    Range-aware bar cache keyed by (symbol, interval).
+
+    Series live in the shared InMemoryCache, so they count toward its LRU and
+    memory budget. Any sub-window of fetched data is served from memory and
+    only the missing head, tail or interior gaps go back to the source.
+    An optional archive (see bar_archive_service) seeds series after a
+    restart and keeps closed bars on disk.
+    """
+
+    def __init__(
+        self,
+        cache: InMemoryCache,
+        retention_seconds: int = settings.chart_bar_retention_seconds,
+        archive=None,
+    ):
+        self.cache = cache
+        self.retention_seconds = retention_seconds
+        self.archive = archive
+
+    @staticmethod
+    def cache_key(symbol: str, interval: str) -> str:
+        return f"bars:{symbol.upper()}:{interval}"
+
+    def get_series(self, symbol: str, interval: str) -> Optional[BarSeries]:
+        return self.cache.get(self.cache_key(symbol, interval))
+
+    def get_bars(
+        self,
+        symbol: str,
+        interval: str,
+        from_ts: int,
+        to_ts: int,
+        fetch: Callable[[int, int], List[Bar]],
+        *,
+        ttl: int,
+    ) -> List[Bar]:
+        """
+        Return bars for [from_ts, to_ts], calling fetch(start, end) per missing segment.
+
+        When the whole window had to be fetched in one call, its bars are
+        returned as the source produced them.
+        """
+        series, gaps = self.missing(symbol, interval, from_ts, to_ts, ttl=ttl)
+        if not gaps:
+            logger.info(f"Serving {symbol} {interval} bars from the bar store")
+            return bars_in_window(series, from_ts, to_ts)
+
+        fetched = [(start, end, time.time(), fetch(start, end)) for start, end in gaps]
+        series = self.store(symbol, interval, fetched, ttl=ttl)
+
+        if gaps == [(from_ts, to_ts)]:
+            return fetched[0][3]
+        # Nothing is stored when every segment came back empty and unprovable.
+        return bars_in_window(series, from_ts, to_ts) if series is not None else []
+
+    def missing(
+        self,
+        symbol: str,
+        interval: str,
+        from_ts: int,
+        to_ts: int,
+        *,
+        ttl: int,
+    ) -> Tuple[Optional[BarSeries], List[Tuple[int, int]]]:
+        """Return the current series and the segments of the window it cannot serve."""
+        series = self.get_series(symbol, interval)
+        if series is None and self.archive is not None:
+            series = self.archive.load(
+                symbol, interval, INTERVAL_SECONDS.get(interval, 86400)
+            )
+            if series is not None:
+                self.cache.set(
+                    self.cache_key(symbol, interval),
+                    series,
+                    ttl=self.retention_seconds,
+                )
+        gaps = missing_segments(
+            series,
+            from_ts,
+            to_ts,
+            ttl=ttl,
+            interval_seconds=INTERVAL_SECONDS.get(interval, 86400),
+        )
+        return series, gaps
+
+    def store(
+        self,
+        symbol: str,
+        interval: str,
+        fetched: List[Tuple[int, int, float, List[Bar]]],
+        *,
+        ttl: int,
+    ) -> BarSeries:
+        """
+        Merge fetched (start, end, fetched_at, bars) segments and return the series.
+
+        Empty segments that nothing proves empty are left uncovered, so the
+        next request asks the source again (see provable_segments).
+        """
+        interval_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        key = self.cache_key(symbol, interval)
+        with _merge_lock:
+            series = self.cache.get(key)
+            fetched = provable_segments(series, fetched)
+            if not fetched:
+                return series
+            for start, end, fetched_at, bars in fetched:
+                series = merge_series(
+                    series,
+                    bars,
+                    CoveredRange(start=start, end=end, fetched_at=fetched_at),
+                    ttl=ttl,
+                    interval_seconds=interval_seconds,
+                )
+            self.cache.set(key, series, ttl=self.retention_seconds)
+        if self.archive is not None:
+            self.archive.save(symbol, interval, fetched, interval_seconds)
+        return series
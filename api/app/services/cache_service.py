@@ -1,28 +1,97 @@
+import asyncio
 import logging
+import sys
 import time
-from typing import Dict, Optional, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
 from threading import Lock
 
+from pydantic import BaseModel
+
+from app.settings import settings
+
 logger = logging.getLogger(__name__)
 
 
+def approximate_size(value: Any) -> int:
+    """
+    Estimate the in-memory footprint of a cached value in bytes.
+
+    Values that know their own size expose a cache_size() method (see
+    BarSeries), so large series are not walked on every set. Anything else
+    is walked through containers, dataclass-like objects and pydantic models
+    so that ChartResponse bar lists are counted, not just the outer object.
+    """
+    sizer = getattr(value, "cache_size", None)
+    if callable(sizer):
+        return sizer()
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+    return total
+
+
 @dataclass
 class CacheEntry:
     data: Any
     timestamp: float
     ttl: int  # Time to live in seconds
+    stale_ttl: int = 0  # Extra seconds the value may be served while refreshing
+    size: int = 0  # Approximate bytes, see approximate_size
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.timestamp <= self.ttl
+
+    def is_retained(self, now: float) -> bool:
+        return now - self.timestamp <= self.ttl + self.stale_ttl
 
 
 class InMemoryCache:
     """
     Simple in-memory cache with TTL (Time To Live) support.
     Thread-safe implementation for caching API responses.
+
+    get_or_refresh adds stale-while-revalidate reads with single-flight loads.
+    The cache is bounded by entry count and approximate bytes; the least
+    recently used entries are evicted first.
     """
     
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(
+        self,
+        max_entries: int = settings.cache_max_entries,
+        max_bytes: int = settings.cache_max_bytes,
+    ):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._inflight: Dict[str, Future] = {}
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -36,21 +105,27 @@ class InMemoryCache:
         """
         with self._lock:
             if key not in self._cache:
+                self._misses += 1
                 return None
             
             entry = self._cache[key]
             current_time = time.time()
             
             # Check if entry has expired
-            if current_time - entry.timestamp > entry.ttl:
+            if not entry.is_fresh(current_time):
                 logger.debug(f"Cache entry expired for key: {key}")
-                del self._cache[key]
+                if not entry.is_retained(current_time):
+                    self._remove(key)
+                    self._expirations += 1
+                self._misses += 1
                 return None
             
             logger.debug(f"Cache hit for key: {key}")
+            self._cache.move_to_end(key)
+            self._hits += 1
             return entry.data
     
-    def set(self, key: str, value: Any, ttl: int = 300) -> None:
+    def set(self, key: str, value: Any, ttl: int = 300, stale_ttl: int = 0) -> None:
         """
         Set a value in cache with TTL.
         
@@ -58,19 +133,141 @@ class InMemoryCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (default: 5 minutes)
+            stale_ttl: Seconds after expiry that get_or_refresh may still serve it
         """
+        size = approximate_size(value)
         with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            if size > self.max_bytes:
+                logger.warning(f"Not caching {key}: ~{size} bytes exceeds the cache budget")
+                return
             self._cache[key] = CacheEntry(
                 data=value,
                 timestamp=time.time(),
-                ttl=ttl
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                size=size,
             )
+            self._bytes += size
+            self._evict_over_budget()
             logger.debug(f"Cache set for key: {key} with TTL: {ttl}s")
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+
+    def _evict_over_budget(self) -> None:
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
+            logger.debug(f"Evicted least recently used cache key: {key}")
+
+    def get_or_refresh(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int = 300,
+        stale_ttl: int = 0,
+    ) -> Any:
+        """
+        Get a value, loading it on a miss and revalidating it when stale.
+
+        A fresh entry is returned as-is. An expired entry still inside its
+        stale window is returned immediately while one background refresh
+        runs. Anything older is a miss: the caller loads synchronously, and
+        concurrent misses on the same key share a single loader call.
+        Loader exceptions propagate to every waiter and are not cached; a
+        failed background refresh keeps serving the stale value.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value
+            ttl: Time to live in seconds
+            stale_ttl: Seconds after expiry the old value may still be served
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            current_time = time.time()
+            if entry is not None and entry.is_fresh(current_time):
+                logger.debug(f"Cache hit for key: {key}")
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return entry.data
+            if entry is not None and entry.is_retained(current_time):
+                self._cache.move_to_end(key)
+                self._stale_hits += 1
+                if key not in self._inflight:
+                    future = self._inflight[key] = Future()
+                    self._get_refresh_executor().submit(
+                        self._load, key, loader, ttl, stale_ttl, future, True
+                    )
+                logger.debug(f"Serving stale cache entry for key: {key}")
+                return entry.data
+
+            self._misses += 1
+            future = self._inflight.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = self._inflight[key] = Future()
+
+        if is_loader:
+            self._load(key, loader, ttl, stale_ttl, future, False)
+        return future.result()
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        stale_ttl: int,
+        future: Future,
+        background: bool,
+    ) -> None:
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            if background:
+                logger.warning(f"Background refresh failed for key {key}: {exc}")
+            future.set_exception(exc)
+            return
+        self.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _get_refresh_executor(self) -> ThreadPoolExecutor:
+        if self._refresh_executor is None:
+            self._refresh_executor = ThreadPoolExecutor(
+                max_workers=4,
+                thread_name_prefix="cache-refresh",
+            )
+        return self._refresh_executor
     
+    def close(self) -> None:
+        """
+        Stop background refresh workers; the next stale read restarts them.
+
+        Queued refreshes still run so their in-flight futures always resolve.
+        """
+        with self._lock:
+            executor, self._refresh_executor = self._refresh_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
     def clear(self) -> None:
         """Clear all cache entries."""
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
             logger.info("Cache cleared")
     
     def cleanup_expired(self) -> int:
@@ -85,11 +282,12 @@ class InMemoryCache:
             expired_keys = []
             
             for key, entry in self._cache.items():
-                if current_time - entry.timestamp > entry.ttl:
+                if not entry.is_retained(current_time):
                     expired_keys.append(key)
             
             for key in expired_keys:
-                del self._cache[key]
+                self._remove(key)
+            self._expirations += len(expired_keys)
             
             if expired_keys:
                 logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
@@ -101,6 +299,21 @@ class InMemoryCache:
         with self._lock:
             return len(self._cache)
 
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss, eviction and size counters."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "approximate_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
 
 # Global cache instance
 _cache_instance: Optional[InMemoryCache] = None
@@ -114,6 +327,18 @@ def get_cache() -> InMemoryCache:
     return _cache_instance
 
 
+async def run_cache_sweeper(
+    interval_seconds: float = settings.cache_sweep_interval_seconds,
+) -> None:
+    """Periodically drop expired entries from the global cache until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            get_cache().cleanup_expired()
+        except Exception:
+            logger.exception("Cache sweep failed")
+
+
 def create_cache_key(symbol: str, resolution: str, from_ts: int, to_ts: int) -> str:
     """
     Create a cache key for chart data.
@@ -1,13 +1,20 @@
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import yfinance as yf
 from fastapi import HTTPException
 
-from app.schemas.charts import Bar, ChartResponse
-from app.services.cache_service import get_cache, create_cache_key
+from app.schemas.charts import (
+    Bar,
+    ChartBatchItem,
+    ChartColumnsResponse,
+    ChartResponse,
+)
+from app.services.bar_archive_service import get_bar_archive
+from app.services.bar_store_service import BarStore, bars_in_window
+from app.services.cache_service import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +27,9 @@ def get_chart_history(
 ) -> ChartResponse:
     """
     Fetch historical chart data for a symbol using yfinance library.
-    Returns data in TradingView-compatible format.
+    Returns data in TradingView-compatible format. Bars are served from the
+    range-aware bar store; only uncovered head or tail segments hit yfinance.
+    Closed bars are archived in SQLite, so they survive restarts.
     
     Args:
         symbol: Stock symbol (e.g., 'AAPL', 'TSLA', 'SPX')
@@ -34,6 +43,31 @@ def get_chart_history(
     Raises:
         HTTPException: For API errors or invalid data
     """
+    return ChartResponse(s="ok", bars=_history_bars(symbol, resolution, from_ts, to_ts))
+
+
+def get_chart_history_columns(
+    symbol: str,
+    resolution: str = "1d",
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None
+) -> ChartColumnsResponse:
+    """
+    Fetch the same history as get_chart_history as parallel column arrays.
+
+    Bars come from the bar store and are transposed in one pass, without
+    building an intermediate ChartResponse.
+    """
+    return _columns_from_bars(_history_bars(symbol, resolution, from_ts, to_ts))
+
+
+def _history_bars(
+    symbol: str,
+    resolution: str,
+    from_ts: Optional[int],
+    to_ts: Optional[int],
+) -> List[Bar]:
+    """Serve one symbol's window from the bar store, raising 404 when empty."""
     # Set default timestamps if not provided
     now = datetime.now()
     if to_ts is None:
@@ -41,27 +75,138 @@ def get_chart_history(
     if from_ts is None:
         from_ts = int((now - timedelta(days=30)).timestamp())
     
-    # Check cache first
-    cache = get_cache()
-    cache_key = create_cache_key(symbol.upper(), resolution, from_ts, to_ts)
-    
-    cached_response = cache.get(cache_key)
-    if cached_response is not None:
-        logger.info(f"Returning cached data for {symbol}")
-        return cached_response
-    
+    yf_interval = _yf_interval(resolution)
+    bar_store = BarStore(get_cache(), archive=get_bar_archive())
+    bars = bar_store.get_bars(
+        symbol.upper(),
+        yf_interval,
+        from_ts,
+        to_ts,
+        lambda start, end: _fetch_bars(symbol, yf_interval, start, end),
+        ttl=_get_cache_ttl(yf_interval),
+    )
+
+    # Check if data was returned
+    if not bars:
+        logger.warning(f"No data found for symbol {symbol}")
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for symbol '{symbol}'. Please check the symbol and try again."
+        )
+    return bars
+
+
+def get_chart_histories(
+    symbols: List[str],
+    resolution: str = "1d",
+    from_ts: Optional[int] = None,
+    to_ts: Optional[int] = None,
+) -> Dict[str, ChartBatchItem]:
+    """
+    Fetch chart history for many symbols with at most one yfinance download.
+
+    Symbols the bar store can already serve are answered from memory. The
+    rest share a single multi-ticker download spanning all of their missing
+    segments; each symbol merges only the bars inside its own gaps. Symbols
+    the download dropped or returned without bars are reported unavailable
+    and are not recorded as covered.
+    Failures are reported per symbol instead of failing the batch.
+
+    Args:
+        symbols: Stock symbols; duplicates and case are normalized
+        resolution: Chart resolution (1d, 1h, 5m, etc.)
+        from_ts: Start timestamp (Unix), defaults to 30 days ago
+        to_ts: End timestamp (Unix), defaults to now
+
+    Returns:
+        Mapping of upper-cased symbol to its ChartBatchItem, in request order
+    """
+    now = datetime.now()
+    if to_ts is None:
+        to_ts = int(now.timestamp())
+    if from_ts is None:
+        from_ts = int((now - timedelta(days=30)).timestamp())
+
+    yf_interval = _yf_interval(resolution)
+    ttl = _get_cache_ttl(yf_interval)
+    bar_store = BarStore(get_cache(), archive=get_bar_archive())
+    wanted = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+
+    pending = {}
+    for symbol in wanted:
+        _, gaps = bar_store.missing(symbol, yf_interval, from_ts, to_ts, ttl=ttl)
+        if gaps:
+            pending[symbol] = gaps
+
+    failures: Dict[str, str] = {}
+    if pending:
+        start = min(gap[0] for gaps in pending.values() for gap in gaps)
+        end = max(gap[1] for gaps in pending.values() for gap in gaps)
+        fetched_at = datetime.now().timestamp()
+        try:
+            downloaded = _download_bars(list(pending), yf_interval, start, end)
+        except HTTPException as exc:
+            failures = {symbol: exc.detail for symbol in pending}
+        else:
+            for symbol, gaps in pending.items():
+                bars = downloaded.get(symbol)
+                # Dropped or all-NaN symbols prove nothing; leave them uncovered.
+                if not bars:
+                    continue
+                bar_store.store(
+                    symbol,
+                    yf_interval,
+                    [
+                        (gap_start, gap_end, fetched_at, _bars_between(bars, gap_start, gap_end))
+                        for gap_start, gap_end in gaps
+                    ],
+                    ttl=ttl,
+                )
+
+    items = {}
+    for symbol in wanted:
+        if symbol in failures:
+            items[symbol] = ChartBatchItem(symbol=symbol, status="unavailable", detail=failures[symbol])
+            continue
+        series = bar_store.get_series(symbol, yf_interval)
+        bars = bars_in_window(series, from_ts, to_ts) if series else []
+        if bars:
+            items[symbol] = ChartBatchItem(symbol=symbol, status="ok", bars=bars)
+        else:
+            items[symbol] = ChartBatchItem(
+                symbol=symbol,
+                status="unavailable",
+                detail=f"No data found for symbol '{symbol}'.",
+            )
+    return items
+
+
+def _bars_between(bars: List[Bar], from_ts: int, to_ts: int) -> List[Bar]:
+    from_ms, to_ms = from_ts * 1000, to_ts * 1000
+    return [bar for bar in bars if from_ms <= bar.time <= to_ms]
+
+
+def _yf_interval(resolution: str) -> str:
+    """Map resolution to yfinance interval format, defaulting to daily bars."""
+    interval_map = {
+        "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
+        "1h": "1h", "1d": "1d", "1wk": "1wk", "1mo": "1mo"
+    }
+    return interval_map.get(resolution, "1d")
+
+
+def _fetch_bars(
+    symbol: str,
+    yf_interval: str,
+    from_ts: int,
+    to_ts: int,
+) -> List[Bar]:
+    """Fetch one window from yfinance, translating failures to HTTPException."""
     try:
         # Convert timestamps to datetime objects for yfinance
         start_date = datetime.fromtimestamp(from_ts, tz=timezone.utc)
         end_date = datetime.fromtimestamp(to_ts, tz=timezone.utc)
         
-        # Map resolution to yfinance interval format
-        interval_map = {
-            "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-            "1h": "1h", "1d": "1d", "1wk": "1wk", "1mo": "1mo"
-        }
-        yf_interval = interval_map.get(resolution, "1d")
-        
         logger.info(f"Fetching {symbol} data from {start_date.date()} to {end_date.date()} with {yf_interval} interval")
         
         # Create ticker object and fetch data
@@ -77,26 +222,15 @@ def get_chart_history(
             actions=False   # Don't include dividend/split actions for cleaner data
         )
         
-        # Check if data was returned
+        # An empty head or tail segment is not an error on its own
         if hist_data.empty:
-            logger.warning(f"No data found for symbol {symbol}")
-            raise HTTPException(
-                status_code=404,
-                detail=f"No data found for symbol '{symbol}'. Please check the symbol and try again."
-            )
+            return []
         
         # Build bars from DataFrame
         bars = _build_bars_from_dataframe(hist_data)
         
-        # Create response
-        chart_response = ChartResponse(s="ok", bars=bars)
-        
-        # Cache the response (TTL varies by resolution for optimal caching)
-        cache_ttl = _get_cache_ttl(resolution)
-        cache.set(cache_key, chart_response, ttl=cache_ttl)
-        
-        logger.info(f"Successfully retrieved and cached {len(bars)} bars for {symbol}")
-        return chart_response
+        logger.info(f"Successfully retrieved {len(bars)} bars for {symbol}")
+        return bars
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -122,6 +256,66 @@ def get_chart_history(
             )
 
 
+_OHLC_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def _download_bars(
+    symbols: List[str],
+    yf_interval: str,
+    from_ts: int,
+    to_ts: int,
+) -> Dict[str, List[Bar]]:
+    """Download one window for many symbols in a single yfinance call."""
+    try:
+        start_date = datetime.fromtimestamp(from_ts, tz=timezone.utc)
+        end_date = datetime.fromtimestamp(to_ts, tz=timezone.utc)
+
+        logger.info(f"Downloading {len(symbols)} symbols from {start_date.date()} to {end_date.date()} with {yf_interval} interval")
+
+        hist_data = yf.download(
+            symbols,
+            start=start_date,
+            end=end_date,
+            interval=yf_interval,
+            group_by="ticker",
+            auto_adjust=True,
+            prepost=False,
+            actions=False,
+            progress=False,
+            threads=True,
+        )
+    except Exception as e:
+        logger.error(f"Error downloading chart data for {symbols}: {str(e)}")
+        if "Too Many Requests" in str(e) or "429" in str(e):
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests. Please wait a moment and try again."
+            )
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch chart data. Please try again later."
+        )
+
+    if hist_data is None or hist_data.empty:
+        return {}
+
+    result = {}
+    tickers = (
+        set(hist_data.columns.get_level_values(0))
+        if isinstance(hist_data.columns, pd.MultiIndex)
+        else set()
+    )
+    for symbol in symbols:
+        if symbol in tickers:
+            frame = hist_data[symbol]
+        elif not tickers and len(symbols) == 1:
+            frame = hist_data
+        else:
+            continue
+        result[symbol] = _build_bars_from_dataframe(frame)
+    return result
+
+
 def _build_bars_from_dataframe(df) -> List[Bar]:
     """
     Build list of Bar objects from yfinance pandas DataFrame.
@@ -132,28 +326,42 @@ def _build_bars_from_dataframe(df) -> List[Bar]:
     Returns:
         List of Bar objects with valid data
     """
-    bars = []
-    
-    for index, row in df.iterrows():
-        # Skip rows with null values in OHLC data
-        if (pd.isna(row['Open']) or pd.isna(row['High']) or 
-            pd.isna(row['Low']) or pd.isna(row['Close'])):
-            continue
-            
-        # Convert timestamp to milliseconds for TradingView
-        timestamp_ms = int(index.timestamp() * 1000)
-        
-        bar = Bar(
-            time=timestamp_ms,
-            open=float(row['Open']),
-            high=float(row['High']),
-            low=float(row['Low']),
-            close=float(row['Close']),
-            volume=int(row['Volume']) if not pd.isna(row['Volume']) else 0
-        )
-        bars.append(bar)
-    
-    return bars
+    # Values are already typed by _dataframe_columns, so skip per-bar validation
+    return [
+        Bar.model_construct(time=t, open=o, high=h, low=l, close=c, volume=v)
+        for t, o, h, l, c, v in zip(*_dataframe_columns(df))
+    ]
+
+
+def _dataframe_columns(df) -> Tuple[List[int], List[float], List[float], List[float], List[float], List[int]]:
+    """
+    Extract time, open, high, low, close and volume lists from a DataFrame.
+
+    Rows with a null open, high, low or close are dropped with one mask and
+    the index is converted to epoch milliseconds in a single operation.
+    """
+    frame = df[df[_OHLC_COLUMNS].notna().all(axis=1)]
+    if frame.empty:
+        return [], [], [], [], [], []
+
+    # Naive indexes are treated as UTC, matching Timestamp.timestamp()
+    times = pd.DatetimeIndex(frame.index).as_unit("ms").asi8.tolist()
+    opens, highs, lows, closes = (
+        frame[column].astype("float64").tolist() for column in _OHLC_COLUMNS
+    )
+    volumes = frame["Volume"].fillna(0).astype("int64").tolist()
+    return times, opens, highs, lows, closes, volumes
+
+
+def _columns_from_bars(bars: List[Bar]) -> ChartColumnsResponse:
+    """Transpose bars into parallel column arrays in a single pass."""
+    t, o, h, l, c, v = (
+        map(list, zip(*((b.time, b.open, b.high, b.low, b.close, b.volume) for b in bars)))
+        if bars
+        else ([], [], [], [], [], [])
+    )
+    # Bars are validated (or typed by _dataframe_columns) already
+    return ChartColumnsResponse.model_construct(s="ok", t=t, o=o, h=h, l=l, c=c, v=v)
 
 
 def _get_cache_ttl(resolution: str) -> int:
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+# Bounded so a long-running process holding many expired contracts stays small;
+# a book rarely has more than a few hundred distinct symbols and expirations.
+_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class OptionSymbol:
+    """Fields of an OCC option symbol such as "AAPL  220617C00150000"."""
+
+    root: str
+    expiration: Optional[date]
+    option_type: str
+    strike: float
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_option_symbol(symbol: str) -> Optional[OptionSymbol]:
+    """
+    Parse an OCC symbol: ROOT (6 chars, padded) + YYMMDD + C/P + strike * 1000 (8 digits).
+
+    Returns None when the type or strike cannot be read. The expiration is
+    None when the date part is malformed.
+    """
+    if not symbol or len(symbol) < 21:  # Minimum length for OCC format
+        return None
+    option_suffix = symbol[-9:]
+    option_type = option_suffix[0]
+    if option_type not in ("C", "P"):
+        return None
+    try:
+        strike = float(option_suffix[1:]) / 1000.0
+    except ValueError:
+        return None
+    try:
+        expiration = datetime.strptime(symbol[-15:-9], "%y%m%d").date()
+    except ValueError:
+        expiration = None
+    return OptionSymbol(
+        root=symbol[:-15].strip(),
+        expiration=expiration,
+        option_type=option_type,
+        strike=strike,
+    )
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def expiration_date_text(expires_at: str) -> str:
+    """
+    Extract just the date part from an expiration timestamp, ignoring time.
+
+    "2025-08-15T20:15:00.000+00:00" becomes "2025-08-15"; anything that does
+    not parse is returned unchanged (or split at "T").
+    """
+    if not expires_at:
+        return expires_at
+
+    try:
+        dt = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, AttributeError):
+        if "T" in expires_at:
+            return expires_at.split("T")[0]
+        return expires_at
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def expiration_day(expires_at: str) -> Optional[date]:
+    """The calendar date of an expiration timestamp, or None if it has none."""
+    expiration_date = expiration_date_text(expires_at)
+    if not expiration_date:
+        return None
+    try:
+        return date.fromisoformat(expiration_date)
+    except ValueError:
+        return None
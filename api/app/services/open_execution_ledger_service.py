@@ -1,8 +1,12 @@
+import logging
 from collections import defaultdict
+from collections.abc import Callable
 from datetime import date, datetime, timezone
 from hashlib import sha256
 
-from app import tastytrade
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
 from app.schemas.brokerage import (
     DataStatus,
     OpenExecutionGroupCollectionV1,
@@ -11,11 +15,16 @@ from app.schemas.brokerage import (
     SourceMetadataV1,
 )
 from app.services.cache_service import InMemoryCache, get_cache
+from app.services.transaction_ledger_service import (
+    MAX_TRANSACTION_PAGES,
+    has_synced,
+    list_ledger_transactions,
+    sync_transactions,
+)
 
 
-MAX_TRANSACTION_PAGES = 20
-TRANSACTION_PAGE_SIZE = 2000
 EXECUTION_HISTORY_TTL_SECONDS = 900
+EXECUTION_HISTORY_STALE_SECONDS = 900
 
 
 def load_open_execution_groups(
@@ -26,34 +35,34 @@ def load_open_execution_groups(
     *,
     fetched_at: datetime | None = None,
     cache: InMemoryCache | None = None,
+    session_factory: Callable[[], Session] = SessionLocal,
 ) -> OpenExecutionGroupCollectionV1:
+    """
+    Group opening transactions for the window from the local transaction ledger.
+
+    Each cache miss syncs only transactions newer than the account's
+    high-water mark (or older than its synced window) before grouping.
+    """
     fetched_at = fetched_at or datetime.now(timezone.utc)
     cache = cache or get_cache()
     cache_key = (
         f"open-executions:{account_number}:{start_date.isoformat()}:"
         f"{end_date.isoformat()}"
     )
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    transactions = []
-    truncated = False
     try:
-        for page_offset in range(MAX_TRANSACTION_PAGES):
-            page = tastytrade.fetch_transactions(
+        return cache.get_or_refresh(
+            cache_key,
+            lambda: _build_open_execution_groups(
                 token,
                 account_number,
-                start_date=start_date.isoformat(),
-                end_date=end_date.isoformat(),
-                page_offset=page_offset,
-                per_page=TRANSACTION_PAGE_SIZE,
-            )
-            transactions.extend(page.items)
-            if not page.has_more:
-                break
-        else:
-            truncated = True
+                start_date,
+                end_date,
+                fetched_at=fetched_at,
+                session_factory=session_factory,
+            ),
+            ttl=EXECUTION_HISTORY_TTL_SECONDS,
+            stale_ttl=EXECUTION_HISTORY_STALE_SECONDS,
+        )
     except Exception:
         warning = "Brokerage transaction history is unavailable."
         return OpenExecutionGroupCollectionV1(
@@ -71,6 +80,44 @@ def load_open_execution_groups(
             warnings=[warning],
         )
 
+
+def _build_open_execution_groups(
+    token: str,
+    account_number: str,
+    start_date: date,
+    end_date: date,
+    *,
+    fetched_at: datetime,
+    session_factory: Callable[[], Session],
+) -> OpenExecutionGroupCollectionV1:
+    sync_failed = False
+    truncated = False
+    with session_factory() as db:
+        try:
+            truncated = sync_transactions(
+                db,
+                token,
+                account_number,
+                start_date,
+                end_date,
+                synced_at=fetched_at,
+            ).truncated
+        except Exception:
+            db.rollback()
+            if not has_synced(db, account_number):
+                raise
+            logging.exception(
+                "Transaction sync failed for account %s; using the local ledger.",
+                account_number,
+            )
+            sync_failed = True
+        transactions = list_ledger_transactions(
+            db,
+            account_number,
+            start_date,
+            end_date,
+        )
+
     grouped = defaultdict(list)
     unmatched = []
     for transaction in transactions:
@@ -98,6 +145,10 @@ def load_open_execution_groups(
         warnings.append(
             f"Transaction history exceeded {MAX_TRANSACTION_PAGES} pages."
         )
+    if sync_failed:
+        warnings.append(
+            "Transaction sync failed; recent executions may be missing."
+        )
     if unmatched:
         warnings.append(
             f"{len(unmatched)} opening transactions lacked group-fill and order IDs."
@@ -112,13 +163,16 @@ def load_open_execution_groups(
             source="tastytrade",
             endpoint=f"/accounts/{account_number}/transactions",
             fetched_at=fetched_at,
-            status=DataStatus.PARTIAL if truncated or unmatched else DataStatus.OK,
+            status=(
+                DataStatus.PARTIAL
+                if sync_failed or truncated or unmatched
+                else DataStatus.OK
+            ),
             warnings=warnings,
         ),
         truncated=truncated,
         warnings=warnings,
     )
-    cache.set(cache_key, result, ttl=EXECUTION_HISTORY_TTL_SECONDS)
     return result
 
 
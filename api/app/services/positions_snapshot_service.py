@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PositionsSnapshot:
+    """One build of the multi-account positions pipeline."""
+
+    version: int
+    accounts_data: List[dict]
+    built_at: datetime
+    built_monotonic: float
+
+    def age_seconds(self) -> float:
+        return max(0.0, time.monotonic() - self.built_monotonic)
+
+
+class PositionsSnapshotCache:
+    """
+    Versioned, TTL-bounded holder for the latest positions snapshot.
+
+    Concurrent callers that find the snapshot missing or expired share a
+    single rebuild. A failed rebuild is not cached. The accounts_data list
+    is shared between requests, so consumers must treat it as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.positions_snapshot_ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[PositionsSnapshot] = None
+        self._version = 0
+        self._rebuild: Optional[asyncio.Future] = None
+
+    def peek(self) -> Optional[PositionsSnapshot]:
+        """Return the current snapshot if it is still within its TTL."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age_seconds() < self.ttl_seconds:
+            return snapshot
+        return None
+
+    async def get(
+        self,
+        loader: Callable[[], Awaitable[List[dict]]],
+        *,
+        fresh: bool = False,
+    ) -> PositionsSnapshot:
+        """
+        Return a snapshot within its TTL, rebuilding it with ``loader`` when needed.
+
+        ``fresh`` skips the cached snapshot but still joins an in-flight rebuild.
+        """
+        if not fresh:
+            snapshot = self.peek()
+            if snapshot is not None:
+                return snapshot
+
+        rebuild = self._rebuild
+        if (
+            rebuild is None
+            or rebuild.done()
+            or rebuild.get_loop() is not asyncio.get_running_loop()
+        ):
+            rebuild = asyncio.ensure_future(self._build(loader))
+            self._rebuild = rebuild
+        return await asyncio.shield(rebuild)
+
+    async def _build(self, loader: Callable[[], Awaitable[List[dict]]]) -> PositionsSnapshot:
+        accounts_data = await loader()
+        self._version += 1
+        snapshot = PositionsSnapshot(
+            version=self._version,
+            accounts_data=accounts_data,
+            built_at=datetime.now(timezone.utc),
+            built_monotonic=time.monotonic(),
+        )
+        self._snapshot = snapshot
+        logger.debug(f"Positions snapshot v{snapshot.version} built")
+        return snapshot
+
+    def clear(self) -> None:
+        """Drop the current snapshot; the next caller rebuilds it."""
+        self._snapshot = None
+        self._rebuild = None
+
+
+# Global snapshot cache instance
+_snapshot_cache: Optional[PositionsSnapshotCache] = None
+
+
+def get_positions_snapshot_cache() -> PositionsSnapshotCache:
+    """Get the global positions snapshot cache (singleton pattern)."""
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        _snapshot_cache = PositionsSnapshotCache()
+    return _snapshot_cache
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Sequence, Type, TypeVar
+
+from app import tastytrade
+from app.services.cache_service import InMemoryCache, get_cache
+from app.settings import settings
+from app.tastytrade_schema import TastyMarketData, TastyModel, TastyVolatilityMetric
+
+Item = TypeVar("Item", bound=TastyModel)
+
+# Extra broker-style field stamped on every item: when that symbol was fetched.
+AS_OF_FIELD = "as-of"
+
+
+def fetch_market_data_cached(
+    token: str,
+    equity: List[str],
+    equity_option: List[str],
+    future: List[str],
+    future_option: List[str],
+    *,
+    ttl: int = settings.quote_cache_ttl_seconds,
+    cache: Optional[InMemoryCache] = None,
+) -> List[TastyMarketData]:
+    """
+    /market-data/by-type with a per-symbol cache.
+
+    Only symbols without a fresh quote are requested; the rest come from
+    the cache. Every item carries its own "as-of" fetch time.
+    """
+    groups = [equity, equity_option, future, future_option]
+    return _fetch_by_symbol(
+        "quote",
+        TastyMarketData,
+        groups,
+        lambda missing: tastytrade.fetch_market_data(token, *missing),
+        ttl=ttl,
+        cache=cache,
+    )
+
+
+def fetch_volatility_data_cached(
+    token: str,
+    symbols: List[str],
+    *,
+    ttl: int = settings.volatility_cache_ttl_seconds,
+    cache: Optional[InMemoryCache] = None,
+) -> List[TastyVolatilityMetric]:
+    """/market-metrics with a per-symbol cache; see fetch_market_data_cached."""
+    return _fetch_by_symbol(
+        "metrics",
+        TastyVolatilityMetric,
+        [symbols],
+        lambda missing: tastytrade.fetch_volatility_data(token, missing[0]),
+        ttl=ttl,
+        cache=cache,
+    )
+
+
+def _fetch_by_symbol(
+    prefix: str,
+    model: Type[Item],
+    groups: Sequence[Sequence[str]],
+    fetch: Callable[[List[List[str]]], List[Any]],
+    *,
+    ttl: int,
+    cache: Optional[InMemoryCache],
+) -> List[Item]:
+    cache = cache or get_cache()
+    found = {}
+    missing = []
+    for group in groups:
+        group_missing = []
+        for symbol in dict.fromkeys(group):
+            item = cache.get(f"{prefix}:{symbol}")
+            if item is None:
+                group_missing.append(symbol)
+            else:
+                found[symbol] = item
+        missing.append(group_missing)
+
+    extra = []
+    if any(missing):
+        as_of = datetime.now(timezone.utc).isoformat()
+        for raw_item in fetch(missing):
+            item = (
+                raw_item
+                if isinstance(raw_item, model)
+                else model.model_validate(raw_item)
+            )
+            if not item.symbol:
+                continue
+            stamped = item.model_copy(update={AS_OF_FIELD: as_of})
+            cache.set(f"{prefix}:{item.symbol}", stamped, ttl=ttl)
+            if item.symbol in found:
+                continue
+            found[item.symbol] = stamped
+            extra.append(stamped)
+
+    ordered = [
+        found.pop(symbol)
+        for group in groups
+        for symbol in dict.fromkeys(group)
+        if symbol in found
+    ]
+    return ordered + [item for item in extra if item.symbol in found]
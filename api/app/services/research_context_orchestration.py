@@ -1,7 +1,11 @@
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
+import requests
 from sqlalchemy.orm import Session
 
 from app import tastytrade
@@ -13,13 +17,18 @@ from app.schemas.brokerage import (
     SourceMetadataV1,
 )
 from app.services.brokerage_service import fetch_holding_snapshot
+from app.services.quote_cache_service import (
+    fetch_market_data_cached,
+    fetch_volatility_data_cached,
+)
 from app.services.research_context_service import (
     build_research_symbol_context,
 )
 from app.services.research_metric_store import (
-    list_research_metric_history,
-    upsert_research_metric,
+    list_recent_research_metrics,
+    upsert_research_metrics,
 )
+from app.settings import settings
 
 
 _MARKET_TIMEZONE = ZoneInfo("America/New_York")
@@ -30,7 +39,41 @@ _SOURCE_WARNINGS = {
     "/brokerage/holding-snapshot": "Current brokerage exposure is unavailable.",
 }
 _STORAGE_ENDPOINT = "/research-metric-snapshots"
-_BROKER_BATCH_SIZE = 100
+# Answers that mean "this batch was too big", so it is worth halving.
+_OVERSIZED_BATCH_STATUSES = frozenset({413, 414, 504})
+
+
+class _BatchSizer:
+    """
+    Adaptive symbol batch size for one broker endpoint, shared by requests.
+
+    A batch that is slow or times out halves the size used afterwards;
+    fast batches grow it back in steps of a tenth of the maximum.
+    """
+
+    def __init__(self, maximum: int):
+        self.maximum = maximum
+        self._size = maximum
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def shrink(self, batch_size: int) -> None:
+        with self._lock:
+            self._size = max(1, min(self._size, batch_size // 2))
+
+    def record(self, batch_size: int, elapsed: float, slow_seconds: float) -> None:
+        if elapsed > slow_seconds:
+            self.shrink(batch_size)
+            return
+        with self._lock:
+            self._size = min(self.maximum, self._size + max(1, self.maximum // 10))
+
+
+_MARKET_BATCHES = _BatchSizer(settings.research_context_batch_size)
+_VOLATILITY_BATCHES = _BatchSizer(settings.research_context_batch_size)
 
 
 def _symbols(values: list[str]) -> list[str]:
@@ -41,9 +84,73 @@ def _symbols(values: list[str]) -> list[str]:
     )
 
 
-def _batches(values: list[str], size: int = _BROKER_BATCH_SIZE):
-    for start in range(0, len(values), size):
-        yield values[start : start + size]
+def _batches(
+    values: list[str],
+    size: int,
+    max_chars: int = settings.research_context_batch_max_chars,
+):
+    """Yield batches of at most size symbols whose joined query stays under max_chars."""
+    batch: list[str] = []
+    length = 0
+    for value in values:
+        if batch and (len(batch) >= size or length + 1 + len(value) > max_chars):
+            yield batch
+            batch = []
+            length = 0
+        length += len(value) + (1 if batch else 0)
+        batch.append(value)
+    if batch:
+        yield batch
+
+
+def _is_oversized_batch_failure(exc: Exception) -> bool:
+    if isinstance(exc, requests.Timeout):
+        return True
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) in _OVERSIZED_BATCH_STATUSES
+
+
+def _fetch_batch(
+    fetch,
+    batch: list[str],
+    sizer: _BatchSizer,
+    slow_seconds: float = settings.research_context_batch_slow_seconds,
+) -> list:
+    """Fetch one batch, halving it while the broker times out or rejects its size."""
+    started = time.perf_counter()
+    try:
+        items = fetch(batch)
+    except Exception as exc:
+        if len(batch) < 2 or not _is_oversized_batch_failure(exc):
+            raise
+        sizer.shrink(len(batch))
+        middle = len(batch) // 2
+        return (
+            _fetch_batch(fetch, batch[:middle], sizer, slow_seconds)
+            + _fetch_batch(fetch, batch[middle:], sizer, slow_seconds)
+        )
+    sizer.record(len(batch), time.perf_counter() - started, slow_seconds)
+    return items
+
+
+def _batch_results(futures: list[Future], endpoint: str) -> list:
+    """
+    Concatenate batch results in order.
+
+    A failed batch only drops its own symbols; the source fails when every
+    batch does.
+    """
+    results = []
+    errors = []
+    for future in futures:
+        try:
+            results.extend(future.result())
+        except Exception as exc:
+            logging.warning(f"A {endpoint} batch failed: {exc}")
+            errors.append(exc)
+    if errors and len(errors) == len(futures):
+        raise errors[0]
+    return results
 
 
 def _empty_holding_snapshot(fetched_at: datetime) -> HoldingSnapshotV1:
@@ -93,11 +200,14 @@ def _persist_and_enrich(
     fetched_at: datetime,
 ) -> None:
     observation_date = fetched_at.astimezone(_MARKET_TIMEZONE).date()
-    for item in context.items:
-        if item.price.as_of is None and item.volatility.as_of is None:
-            continue
-        upsert_research_metric(
-            db,
+    observed = [
+        item
+        for item in context.items
+        if item.price.as_of is not None or item.volatility.as_of is not None
+    ]
+    upsert_research_metrics(
+        db,
+        [
             ResearchMetricObservationV1(
                 symbol=item.symbol,
                 observation_date=observation_date,
@@ -114,14 +224,18 @@ def _persist_and_enrich(
                     item.volatility.iv_index_5_day_change_percent
                 ),
                 liquidity_rating=item.volatility.liquidity_rating,
-            ),
-        )
-        history = list_research_metric_history(
-            db,
-            item.symbol,
-            end_date=observation_date,
-            limit=6,
-        )
+            )
+            for item in observed
+        ],
+    )
+    histories = list_recent_research_metrics(
+        db,
+        [item.symbol for item in observed],
+        end_date=observation_date,
+        limit=6,
+    )
+    for item in observed:
+        history = histories.get(item.symbol.strip().upper(), [])
         if len(history) != 6:
             continue
         baseline = history[0]
@@ -148,60 +262,85 @@ def fetch_research_symbol_context(
     *,
     fetched_at: datetime | None = None,
     watchlists_override: list | None = None,
+    max_workers: int = settings.research_context_fetch_workers,
 ) -> ResearchSymbolContextV1:
+    """
+    Join brokerage sources for the symbols and persist daily metrics.
+
+    Watchlists, every market-data and volatility batch, and the holding
+    snapshot are fetched concurrently on at most max_workers threads. A
+    failed source is marked unavailable without failing the others, and a
+    failed batch only leaves its own symbols missing.
+    """
     fetched_at = fetched_at or datetime.now(timezone.utc)
     requested = _symbols(symbols)
     if not requested:
         raise ValueError("At least one non-empty symbol is required.")
 
     source_failures: set[str] = set()
-    if watchlists_override is not None:
-        watchlists = watchlists_override
-    else:
-        try:
-            watchlists = tastytrade.fetch_watchlists(token)
-        except Exception:
-            logging.exception("Failed to fetch brokerage watchlists.")
-            watchlists = []
-            source_failures.add("/watchlists")
-
-    try:
-        market_data = []
-        for batch in _batches(requested):
-            market_data.extend(
-                tastytrade.fetch_market_data(
-                    token,
-                    batch,
-                    [],
-                    [],
-                    [],
-                )
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="research-context",
+    ) as executor:
+        watchlists_future = (
+            executor.submit(tastytrade.fetch_watchlists, token)
+            if watchlists_override is None
+            else None
+        )
+        market_futures = [
+            executor.submit(
+                _fetch_batch,
+                lambda batch: fetch_market_data_cached(token, batch, [], [], []),
+                batch,
+                _MARKET_BATCHES,
             )
-    except Exception:
-        logging.exception("Failed to fetch brokerage market data.")
-        market_data = []
-        source_failures.add("/market-data/by-type")
-
-    try:
-        volatility_metrics = []
-        for batch in _batches(requested):
-            volatility_metrics.extend(
-                tastytrade.fetch_volatility_data(token, batch)
+            for batch in _batches(requested, _MARKET_BATCHES.size)
+        ]
+        volatility_futures = [
+            executor.submit(
+                _fetch_batch,
+                lambda batch: fetch_volatility_data_cached(token, batch),
+                batch,
+                _VOLATILITY_BATCHES,
             )
-    except Exception:
-        logging.exception("Failed to fetch brokerage volatility metrics.")
-        volatility_metrics = []
-        source_failures.add("/market-metrics")
-
-    try:
-        holding_snapshot = fetch_holding_snapshot(
+            for batch in _batches(requested, _VOLATILITY_BATCHES.size)
+        ]
+        holding_future = executor.submit(
+            fetch_holding_snapshot,
             token,
             fetched_at=fetched_at,
         )
-    except Exception:
-        logging.exception("Failed to fetch brokerage holding context.")
-        holding_snapshot = _empty_holding_snapshot(fetched_at)
-        source_failures.add("/brokerage/holding-snapshot")
+
+        if watchlists_future is None:
+            watchlists = watchlists_override
+        else:
+            try:
+                watchlists = watchlists_future.result()
+            except Exception:
+                logging.exception("Failed to fetch brokerage watchlists.")
+                watchlists = []
+                source_failures.add("/watchlists")
+
+        try:
+            market_data = _batch_results(market_futures, "/market-data/by-type")
+        except Exception:
+            logging.exception("Failed to fetch brokerage market data.")
+            market_data = []
+            source_failures.add("/market-data/by-type")
+
+        try:
+            volatility_metrics = _batch_results(volatility_futures, "/market-metrics")
+        except Exception:
+            logging.exception("Failed to fetch brokerage volatility metrics.")
+            volatility_metrics = []
+            source_failures.add("/market-metrics")
+
+        try:
+            holding_snapshot = holding_future.result()
+        except Exception:
+            logging.exception("Failed to fetch brokerage holding context.")
+            holding_snapshot = _empty_holding_snapshot(fetched_at)
+            source_failures.add("/brokerage/holding-snapshot")
 
     context = build_research_symbol_context(
         requested,
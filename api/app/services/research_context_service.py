@@ -43,6 +43,14 @@ def _percent(value) -> float | None:
     return round(number * 100, 2) if number is not None else None
 
 
+def _as_of(item: Mapping | None, fetched_at: datetime) -> datetime | None:
+    """Per-symbol fetch time from the quote cache, else the request time."""
+    if not item:
+        return None
+    as_of = item.get("as-of")
+    return datetime.fromisoformat(as_of) if as_of else fetched_at
+
+
 def _normalize_symbols(symbols: Sequence[str]) -> list[str]:
     return list(dict.fromkeys(
         symbol.strip().upper() for symbol in symbols if symbol.strip()
@@ -280,7 +288,7 @@ def build_research_symbol_context(
                     mark=mark,
                     previous_close=previous_close,
                     day_change_percent=day_change,
-                    as_of=fetched_at if market else None,
+                    as_of=_as_of(market, fetched_at),
                 ),
                 volatility=VolatilityContextV1(
                     iv_index_percent=_percent(
@@ -300,7 +308,7 @@ def build_research_symbol_context(
                     liquidity_rating=_number(
                         volatility.get("liquidity-rating")
                     ) if volatility else None,
-                    as_of=fetched_at if volatility else None,
+                    as_of=_as_of(volatility, fetched_at),
                 ),
                 earnings=earnings,
                 exposure=exposure,
@@ -1,7 +1,9 @@
+from collections.abc import Iterable
 from datetime import date
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, aliased
 
 from app.models import ResearchMetricSnapshotORM
 from app.schemas.brokerage import ResearchMetricObservationV1
@@ -63,6 +65,99 @@ def upsert_research_metric(
     return _to_schema(existing)
 
 
+def upsert_research_metrics(
+    db: Session,
+    observations: Iterable[ResearchMetricObservationV1],
+) -> int:
+    """
+    Upsert many observations in one statement and one commit.
+
+    Same-day refreshes follow upsert_research_metric: timestamps always
+    move forward, and a null value never erases a stored one.
+    """
+    rows = [
+        {
+            "symbol": observation.symbol,
+            "observation_date": observation.observation_date,
+            "source": observation.source,
+            **{field: getattr(observation, field) for field in _VALUE_FIELDS},
+        }
+        for observation in map(_normalized, observations)
+    ]
+    if not rows:
+        return 0
+
+    statement = insert(ResearchMetricSnapshotORM)
+    excluded = statement.excluded
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["symbol", "observation_date", "source"],
+            set_={
+                **{
+                    field: (
+                        excluded[field]
+                        if field in {"observed_at", "fetched_at"}
+                        else func.coalesce(
+                            excluded[field],
+                            getattr(ResearchMetricSnapshotORM, field),
+                        )
+                    )
+                    for field in _VALUE_FIELDS
+                },
+                "updated_at": func.now(),
+            },
+        ),
+        rows,
+    )
+    db.commit()
+    return len(rows)
+
+
+def list_recent_research_metrics(
+    db: Session,
+    symbols: Iterable[str],
+    *,
+    end_date: date,
+    limit: int,
+) -> dict[str, list[ResearchMetricObservationV1]]:
+    """
+    Return up to ``limit`` latest observations per symbol in one query.
+
+    Each list is oldest first, matching list_research_metric_history.
+    """
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols))
+    if not symbols:
+        return {}
+    ranked = (
+        select(
+            ResearchMetricSnapshotORM,
+            func.row_number()
+            .over(
+                partition_by=ResearchMetricSnapshotORM.symbol,
+                order_by=ResearchMetricSnapshotORM.observation_date.desc(),
+            )
+            .label("recency"),
+        )
+        .where(
+            ResearchMetricSnapshotORM.symbol.in_(symbols),
+            ResearchMetricSnapshotORM.observation_date <= end_date,
+        )
+        .subquery()
+    )
+    snapshot = aliased(ResearchMetricSnapshotORM, ranked)
+    rows = db.scalars(
+        select(snapshot)
+        .where(ranked.c.recency <= limit)
+        .order_by(snapshot.symbol, snapshot.observation_date)
+    ).all()
+    history: dict[str, list[ResearchMetricObservationV1]] = {
+        symbol: [] for symbol in symbols
+    }
+    for row in rows:
+        history[row.symbol].append(_to_schema(row))
+    return history
+
+
 def list_research_metric_history(
     db: Session,
     symbol: str,
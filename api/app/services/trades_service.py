@@ -1,13 +1,26 @@
+import asyncio
 import logging
 import re
 from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Tuple, Set, Optional
 from datetime import date, datetime, timezone
 
+import numpy as np
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app import tastytrade
+from app.settings import settings
+from app.services.instrument_parser import (
+    expiration_date_text,
+    expiration_day,
+    parse_option_symbol,
+)
+from app.services.quote_cache_service import (
+    fetch_market_data_cached,
+    fetch_volatility_data_cached,
+)
 from app.services.trades_errors import TastytradeAuthError, TastytradeFetchError
 from app.services.strategy_classifier import classify_strategy
 
@@ -70,57 +83,48 @@ def _compact_dict(data: dict) -> dict:
 
 
 def extract_expiration_date(expires_at: str) -> str:
-    """
-    Extract just the date part from an expiration timestamp, ignoring time.
-    
-    Args:
-        expires_at: ISO format timestamp like "2025-08-15T20:15:00.000+00:00"
-    
-    Returns:
-        Date string like "2025-08-15" or original string if parsing fails
-    """
-    if not expires_at:
-        return expires_at
-    
-    try:
-        # Parse the ISO format timestamp and extract just the date
-        dt = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
-        return dt.strftime('%Y-%m-%d')
-    except (ValueError, AttributeError):
-        # If parsing fails, try to extract date with simple string manipulation
-        if 'T' in expires_at:
-            return expires_at.split('T')[0]
-        return expires_at
+    """Date part ("2025-08-15") of an expiration timestamp, parsed once per value."""
+    return expiration_date_text(expires_at)
 
 
 def days_to_expiration(expires_at: str, today: Optional[date] = None) -> Optional[int]:
-    expiration_date = extract_expiration_date(expires_at)
-    if not expiration_date:
-        return None
-    try:
-        expires_on = date.fromisoformat(expiration_date)
-    except ValueError:
+    expires_on = expiration_day(expires_at)
+    if expires_on is None:
         return None
     today = today or datetime.now().date()
     return (expires_on - today).days
 
 
-def _signed_credit_value(position: dict, price: Optional[float]) -> Optional[float]:
-    if price is None:
-        return None
-    quantity, multiplier = _quantity_multiplier(position)
-    value = price * quantity * multiplier
-    return value if (position.get("quantity-direction") or "").strip().lower() == "short" else -value
+def _is_short(quantity_direction: Optional[str]) -> bool:
+    return (quantity_direction or "").strip().lower() == "short"
 
 
 def _position_money_fields(position: dict) -> dict[str, Optional[float]]:
-    avg_open = _numeric_field(position, "average-open-price")
-    mark = _numeric_field(position.get("market_data", {}), "mark")
     quantity, multiplier = _quantity_multiplier(position)
+    return _money_fields(
+        _numeric_field(position, "average-open-price"),
+        _numeric_field(position.get("market_data", {}), "mark"),
+        quantity,
+        multiplier,
+        short=_is_short(position.get("quantity-direction")),
+    )
+
+
+def _money_fields(
+    avg_open: Optional[float],
+    mark: Optional[float],
+    quantity: int,
+    multiplier: int,
+    *,
+    short: bool,
+) -> dict[str, Optional[float]]:
     open_value = avg_open * quantity * multiplier if avg_open is not None else None
     current_value = mark * quantity * multiplier if mark is not None else None
-    signed_open = _signed_credit_value(position, avg_open)
-    signed_current = _signed_credit_value(position, mark)
+    # Credits are positive: short legs were sold, long legs were paid for.
+    signed_open = (open_value if short else -open_value) if open_value is not None else None
+    signed_current = (
+        (current_value if short else -current_value) if current_value is not None else None
+    )
     unrealized = None
     if signed_open is not None and signed_current is not None:
         unrealized = signed_open - signed_current
@@ -146,6 +150,76 @@ def _assignment_exposure(position: dict) -> Optional[float]:
     return round(strike * quantity * multiplier, 2)
 
 
+_POSITION_GREEKS = ("delta", "theta", "vega", "gamma", "rho")
+
+
+@dataclass(slots=True, eq=False)
+class PositionLeg:
+    """
+    One broker position leg with its numeric fields parsed once.
+
+    ``payload`` is the alias-keyed broker dict and is never copied: the
+    pipeline adds market data and money fields to it in place, and it is the
+    leg's JSON shape in the response. get() reads the payload, so grouping
+    and classification code accepts legs and raw position dicts alike.
+    """
+
+    payload: dict
+    quantity: int
+    multiplier: int
+    direction: Optional[str]
+    short: bool
+    average_open: Optional[float]
+    strike: Optional[float]
+    p_l: float = 0.0
+    mark: Optional[float] = None
+    delta: float = 0.0
+    position_greeks: Tuple[float, ...] = (0.0,) * len(_POSITION_GREEKS)
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "PositionLeg":
+        quantity, multiplier = _quantity_multiplier(payload)
+        direction = payload.get("quantity-direction")
+        try:
+            p_l = float(payload.get("approximate-p-l", 0))
+        except (ValueError, TypeError):
+            p_l = 0.0
+        leg = cls(
+            payload=payload,
+            quantity=quantity,
+            multiplier=multiplier,
+            direction=direction,
+            short=_is_short(direction),
+            average_open=_numeric_field(payload, "average-open-price"),
+            strike=_numeric_field(payload, "strike"),
+            p_l=p_l,
+        )
+        leg._read_market_data(payload.get("market_data", {}))
+        return leg
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.payload.get(key, default)
+
+    def set_market_data(self, market_data: dict) -> None:
+        self.payload["market_data"] = market_data
+        self._read_market_data(market_data)
+
+    def _read_market_data(self, market_data: dict) -> None:
+        self.mark = _numeric_field(market_data, "mark")
+        try:
+            self.delta = float(market_data.get("computed_delta", 0))
+        except (TypeError, ValueError):
+            self.delta = 0.0
+        self.position_greeks = tuple(
+            _optional_float(market_data.get(f"computed_position_{greek}")) or 0.0
+            for greek in _POSITION_GREEKS
+        )
+
+
+def _as_leg(position: Any) -> PositionLeg:
+    return position if isinstance(position, PositionLeg) else PositionLeg.from_payload(position)
+
+
 def _spread_percent(position: dict) -> Optional[float]:
     market_data = position.get("market_data", {})
     bid = _numeric_field(market_data, "bid")
@@ -193,32 +267,13 @@ def _management_flags(
 
 def parse_equity_option_symbol(symbol: str) -> Tuple[Optional[float], Optional[str]]:
     """
-    Parse OCC-formatted equity option symbol to extract strike and option type.
-    
-    Format: ROOT(6 chars, padded) + YYMMDD + C/P + Strike(8 digits)
-    Example: AAPL  220617C00150000
-    
-    Returns:
-        Tuple of (strike_price, option_type) or (None, None) if parsing fails
+    Strike and option type of an OCC equity option symbol such as
+    "AAPL  220617C00150000", or (None, None) if it does not parse.
     """
-    if not symbol or len(symbol) < 21:  # Minimum length for OCC format
-        return None, None
-    
-    try:
-        # Extract the last 9 characters (option type + 8-digit strike)
-        option_suffix = symbol[-9:]
-        option_type = option_suffix[0]  # C or P
-        strike_str = option_suffix[1:]  # 8-digit strike
-        
-        if option_type not in ('C', 'P'):
-            return None, None
-            
-        # Convert 8-digit strike to float (divide by 1000)
-        strike_price = float(strike_str) / 1000.0
-        
-        return strike_price, option_type
-    except (ValueError, IndexError):
+    parsed = parse_option_symbol(symbol)
+    if parsed is None:
         return None, None
+    return parsed.strike, parsed.option_type
 
 
 def acquire_token(db: Session) -> str:
@@ -242,37 +297,39 @@ def fetch_accounts(token: str) -> List[dict]:
         raise TastytradeFetchError(f"Failed to fetch accounts: {e}") from e
 
 
-def collect_positions_and_symbols(
-    token: str, accounts: List[dict]
+def fetch_account_positions(token: str, account_number: str) -> List[dict]:
+    """Fetch one account's positions as alias-keyed dictionaries."""
+    try:
+        return [
+            _as_tasty_dict(position)
+            for position in tastytrade.fetch_positions(token, account_number)
+        ]
+    except Exception as e:
+        logging.error(f"Failed to fetch positions for account {account_number}: {e}")
+        raise TastytradeFetchError(
+            f"Failed to fetch positions for account {account_number}: {e}"
+        ) from e
+
+
+def _index_positions_and_symbols(
+    accounts: List[dict], fetched_positions
 ) -> Tuple[List[dict], Set[str], Set[str], Set[str], Set[str]]:
-    """Fetch positions per account and gather unique symbols."""
     positions_by_account: List[dict] = []
     equity_option_syms: Set[str] = set()
     future_option_syms: Set[str] = set()
     equity_underlyings: Set[str] = set()
     future_underlyings: Set[str] = set()
 
-    for acct in accounts:
+    for acct, raw_positions in zip(accounts, fetched_positions):
         acct_num = acct.get("account_number")
         nickname = acct.get("nickname", "")
-        try:
-            raw_positions = [
-                _as_tasty_dict(position)
-                for position in tastytrade.fetch_positions(token, acct_num)
-            ]
-        except Exception as e:
-            logging.error(f"Failed to fetch positions for account {acct_num}: {e}")
-            raise TastytradeFetchError(
-                f"Failed to fetch positions for account {acct_num}: {e}"
-            ) from e
 
         filtered = [p for p in raw_positions if p.get("instrument-type", "") != "Equity"]
         if not filtered:
             continue
 
-        augmented: List[dict] = []
-        for pos in filtered:
-            p = pos.copy()
+        legs: List[PositionLeg] = []
+        for p in filtered:
             symbol = p.get("symbol")
             inst_type = p.get("instrument-type", "")
             if symbol:
@@ -286,12 +343,13 @@ def collect_positions_and_symbols(
                     future_underlyings.add(underlying)
                 else:
                     equity_underlyings.add(underlying)
-            augmented.append(p)
+            # Fetched payloads are already private dicts, so wrap without copying.
+            legs.append(PositionLeg.from_payload(p))
 
         positions_by_account.append({
             "account_number": acct_num,
             "nickname": nickname,
-            "positions": augmented,
+            "positions": legs,
         })
 
     return (
@@ -303,6 +361,17 @@ def collect_positions_and_symbols(
     )
 
 
+def collect_positions_and_symbols(
+    token: str, accounts: List[dict]
+) -> Tuple[List[dict], Set[str], Set[str], Set[str], Set[str]]:
+    """Fetch positions per account and gather unique symbols."""
+    fetched = (
+        fetch_account_positions(token, acct.get("account_number"))
+        for acct in accounts
+    )
+    return _index_positions_and_symbols(accounts, fetched)
+
+
 def fetch_market_and_beta_data(
     token: str,
     equity_option_syms: Set[str],
@@ -325,7 +394,7 @@ def fetch_market_and_beta_data(
         return market_map, beta_map
 
     try:
-        md_list = tastytrade.fetch_market_data(
+        md_list = fetch_market_data_cached(
             token,
             sorted(equity_underlyings),
             sorted(equity_option_syms),
@@ -356,15 +425,29 @@ def fetch_market_and_beta_data(
 def augment_positions_with_market_data(
     positions_by_account: List[dict], market_map: Dict[str, dict], beta_map: Dict[str, float]
 ) -> None:
-    """Attach market data, compute P/L and beta for each position."""
+    """
+    Attach market data, compute P/L and beta for each position.
+
+    Positions are PositionLeg records or raw payload dicts; either way the
+    payload dict is updated in place. A market_map entry becomes the
+    market_data of the first leg with its symbol; only later legs with the
+    same symbol get their own copy, since computed fields depend on the leg.
+    """
+    claimed: Set[str] = set()
     for acct in positions_by_account:
-        for p in acct["positions"]:
+        for leg in map(_as_leg, acct["positions"]):
+            p = leg.payload
             sym = p.get("symbol")
+            qty_dir = leg.direction
             if sym and sym in market_map:
-                md_item = market_map[sym].copy()
-                qty_dir = p.get("quantity-direction")
-                direction_sign = _direction_sign(qty_dir)
-                quantity, multiplier = _quantity_multiplier(p)
+                md_item = market_map[sym]
+                if sym in claimed:
+                    md_item = {
+                        key: value
+                        for key, value in md_item.items()
+                        if not key.startswith("computed_")
+                    }
+                claimed.add(sym)
                 delta_val = md_item.get("delta")
                 if qty_dir and delta_val is not None:
                     try:
@@ -379,8 +462,8 @@ def augment_positions_with_market_data(
                         else:
                             sign = 1
                         md_item["computed_delta"] = round(sign * delta_float, 2)
-                position_greek_sign = direction_sign * quantity * multiplier
-                for greek in ("delta", "theta", "vega", "gamma", "rho"):
+                position_greek_sign = _direction_sign(qty_dir) * leg.quantity * leg.multiplier
+                for greek in _POSITION_GREEKS:
                     greek_value = _optional_float(md_item.get(greek))
                     if greek_value is not None:
                         md_item[f"computed_position_{greek}"] = round(
@@ -389,25 +472,27 @@ def augment_positions_with_market_data(
             else:
                 md_item = {}
 
-            p["market_data"] = md_item
+            leg.set_market_data(md_item)
 
-            try:
-                avg_open = float(p.get("average-open-price", "0"))
-                mark = float(md_item.get("mark"))
-                quantity, multiplier = _quantity_multiplier(p)
-                qty_dir = p.get("quantity-direction")
-            except (TypeError, ValueError):
+            # An absent basis counts as zero; one that is present but unparsable voids the P/L.
+            avg_open = leg.average_open if "average-open-price" in p else 0.0
+            if avg_open is None or leg.mark is None:
                 approximate_pl = 0.0
+            elif qty_dir == "Long":
+                approximate_pl = (leg.mark - avg_open) * leg.quantity * leg.multiplier
             else:
-                if qty_dir == "Long":
-                    approximate_pl = (mark - avg_open) * quantity * multiplier
-                else:
-                    approximate_pl = (avg_open - mark) * quantity * multiplier
+                approximate_pl = (avg_open - leg.mark) * leg.quantity * leg.multiplier
 
-            p["approximate-p-l"] = round(approximate_pl, 2)
+            leg.p_l = p["approximate-p-l"] = round(approximate_pl, 2)
             p.update({
                 key.replace("_", "-"): value
-                for key, value in _position_money_fields(p).items()
+                for key, value in _money_fields(
+                    leg.average_open,
+                    leg.mark,
+                    leg.quantity,
+                    leg.multiplier,
+                    short=leg.short,
+                ).items()
                 if value is not None
             })
 
@@ -420,7 +505,7 @@ def augment_positions_with_market_data(
             if inst_type == "Equity Option" and sym:
                 strike, option_type = parse_equity_option_symbol(sym)
                 if strike is not None:
-                    p["strike"] = strike
+                    p["strike"] = leg.strike = strike
                 if option_type is not None:
                     p["option-type"] = option_type
 
@@ -440,33 +525,20 @@ def _position_quantity(position: dict) -> float:
         return 0
 
 
-def _cross_expiration_candidate(
-    left: dict,
-    right: dict,
-    *,
-    same_strike: bool,
-) -> bool:
-    if (
-        left.get("instrument-type") != "Equity Option"
-        or right.get("instrument-type") != "Equity Option"
-        or left.get("option-type") not in {"C", "P"}
-        or left.get("option-type") != right.get("option-type")
-        or left.get("quantity-direction") == right.get("quantity-direction")
-        or extract_expiration_date(left.get("expires-at", ""))
-        == extract_expiration_date(right.get("expires-at", ""))
-        or _position_quantity(left) != _position_quantity(right)
-    ):
-        return False
-    if same_strike:
-        return left.get("strike") == right.get("strike")
-    return left.get("strike") != right.get("strike")
-
-
 def _pair_unambiguous_cross_expiration_legs(
     positions: list[dict],
     *,
     same_strike: bool,
 ) -> tuple[list[list[dict]], list[dict]]:
+    """
+    Pair calendar (same_strike) or diagonal legs that have exactly one match.
+
+    Two Equity Option legs match when they share option type and quantity,
+    have opposite directions, and sit alone in different expirations; the
+    strike must be equal for calendars and different for diagonals. Legs are
+    indexed by (option type, quantity), then direction, then strike, so each
+    leg only looks at the handful of entries that could match it.
+    """
     expiration_dates = [
         extract_expiration_date(position.get("expires-at", ""))
         for position in positions
@@ -474,42 +546,69 @@ def _pair_unambiguous_cross_expiration_legs(
     expiration_counts: dict[str, int] = defaultdict(int)
     for expiration_date in expiration_dates:
         expiration_counts[expiration_date] += 1
-    eligible = {
-        index
-        for index, expiration_date in enumerate(expiration_dates)
-        if expiration_counts[expiration_date] == 1
+
+    index: dict[tuple, dict[Any, dict[Any, list[int]]]] = defaultdict(
+        lambda: defaultdict(lambda: defaultdict(list))
+    )
+    for position_index, position in enumerate(positions):
+        if (
+            expiration_counts[expiration_dates[position_index]] != 1
+            or position.get("instrument-type") != "Equity Option"
+            or position.get("option-type") not in {"C", "P"}
+        ):
+            continue
+        # Every indexed leg has its own expiration, so legs from different
+        # entries never share one.
+        index[(position.get("option-type"), _position_quantity(position))][
+            position.get("quantity-direction")
+        ][position.get("strike")].append(position_index)
+
+    def unique_match(position: dict) -> Optional[int]:
+        strike = position.get("strike")
+        direction = position.get("quantity-direction")
+        found: list[int] = []
+        for other_direction, by_strike in index[
+            (position.get("option-type"), _position_quantity(position))
+        ].items():
+            if other_direction == direction:
+                continue
+            if same_strike:
+                found.extend(by_strike.get(strike, ())[:2])
+            else:
+                for other_strike, indices in by_strike.items():
+                    if other_strike != strike:
+                        found.extend(indices[:2])
+                        if len(found) > 1:
+                            break
+            if len(found) > 1:
+                return None
+        return found[0] if found else None
+
+    matches = {
+        position_index: unique_match(positions[position_index])
+        for entries in index.values()
+        for by_strike in entries.values()
+        for indices in by_strike.values()
+        for position_index in indices
     }
-    candidates: dict[int, list[int]] = {}
-    for left_index, left in enumerate(positions):
-        candidates[left_index] = [
-            right_index
-            for right_index, right in enumerate(positions)
-            if left_index in eligible
-            and right_index in eligible
-            and _cross_expiration_candidate(
-                left,
-                right,
-                same_strike=same_strike,
-            )
-        ]
 
     paired: set[int] = set()
     groups: list[list[dict]] = []
-    for left_index, matches in candidates.items():
-        if left_index in paired or len(matches) != 1:
-            continue
-        right_index = matches[0]
+    for left_index in sorted(matches):
+        right_index = matches[left_index]
         if (
-            right_index in paired
-            or candidates.get(right_index) != [left_index]
+            right_index is None
+            or left_index in paired
+            or right_index in paired
+            or matches.get(right_index) != left_index
         ):
             continue
         paired.update({left_index, right_index})
         groups.append([positions[left_index], positions[right_index]])
     return groups, [
         position
-        for index, position in enumerate(positions)
-        if index not in paired
+        for position_index, position in enumerate(positions)
+        if position_index not in paired
     ]
 
 
@@ -564,30 +663,135 @@ def _position_strategy_groups(
     return result
 
 
+def _round_each(values: np.ndarray, digits: int) -> np.ndarray:
+    # Python's round() on each value, so results match the scalar code exactly;
+    # np.round can differ at half-cent ties because it scales before rounding.
+    return np.array([round(value, digits) for value in values.tolist()], dtype=float)
+
+
+def _zero_missing(values: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(values), 0.0, values)
+
+
+_LEG_COLUMNS = (
+    "credit_sign",
+    "average_open",
+    "open_price",
+    "mark",
+    "quantity",
+    "multiplier",
+    "short",
+    "p_l",
+    "put_strike",
+    "delta",
+    "position_delta",
+    "theta",
+    "vega",
+    "gamma",
+    "rho",
+)
+
+
+def _leg_row(leg: PositionLeg) -> tuple:
+    put_strike = leg.strike if leg.short and leg.get("option-type") == "P" else None
+    return (
+        -1 if leg.direction == "Long" else 1,
+        0.0 if leg.average_open is None else leg.average_open,
+        np.nan if leg.average_open is None else leg.average_open,
+        np.nan if leg.mark is None else leg.mark,
+        leg.quantity,
+        leg.multiplier,
+        leg.short,
+        leg.p_l,
+        np.nan if put_strike is None else put_strike,
+        leg.delta,
+        *leg.position_greeks,
+    )
+
+
+def _leg_columns(legs: List[PositionLeg]) -> Dict[str, np.ndarray]:
+    """Lay the parsed legs out as numeric columns (NaN where a value is missing)."""
+    table = np.array(
+        [_leg_row(leg) for leg in legs],
+        dtype=float,
+    ).reshape(len(legs), len(_LEG_COLUMNS))
+    return {name: table[:, index] for index, name in enumerate(_LEG_COLUMNS)}
+
+
+def _group_leg_totals(groups: List[List[PositionLeg]]) -> Dict[str, np.ndarray]:
+    """
+    Sum leg money fields and greeks per strategy group.
+
+    Legs are laid out group by group and summed with np.bincount, which adds
+    in array order, so every total matches a running sum over the legs.
+    """
+    legs = [position for plist in groups for position in plist]
+    sizes = np.array([len(plist) for plist in groups], dtype=np.intp)
+    group_index = np.repeat(np.arange(len(groups), dtype=np.intp), sizes)
+    columns = _leg_columns(legs)
+
+    quantity = columns["quantity"]
+    multiplier = columns["multiplier"]
+    short = columns["short"].astype(bool)
+    open_value = columns["open_price"] * quantity * multiplier
+    current_value = columns["mark"] * quantity * multiplier
+    signed_open = np.where(short, open_value, -open_value)
+    signed_current = np.where(short, current_value, -current_value)
+    per_leg = {
+        "credit": columns["credit_sign"] * columns["average_open"] * quantity,
+        "p_l": columns["p_l"],
+        "open_value": _zero_missing(_round_each(open_value, 2)),
+        "current_value": _zero_missing(_round_each(current_value, 2)),
+        "signed_current_value": _zero_missing(_round_each(signed_current, 2)),
+        "unrealized_pl": _zero_missing(_round_each(signed_open - signed_current, 2)),
+        "assignment_exposure": _zero_missing(
+            _round_each(columns["put_strike"] * quantity * multiplier, 2)
+        ),
+        "delta": columns["delta"],
+        "position_delta": columns["position_delta"],
+        "theta": columns["theta"],
+        "vega": columns["vega"],
+        "gamma": columns["gamma"],
+        "rho": columns["rho"],
+    }
+    totals = {
+        name: np.bincount(group_index, weights=values, minlength=len(groups))
+        for name, values in per_leg.items()
+    }
+    totals["multiplier"] = multiplier[np.cumsum(sizes) - sizes]
+    return totals
+
+
 def group_positions_and_compute_totals(
     positions_by_account: List[dict], beta_map: Dict[str, float]
 ) -> List[dict]:
-    """Group positions into explicit or safely inferred option strategies."""
-    accounts_data: List[dict] = []
+    """
+    Group positions into explicit or safely inferred option strategies.
 
-    for acct in positions_by_account:
-        acct_num = acct["account_number"]
-        nickname = acct["nickname"]
-        pos_list = acct["positions"]
-
-        account_beta_delta = 0.0
-        account_beta_delta_shares = 0.0
-        account_delta_shares = 0.0
-        account_theta_dollars_per_day = 0.0
-        account_vega_dollars_per_vol_point = 0.0
-        account_gamma_display = 0.0
-        account_position_delta = 0.0
-        account_theta = 0.0
-        account_vega = 0.0
-        account_gamma = 0.0
-        account_rho = 0.0
+    Every leg of every account is parsed once into columns; group totals and
+    account totals are grouped reductions over those columns.
+    """
+    account_groups = [
+        _position_strategy_groups([_as_leg(position) for position in acct["positions"]])
+        for acct in positions_by_account
+    ]
+    flat_groups = [group for groups in account_groups for group in groups]
+    totals = {
+        name: values.tolist()
+        for name, values in _group_leg_totals(
+            [plist for _, plist in flat_groups]
+        ).items()
+    }
+
+    groups_by_account: List[List[dict]] = []
+    group_account: List[int] = []
+    account_columns: Dict[str, List[float]] = defaultdict(list)
+    group_number = 0
+    for account_number, groups in enumerate(account_groups):
         groups_list = []
-        for (underlying, grouping_key), plist in _position_strategy_groups(pos_list):
+        for (underlying, grouping_key), plist in groups:
+            index = group_number
+            group_number += 1
             expiration_dates = sorted({
                 extract_expiration_date(position.get("expires-at", "") or "")
                 for position in plist
@@ -598,96 +802,27 @@ def group_positions_and_compute_totals(
                 key=extract_expiration_date,
                 default="",
             )
-            total_credit_unrounded = 0.0
-            total_open_value_dollars = 0.0
-            total_current_value_dollars = 0.0
-            total_signed_current_value_dollars = 0.0
-            total_unrealized_pl_dollars = 0.0
-            total_assignment_exposure_dollars = 0.0
-            current_price_unrounded = 0.0
-            delta_sum_unrounded = 0.0
-            position_delta_sum_unrounded = 0.0
-            theta_sum_unrounded = 0.0
-            vega_sum_unrounded = 0.0
-            gamma_sum_unrounded = 0.0
-            rho_sum_unrounded = 0.0
-
-            multiplier = 1
-            for idx, p in enumerate(plist):
-                qty_dir = p.get("quantity-direction")
-                try:
-                    avg_open = float(p.get("average-open-price", "0"))
-                except (ValueError, TypeError):
-                    avg_open = 0.0
-                try:
-                    qty = int(p.get("quantity", 1))
-                except (ValueError, TypeError):
-                    qty = 1
-                try:
-                    pl_val = float(p.get("approximate-p-l", 0))
-                except (ValueError, TypeError):
-                    pl_val = 0.0
-
-                if idx == 0:
-                    _, multiplier = _quantity_multiplier(p)
-
-                sign = -1 if qty_dir == "Long" else 1
-                total_credit_unrounded += sign * avg_open * qty
-                current_price_unrounded += pl_val
-                money_fields = _position_money_fields(p)
-                total_open_value_dollars += money_fields.get("open_value_dollars") or 0
-                total_current_value_dollars += money_fields.get("current_value_dollars") or 0
-                total_signed_current_value_dollars += money_fields.get("net_current_value_dollars") or 0
-                total_unrealized_pl_dollars += money_fields.get("unrealized_pl_dollars") or 0
-                total_assignment_exposure_dollars += _assignment_exposure(p) or 0
-
-                md = p.get("market_data", {})
-                try:
-                    delta_sum_unrounded += float(md.get("computed_delta", 0))
-                except (TypeError, ValueError):
-                    pass
-                position_delta = _optional_float(md.get("computed_position_delta"))
-                if position_delta is not None:
-                    position_delta_sum_unrounded += position_delta
-                theta = _optional_float(md.get("computed_position_theta"))
-                if theta is not None:
-                    theta_sum_unrounded += theta
-                vega = _optional_float(md.get("computed_position_vega"))
-                if vega is not None:
-                    vega_sum_unrounded += vega
-                gamma = _optional_float(md.get("computed_position_gamma"))
-                if gamma is not None:
-                    gamma_sum_unrounded += gamma
-                rho = _optional_float(md.get("computed_position_rho"))
-                if rho is not None:
-                    rho_sum_unrounded += rho
-
-            total_credit_received = round(total_credit_unrounded * multiplier, 2)
-            current_group_p_l = round(current_price_unrounded, 2)
+            total_credit_unrounded = totals["credit"][index]
+            total_unrealized_pl_dollars = totals["unrealized_pl"][index]
+            total_credit_received = round(
+                total_credit_unrounded * int(totals["multiplier"][index]), 2
+            )
+            current_group_p_l = round(totals["p_l"][index], 2)
             if total_credit_received != 0:
                 percent_credit_received = int((current_group_p_l / abs(total_credit_received)) * 100)
             else:
                 percent_credit_received = None
 
-            total_delta = round(delta_sum_unrounded, 2)
-            delta_shares = round(position_delta_sum_unrounded, 2)
-            theta_dollars_per_day = round(theta_sum_unrounded, 2)
-            vega_dollars_per_vol_point = round(vega_sum_unrounded, 2)
-            gamma_display = round(gamma_sum_unrounded, 4)
-            total_position_delta = _brokerage_greek_total(position_delta_sum_unrounded)
-            total_theta = _brokerage_greek_total(theta_sum_unrounded)
-            total_vega = _brokerage_greek_total(vega_sum_unrounded)
-            total_gamma = _brokerage_greek_total(gamma_sum_unrounded)
-            total_rho = _brokerage_greek_total(rho_sum_unrounded)
-            account_delta_shares += delta_shares
-            account_theta_dollars_per_day += theta_dollars_per_day
-            account_vega_dollars_per_vol_point += vega_dollars_per_vol_point
-            account_gamma_display += gamma_display
-            account_position_delta += total_position_delta
-            account_theta += total_theta
-            account_vega += total_vega
-            account_gamma += total_gamma
-            account_rho += total_rho
+            total_delta = round(totals["delta"][index], 2)
+            delta_shares = round(totals["position_delta"][index], 2)
+            theta_dollars_per_day = round(totals["theta"][index], 2)
+            vega_dollars_per_vol_point = round(totals["vega"][index], 2)
+            gamma_display = round(totals["gamma"][index], 4)
+            total_position_delta = _brokerage_greek_total(totals["position_delta"][index])
+            total_theta = _brokerage_greek_total(totals["theta"][index])
+            total_vega = _brokerage_greek_total(totals["vega"][index])
+            total_gamma = _brokerage_greek_total(totals["gamma"][index])
+            total_rho = _brokerage_greek_total(totals["rho"][index])
 
             beta_val = beta_map.get(underlying)
             beta_delta = None
@@ -695,8 +830,22 @@ def group_positions_and_compute_totals(
             if beta_val is not None:
                 beta_delta = round(beta_val * total_delta, 2)
                 beta_delta_shares = round(beta_val * delta_shares, 2)
-                account_beta_delta += beta_delta
-                account_beta_delta_shares += beta_delta_shares
+
+            group_account.append(account_number)
+            for name, value in (
+                ("beta_delta", beta_delta or 0.0),
+                ("beta_delta_shares", beta_delta_shares or 0.0),
+                ("delta_shares", delta_shares),
+                ("theta_dollars_per_day", theta_dollars_per_day),
+                ("vega_dollars_per_vol_point", vega_dollars_per_vol_point),
+                ("gamma_display", gamma_display),
+                ("total_position_delta", total_position_delta),
+                ("total_theta", total_theta),
+                ("total_vega", total_vega),
+                ("total_gamma", total_gamma),
+                ("total_rho", total_rho),
+            ):
+                account_columns[name].append(value)
 
             strategy = classify_strategy(plist)
             grouping_source = (
@@ -718,12 +867,12 @@ def group_positions_and_compute_totals(
                 "total_credit_points": round(total_credit_unrounded, 2),
                 "total_credit_dollars": total_credit_received,
                 "net_open_credit_or_debit_dollars": total_credit_received,
-                "open_value_dollars": round(total_open_value_dollars, 2),
-                "current_value_dollars": round(total_signed_current_value_dollars, 2),
-                "gross_current_value_dollars": round(total_current_value_dollars, 2),
+                "open_value_dollars": round(totals["open_value"][index], 2),
+                "current_value_dollars": round(totals["signed_current_value"][index], 2),
+                "gross_current_value_dollars": round(totals["current_value"][index], 2),
                 "unrealized_pl_dollars": round(total_unrealized_pl_dollars, 2),
                 "days_to_nearest_expiration": days_to_expiration(first_expires),
-                "assignment_exposure_dollars": round(total_assignment_exposure_dollars, 2),
+                "assignment_exposure_dollars": round(totals["assignment_exposure"][index], 2),
                 "max_loss_dollars": None,
                 "buying_power_effect_dollars": None,
                 "current_group_p_l": current_group_p_l,
@@ -747,25 +896,50 @@ def group_positions_and_compute_totals(
                 "beta_delta": beta_delta,
                 "beta_delta_raw": beta_delta,
                 "beta_delta_shares": beta_delta_shares,
-                "positions": plist,
+                "positions": [leg.payload for leg in plist],
             })
+        groups_by_account.append(groups_list)
+
+    account_index = np.array(group_account, dtype=np.intp)
+    account_totals = {
+        name: np.bincount(
+            account_index,
+            weights=np.array(account_columns.get(name, []), dtype=float),
+            minlength=len(positions_by_account),
+        ).astype(float).tolist()
+        for name in (
+            "beta_delta",
+            "beta_delta_shares",
+            "delta_shares",
+            "theta_dollars_per_day",
+            "vega_dollars_per_vol_point",
+            "gamma_display",
+            "total_position_delta",
+            "total_theta",
+            "total_vega",
+            "total_gamma",
+            "total_rho",
+        )
+    }
 
+    accounts_data: List[dict] = []
+    for index, (acct, groups_list) in enumerate(zip(positions_by_account, groups_by_account)):
         accounts_data.append({
-            "account_number": acct_num,
-            "nickname": nickname,
+            "account_number": acct["account_number"],
+            "nickname": acct["nickname"],
             "groups": groups_list,
-            "total_beta_delta": round(account_beta_delta, 2),
-            "total_beta_delta_raw": round(account_beta_delta, 2),
-            "total_beta_delta_shares": round(account_beta_delta_shares, 2),
-            "delta_shares": round(account_delta_shares, 2),
-            "theta_dollars_per_day": round(account_theta_dollars_per_day, 2),
-            "vega_dollars_per_vol_point": round(account_vega_dollars_per_vol_point, 2),
-            "gamma_display": round(account_gamma_display, 4),
-            "total_position_delta": int(round(account_position_delta)),
-            "total_theta": int(round(account_theta)),
-            "total_vega": int(round(account_vega)),
-            "total_gamma": int(round(account_gamma)),
-            "total_rho": int(round(account_rho)),
+            "total_beta_delta": round(account_totals["beta_delta"][index], 2),
+            "total_beta_delta_raw": round(account_totals["beta_delta"][index], 2),
+            "total_beta_delta_shares": round(account_totals["beta_delta_shares"][index], 2),
+            "delta_shares": round(account_totals["delta_shares"][index], 2),
+            "theta_dollars_per_day": round(account_totals["theta_dollars_per_day"][index], 2),
+            "vega_dollars_per_vol_point": round(account_totals["vega_dollars_per_vol_point"][index], 2),
+            "gamma_display": round(account_totals["gamma_display"][index], 4),
+            "total_position_delta": int(round(account_totals["total_position_delta"][index])),
+            "total_theta": int(round(account_totals["total_theta"][index])),
+            "total_vega": int(round(account_totals["total_vega"][index])),
+            "total_gamma": int(round(account_totals["total_gamma"][index])),
+            "total_rho": int(round(account_totals["total_rho"][index])),
         })
 
     return accounts_data
@@ -777,39 +951,65 @@ def _root_symbol(sym: str) -> str:
     return sym
 
 
-def apply_volatility(token: str, accounts_data: List[dict]) -> None:
-    """Augment groups with implied volatility information."""
+def _volatility_roots(symbols) -> List[str]:
+    return sorted({_root_symbol(symbol) for symbol in symbols if symbol})
 
-    for acct in accounts_data:
-        acct_num = acct["account_number"]
-        groups_list = acct["groups"]
 
-        unique_roots = sorted({_root_symbol(g["underlying_symbol"]) for g in groups_list if g["underlying_symbol"]})
-        vol_rank_map: Dict[str, float] = {}
-        vol_change_map: Dict[str, float] = {}
-        if unique_roots:
-            try:
-                vol_data = tastytrade.fetch_volatility_data(token, unique_roots)
-                for raw_item in vol_data:
-                    item = _as_tasty_dict(raw_item)
-                    sym = item.get("symbol")
-                    iv = item.get("implied-volatility-index-rank")
-                    change = item.get("implied-volatility-index-5-day-change")
-                    if sym is not None:
-                        if iv is not None:
-                            try:
-                                vol_rank_map[sym] = round(float(iv) * 100, 1)
-                            except (ValueError, TypeError):
-                                vol_rank_map[sym] = None
-                        if change is not None:
-                            try:
-                                vol_change_map[sym] = round(float(change) * 100, 2)
-                            except (ValueError, TypeError):
-                                vol_change_map[sym] = None
-            except Exception as e:
-                logging.error(f"Failed to fetch volatility data: {e}")
-
-        for g in groups_list:
+def fetch_volatility_maps(
+    token: str, roots: List[str]
+) -> Tuple[Dict[str, Optional[float]], Dict[str, Optional[float]]]:
+    """Fetch IV rank and 5-day IV change percentages for every root in one request."""
+    vol_rank_map: Dict[str, Optional[float]] = {}
+    vol_change_map: Dict[str, Optional[float]] = {}
+    if not roots:
+        return vol_rank_map, vol_change_map
+    try:
+        vol_data = fetch_volatility_data_cached(token, roots)
+        for raw_item in vol_data:
+            item = _as_tasty_dict(raw_item)
+            sym = item.get("symbol")
+            iv = item.get("implied-volatility-index-rank")
+            change = item.get("implied-volatility-index-5-day-change")
+            if sym is not None:
+                if iv is not None:
+                    try:
+                        vol_rank_map[sym] = round(float(iv) * 100, 1)
+                    except (ValueError, TypeError):
+                        vol_rank_map[sym] = None
+                if change is not None:
+                    try:
+                        vol_change_map[sym] = round(float(change) * 100, 2)
+                    except (ValueError, TypeError):
+                        vol_change_map[sym] = None
+    except Exception as e:
+        logging.error(f"Failed to fetch volatility data: {e}")
+    return vol_rank_map, vol_change_map
+
+
+def apply_volatility(
+    token: str,
+    accounts_data: List[dict],
+    volatility_maps: Optional[Tuple[Dict[str, Optional[float]], Dict[str, Optional[float]]]] = None,
+) -> None:
+    """
+    Augment groups with implied volatility information.
+
+    Roots from every account are deduplicated into a single request unless
+    already-fetched maps are supplied.
+    """
+    if volatility_maps is None:
+        volatility_maps = fetch_volatility_maps(
+            token,
+            _volatility_roots(
+                g["underlying_symbol"]
+                for acct in accounts_data
+                for g in acct["groups"]
+            ),
+        )
+    vol_rank_map, vol_change_map = volatility_maps
+
+    for acct in accounts_data:
+        for g in acct["groups"]:
             root = _root_symbol(g["underlying_symbol"])
             g["iv_rank"] = vol_rank_map.get(root)
             g["iv_5d_change"] = vol_change_map.get(root)
@@ -886,38 +1086,62 @@ def _underlying_concentrations(groups: List[dict]) -> List[dict]:
     return sorted(results, key=lambda item: abs(item["beta_delta_shares"]), reverse=True)
 
 
-def apply_balance(token: str, accounts_data: List[dict]) -> None:
-    """Attach normalized balance, utilization, and Greek risk context to each account."""
+def fetch_balance_context(token: str, account_number: str) -> dict:
+    """Fetch and normalize one account balance; failures become an unavailable status."""
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    warnings: list[str] = []
+    values = {
+        "net_liquidating_value_dollars": None,
+        "margin_equity_dollars": None,
+        "used_derivative_buying_power_dollars": None,
+        "derivative_buying_power_dollars": None,
+        "equity_buying_power_dollars": None,
+    }
+
+    try:
+        bal = _as_tasty_dict(tastytrade.fetch_account_balance(token, account_number))
+        values["margin_equity_dollars"] = _optional_float(bal.get("margin-equity"))
+        values["net_liquidating_value_dollars"] = _optional_float(bal.get("net-liquidating-value")) or values["margin_equity_dollars"]
+        values["used_derivative_buying_power_dollars"] = _optional_float(bal.get("used-derivative-buying-power"))
+        values["derivative_buying_power_dollars"] = _optional_float(bal.get("derivative-buying-power"))
+        values["equity_buying_power_dollars"] = _optional_float(bal.get("equity-buying-power"))
+        if bal.get("net-liquidating-value") is None and values["margin_equity_dollars"] is not None:
+            warnings.append("Net liquidating value unavailable; margin equity used as fallback.")
+        missing = [label for key, label in (("net_liquidating_value_dollars", "net liquidating value"), ("used_derivative_buying_power_dollars", "used derivative buying power"), ("derivative_buying_power_dollars", "derivative buying power")) if values[key] is None]
+        if missing:
+            warnings.append("Missing " + ", ".join(missing) + ".")
+        status = "partial" if missing or warnings else "ok"
+    except Exception as e:
+        logging.error(f"Failed to fetch balance for account {account_number}: {e}")
+        warnings.append("Brokerage balance could not be fetched.")
+        status = "unavailable"
+
+    return {
+        "values": values,
+        "warnings": warnings,
+        "status": status,
+        "fetched_at": fetched_at,
+    }
+
+
+def apply_balance(
+    token: str,
+    accounts_data: List[dict],
+    balances: Optional[Dict[str, dict]] = None,
+) -> None:
+    """
+    Attach normalized balance, utilization, and Greek risk context to each account.
+
+    ``balances`` maps account numbers to pre-fetched fetch_balance_context results.
+    """
 
     for acct in accounts_data:
         acct_num = acct["account_number"]
-        fetched_at = datetime.now(timezone.utc).isoformat()
-        warnings: list[str] = []
-        values = {
-            "net_liquidating_value_dollars": None,
-            "margin_equity_dollars": None,
-            "used_derivative_buying_power_dollars": None,
-            "derivative_buying_power_dollars": None,
-            "equity_buying_power_dollars": None,
-        }
-
-        try:
-            bal = _as_tasty_dict(tastytrade.fetch_account_balance(token, acct_num))
-            values["margin_equity_dollars"] = _optional_float(bal.get("margin-equity"))
-            values["net_liquidating_value_dollars"] = _optional_float(bal.get("net-liquidating-value")) or values["margin_equity_dollars"]
-            values["used_derivative_buying_power_dollars"] = _optional_float(bal.get("used-derivative-buying-power"))
-            values["derivative_buying_power_dollars"] = _optional_float(bal.get("derivative-buying-power"))
-            values["equity_buying_power_dollars"] = _optional_float(bal.get("equity-buying-power"))
-            if bal.get("net-liquidating-value") is None and values["margin_equity_dollars"] is not None:
-                warnings.append("Net liquidating value unavailable; margin equity used as fallback.")
-            missing = [label for key, label in (("net_liquidating_value_dollars", "net liquidating value"), ("used_derivative_buying_power_dollars", "used derivative buying power"), ("derivative_buying_power_dollars", "derivative buying power")) if values[key] is None]
-            if missing:
-                warnings.append("Missing " + ", ".join(missing) + ".")
-            status = "partial" if missing or warnings else "ok"
-        except Exception as e:
-            logging.error(f"Failed to fetch balance for account {acct_num}: {e}")
-            warnings.append("Brokerage balance could not be fetched.")
-            status = "unavailable"
+        if balances is not None and acct_num in balances:
+            balance = balances[acct_num]
+        else:
+            balance = fetch_balance_context(token, acct_num)
+        values = balance["values"]
 
         net_liq = values["net_liquidating_value_dollars"]
         used = values["used_derivative_buying_power_dollars"]
@@ -935,12 +1159,74 @@ def apply_balance(token: str, accounts_data: List[dict]) -> None:
             "vega_plus_one_point_percent_of_net_liq": round(vega / net_liq * 100, 4) if vega is not None and net_liq else None,
             "underlying_concentrations": concentrations,
             "largest_underlying_concentration": concentrations[0] if concentrations else None,
-            "balance_status": status,
-            "balance_warnings": warnings,
-            "balance_fetched_at": fetched_at,
+            "balance_status": balance["status"],
+            "balance_warnings": balance["warnings"],
+            "balance_fetched_at": balance["fetched_at"],
         })
 
 
+async def load_positions_data_async(token: str, accounts: List[dict]) -> List[dict]:
+    """
+    Run the full positions pipeline for the given accounts.
+
+    Broker calls run on the Tastytrade async workers and are awaited together
+    with asyncio.gather: positions for every account first, then market data,
+    the single deduplicated volatility request and balances side by side.
+    Failures surface in account order.
+    """
+    fetched = await asyncio.gather(
+        *(
+            tastytrade.run_async(fetch_account_positions, token, acct.get("account_number"))
+            for acct in accounts
+        ),
+        return_exceptions=True,
+    )
+    for result in fetched:
+        if isinstance(result, BaseException):
+            raise result
+
+    (
+        positions_by_account,
+        equity_option_syms,
+        future_option_syms,
+        equity_underlyings,
+        future_underlyings,
+    ) = _index_positions_and_symbols(accounts, fetched)
+
+    account_numbers = [acct["account_number"] for acct in positions_by_account]
+    (market_map, beta_map), volatility_maps, balances = await asyncio.gather(
+        tastytrade.run_async(
+            fetch_market_and_beta_data,
+            token,
+            equity_option_syms,
+            future_option_syms,
+            equity_underlyings,
+            future_underlyings,
+        ),
+        tastytrade.run_async(
+            fetch_volatility_maps,
+            token,
+            _volatility_roots(
+                position.get("underlying-symbol", "") or ""
+                for acct in positions_by_account
+                for position in acct["positions"]
+            ),
+        ),
+        asyncio.gather(
+            *(
+                tastytrade.run_async(fetch_balance_context, token, acct_num)
+                for acct_num in account_numbers
+            )
+        ),
+    )
+
+    augment_positions_with_market_data(positions_by_account, market_map, beta_map)
+    accounts_data = group_positions_and_compute_totals(positions_by_account, beta_map)
+    apply_volatility(token, accounts_data, volatility_maps)
+    apply_balance(token, accounts_data, dict(zip(account_numbers, balances)))
+    return accounts_data
+
+
 def build_market_data_summary(items: List[Any], requested_symbols: List[str]) -> dict:
     """Return a compact, numeric market data payload suitable for LLM context."""
     normalized = []
@@ -972,6 +1258,7 @@ def build_market_data_summary(items: List[Any], requested_symbols: List[str]) ->
                 "implied-volatility-index",
                 "volatility",
             ),
+            "as_of": item.get("as-of"),
         }))
 
     return {
@@ -1000,6 +1287,7 @@ def build_volatility_data_summary(items: List[Any], requested_symbols: List[str]
             "symbol": symbol,
             "iv_rank_percent": round(iv_rank * 100, 1) if iv_rank is not None else None,
             "iv_5d_change_percent": round(iv_change * 100, 2) if iv_change is not None else None,
+            "as_of": item.get("as-of"),
         }))
 
     return {
@@ -1011,6 +1299,77 @@ def build_volatility_data_summary(items: List[Any], requested_symbols: List[str]
     }
 
 
+def _llm_leg(position: dict, underlying: str) -> dict:
+    """Fields of one leg shared by the group and per-underlying summaries."""
+    market_data = position.get("market_data", {})
+    expires_at = position.get("expires-at", "")
+    return {
+        "symbol": position.get("symbol") or position.get("instrument-symbol"),
+        "instrument_type": position.get("instrument-type"),
+        "underlying_symbol": position.get("underlying-symbol") or underlying,
+        "expiration_date": extract_expiration_date(expires_at),
+        "days_to_expiration": days_to_expiration(expires_at),
+        "quantity": _optional_int(position.get("quantity")),
+        "quantity_direction": position.get("quantity-direction"),
+        "multiplier": _quantity_multiplier(position)[1],
+        "average_open_price": _numeric_field(position, "average-open-price"),
+        "mark": _numeric_field(market_data, "mark"),
+        "money_fields": _position_money_fields(position),
+        "approximate_pl": _numeric_field(position, "approximate-p-l"),
+        "strike": _numeric_field(position, "strike"),
+        "option_type": position.get("option-type"),
+        "greeks": {
+            "delta_shares": _numeric_field(market_data, "computed_position_delta", "delta"),
+            "theta_dollars_per_day": _numeric_field(market_data, "computed_position_theta", "theta"),
+            "vega_dollars_per_vol_point": _numeric_field(market_data, "computed_position_vega", "vega"),
+            "gamma_display": _numeric_field(market_data, "computed_position_gamma", "gamma"),
+            "delta": _numeric_field(market_data, "computed_position_delta", "delta"),
+            "theta": _numeric_field(market_data, "computed_position_theta", "theta"),
+            "vega": _numeric_field(market_data, "computed_position_vega", "vega"),
+            "gamma": _numeric_field(market_data, "computed_position_gamma", "gamma"),
+            "rho": _numeric_field(market_data, "computed_position_rho", "rho"),
+        },
+        "assignment_exposure_dollars": _assignment_exposure(position),
+    }
+
+
+@dataclass(slots=True)
+class _UnderlyingRollup:
+    """Running totals for one underlying, filled while walking the account's groups."""
+
+    positions: List[dict] = field(default_factory=list)
+    legs: List[dict] = field(default_factory=list)
+    expiration_dates: Set[str] = field(default_factory=set)
+    nearest_dte: Optional[int] = None
+    open_value: float = 0
+    current_value: float = 0
+    unrealized_pl: float = 0
+    assignment_exposure: float = 0
+    theta: float = 0
+    vega: float = 0
+    delta_shares: float = 0
+    gamma: float = 0
+
+    def add(self, position: dict, leg: dict) -> None:
+        self.positions.append(position)
+        self.legs.append(leg)
+        if position.get("expires-at"):
+            self.expiration_dates.add(leg["expiration_date"])
+        dte = leg["days_to_expiration"]
+        if dte is not None and (self.nearest_dte is None or dte < self.nearest_dte):
+            self.nearest_dte = dte
+        money_fields = leg["money_fields"]
+        self.open_value += money_fields["net_open_credit_or_debit_dollars"] or 0
+        self.current_value += money_fields["net_current_value_dollars"] or 0
+        self.unrealized_pl += money_fields["unrealized_pl_dollars"] or 0
+        self.assignment_exposure += leg["assignment_exposure_dollars"] or 0
+        market_data = position.get("market_data", {})
+        self.theta += _numeric_field(market_data, "computed_position_theta") or 0
+        self.vega += _numeric_field(market_data, "computed_position_vega") or 0
+        self.delta_shares += _numeric_field(market_data, "computed_position_delta") or 0
+        self.gamma += _numeric_field(market_data, "computed_position_gamma") or 0
+
+
 def build_llm_positions_summary(accounts_data: List[dict]) -> dict:
     """Strip broker-specific nesting from grouped positions for LLM consumers."""
     accounts = []
@@ -1074,43 +1433,35 @@ def build_llm_positions_summary(accounts_data: List[dict]) -> dict:
         portfolio["rho"] += account.get("total_rho") or 0
 
         groups = []
-        positions_by_underlying: dict[str, list[dict]] = defaultdict(list)
+        rollups: Dict[str, _UnderlyingRollup] = {}
         for group in account.get("groups", []):
             portfolio["group_count"] += 1
             positions = []
             for position in group.get("positions", []):
                 portfolio["position_count"] += 1
                 underlying = position.get("underlying-symbol") or group.get("underlying_symbol", "")
+                leg = _llm_leg(position, underlying)
                 if underlying:
-                    positions_by_underlying[underlying].append(position)
-                market_data = position.get("market_data", {})
-                money_fields = _position_money_fields(position)
-                assignment_exposure_dollars = _assignment_exposure(position)
+                    if underlying not in rollups:
+                        rollups[underlying] = _UnderlyingRollup()
+                    rollups[underlying].add(position, leg)
                 positions.append(_compact_dict({
-                    "symbol": position.get("symbol") or position.get("instrument-symbol"),
-                    "instrument_type": position.get("instrument-type"),
-                    "underlying_symbol": position.get("underlying-symbol") or underlying,
-                    "expiration_date": extract_expiration_date(position.get("expires-at", "")),
-                    "days_to_expiration": days_to_expiration(position.get("expires-at", "")),
-                    "quantity": _optional_int(position.get("quantity")),
-                    "quantity_direction": position.get("quantity-direction"),
-                    "multiplier": _quantity_multiplier(position)[1],
-                    "average_open_price": _numeric_field(position, "average-open-price"),
-                    "mark": _numeric_field(market_data, "mark"),
-                    **money_fields,
-                    "approximate_pl": _numeric_field(position, "approximate-p-l"),
-                    "strike": _numeric_field(position, "strike"),
-                    "option_type": position.get("option-type"),
-                    "delta_shares": _numeric_field(market_data, "computed_position_delta", "delta"),
-                    "theta_dollars_per_day": _numeric_field(market_data, "computed_position_theta", "theta"),
-                    "vega_dollars_per_vol_point": _numeric_field(market_data, "computed_position_vega", "vega"),
-                    "gamma_display": _numeric_field(market_data, "computed_position_gamma", "gamma"),
-                    "delta": _numeric_field(market_data, "computed_position_delta", "delta"),
-                    "theta": _numeric_field(market_data, "computed_position_theta", "theta"),
-                    "vega": _numeric_field(market_data, "computed_position_vega", "vega"),
-                    "gamma": _numeric_field(market_data, "computed_position_gamma", "gamma"),
-                    "rho": _numeric_field(market_data, "computed_position_rho", "rho"),
-                    "assignment_exposure_dollars": assignment_exposure_dollars,
+                    "symbol": leg["symbol"],
+                    "instrument_type": leg["instrument_type"],
+                    "underlying_symbol": leg["underlying_symbol"],
+                    "expiration_date": leg["expiration_date"],
+                    "days_to_expiration": leg["days_to_expiration"],
+                    "quantity": leg["quantity"],
+                    "quantity_direction": leg["quantity_direction"],
+                    "multiplier": leg["multiplier"],
+                    "average_open_price": leg["average_open_price"],
+                    "mark": leg["mark"],
+                    **leg["money_fields"],
+                    "approximate_pl": leg["approximate_pl"],
+                    "strike": leg["strike"],
+                    "option_type": leg["option_type"],
+                    **leg["greeks"],
+                    "assignment_exposure_dollars": leg["assignment_exposure_dollars"],
                     "max_loss_dollars": _numeric_field(position, "max-loss", "max_loss"),
                     "buying_power_effect_dollars": _numeric_field(
                         position,
@@ -1174,84 +1525,45 @@ def build_llm_positions_summary(accounts_data: List[dict]) -> dict:
 
         underlying_strategies = []
         strategy_groups = []
-        for underlying_symbol, underlying_positions in sorted(positions_by_underlying.items()):
+        for underlying_symbol, rollup in sorted(rollups.items()):
+            underlying_positions = rollup.positions
             strategy = classify_strategy(underlying_positions)
-            expiration_dates = sorted({
-                extract_expiration_date(position.get("expires-at", ""))
-                for position in underlying_positions
-                if position.get("expires-at")
-            })
-            nearest_dte_values = [
-                dte
-                for dte in (days_to_expiration(position.get("expires-at", "")) for position in underlying_positions)
-                if dte is not None
-            ]
-            total_open = round(sum(
-                _position_money_fields(position).get("net_open_credit_or_debit_dollars") or 0
-                for position in underlying_positions
-            ), 2)
-            total_current = round(sum(
-                _position_money_fields(position).get("net_current_value_dollars") or 0
-                for position in underlying_positions
-            ), 2)
-            total_unrealized = round(sum(
-                _position_money_fields(position).get("unrealized_pl_dollars") or 0
-                for position in underlying_positions
-            ), 2)
-            assignment_exposure = round(sum(
-                _assignment_exposure(position) or 0 for position in underlying_positions
-            ), 2)
-            theta = int(round(sum(
-                _numeric_field(position.get("market_data", {}), "computed_position_theta") or 0
-                for position in underlying_positions
-            )))
-            vega = int(round(sum(
-                _numeric_field(position.get("market_data", {}), "computed_position_vega") or 0
-                for position in underlying_positions
-            )))
-            delta_shares = int(round(sum(
-                _numeric_field(position.get("market_data", {}), "computed_position_delta") or 0
-                for position in underlying_positions
-            )))
-            gamma = int(round(sum(
-                _numeric_field(position.get("market_data", {}), "computed_position_gamma") or 0
-                for position in underlying_positions
-            )))
-            beta = _numeric_field(underlying_positions[0], "beta") if underlying_positions else None
+            expiration_dates = sorted(rollup.expiration_dates)
+            total_open = round(rollup.open_value, 2)
+            total_current = round(rollup.current_value, 2)
+            total_unrealized = round(rollup.unrealized_pl, 2)
+            assignment_exposure = round(rollup.assignment_exposure, 2)
+            theta = int(round(rollup.theta))
+            vega = int(round(rollup.vega))
+            delta_shares = int(round(rollup.delta_shares))
+            gamma = int(round(rollup.gamma))
+            beta = _numeric_field(underlying_positions[0], "beta")
             beta_delta_shares = round(delta_shares * beta, 2) if beta is not None else None
             percent_credit_captured = (
                 round((total_unrealized / total_open) * 100, 1) if total_open > 0 else None
             )
-            nearest_dte = min(nearest_dte_values) if nearest_dte_values else None
-            legs = []
-            for position in underlying_positions:
-                market_data = position.get("market_data", {})
-                legs.append(_compact_dict({
-                    "symbol": position.get("symbol") or position.get("instrument-symbol"),
-                    "instrument_type": position.get("instrument-type"),
-                    "underlying_symbol": position.get("underlying-symbol") or underlying_symbol,
-                    "expiration_date": extract_expiration_date(position.get("expires-at", "")),
-                    "days_to_expiration": days_to_expiration(position.get("expires-at", "")),
-                    "quantity": _optional_int(position.get("quantity")),
-                    "quantity_direction": position.get("quantity-direction"),
-                    "multiplier": _quantity_multiplier(position)[1],
-                    "strike": _numeric_field(position, "strike"),
-                    "option_type": position.get("option-type"),
-                    "average_open_price": _numeric_field(position, "average-open-price"),
-                    "mark": _numeric_field(market_data, "mark"),
-                    **_position_money_fields(position),
-                    "approximate_pl": _numeric_field(position, "approximate-p-l"),
-                    "delta_shares": _numeric_field(market_data, "computed_position_delta", "delta"),
-                    "theta_dollars_per_day": _numeric_field(market_data, "computed_position_theta", "theta"),
-                    "vega_dollars_per_vol_point": _numeric_field(market_data, "computed_position_vega", "vega"),
-                    "gamma_display": _numeric_field(market_data, "computed_position_gamma", "gamma"),
-                    "delta": _numeric_field(market_data, "computed_position_delta", "delta"),
-                    "theta": _numeric_field(market_data, "computed_position_theta", "theta"),
-                    "vega": _numeric_field(market_data, "computed_position_vega", "vega"),
-                    "gamma": _numeric_field(market_data, "computed_position_gamma", "gamma"),
-                    "rho": _numeric_field(market_data, "computed_position_rho", "rho"),
-                    "assignment_exposure_dollars": _assignment_exposure(position),
-                }))
+            nearest_dte = rollup.nearest_dte
+            legs = [
+                _compact_dict({
+                    "symbol": leg["symbol"],
+                    "instrument_type": leg["instrument_type"],
+                    "underlying_symbol": leg["underlying_symbol"],
+                    "expiration_date": leg["expiration_date"],
+                    "days_to_expiration": leg["days_to_expiration"],
+                    "quantity": leg["quantity"],
+                    "quantity_direction": leg["quantity_direction"],
+                    "multiplier": leg["multiplier"],
+                    "strike": leg["strike"],
+                    "option_type": leg["option_type"],
+                    "average_open_price": leg["average_open_price"],
+                    "mark": leg["mark"],
+                    **leg["money_fields"],
+                    "approximate_pl": leg["approximate_pl"],
+                    **leg["greeks"],
+                    "assignment_exposure_dollars": leg["assignment_exposure_dollars"],
+                })
+                for leg in rollup.legs
+            ]
             strategy_group = _compact_dict({
                 "underlying_symbol": underlying_symbol,
                 "strategy": strategy,
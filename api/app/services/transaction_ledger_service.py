@@ -0,0 +1,236 @@
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app import tastytrade
+from app.models import BrokerTransactionORM, BrokerTransactionSyncORM
+from app.tastytrade_schema import TastyTransaction
+
+
+TRANSACTION_PAGE_SIZE = 2000
+# Safety cap per synced range; a range that needs more continues next sync.
+MAX_TRANSACTION_PAGES = 100
+
+
+@dataclass(frozen=True)
+class TransactionSyncResult:
+    added: int
+    truncated: bool = False
+
+
+def sync_transactions(
+    db: Session,
+    token: str,
+    account_number: str,
+    start_date: date,
+    end_date: date,
+    *,
+    synced_at: datetime | None = None,
+) -> TransactionSyncResult:
+    """
+    Mirror broker transactions for [start_date, end_date] into the ledger.
+
+    Only dates outside the account's synced window are requested, plus the
+    high-water date itself, which may have gained transactions since. A
+    failed sync is retried from the same mark. A range cut short by
+    MAX_TRANSACTION_PAGES still moves the window over the dates it stored
+    completely, so the next sync continues where this one stopped.
+    """
+    synced_at = synced_at or datetime.now(timezone.utc)
+    state = db.get(BrokerTransactionSyncORM, account_number)
+    # (range start, range end, window it extends to once fully paged)
+    if state is None:
+        ranges = [(start_date, end_date, (start_date, end_date))]
+        synced = None
+    else:
+        ranges = []
+        synced = (state.synced_from, state.synced_through)
+        if start_date < state.synced_from:
+            ranges.append((start_date, state.synced_from, (start_date, None)))
+        if end_date >= state.synced_through:
+            ranges.append((state.synced_through, end_date, (None, end_date)))
+
+    added = 0
+    truncated = False
+    for range_start, range_end, extends_to in ranges:
+        # A range before the window must stay contiguous with it when cut short.
+        newest_first = extends_to[1] is None
+        range_added, complete, reached = _fetch_range(
+            db, token, account_number, range_start, range_end,
+            newest_first=newest_first,
+        )
+        added += range_added
+        if not complete:
+            truncated = True
+            if reached is None:
+                continue
+            # The reached date may be incomplete. The window's last date is
+            # always requested again, its first date is not.
+            if newest_first:
+                extends_to = (min(reached + timedelta(days=1), synced[0]), None)
+            else:
+                extends_to = (extends_to[0], reached)
+        synced = tuple(
+            new if new is not None else old
+            for new, old in zip(extends_to, synced or extends_to)
+        )
+    if synced is None:
+        return TransactionSyncResult(added=added, truncated=truncated)
+    synced_from, synced_through = synced
+
+    db.execute(
+        insert(BrokerTransactionSyncORM)
+        .values(
+            account_number=account_number,
+            synced_from=synced_from,
+            synced_through=synced_through,
+            synced_at=synced_at,
+        )
+        .on_conflict_do_update(
+            index_elements=[BrokerTransactionSyncORM.account_number],
+            set_={
+                "synced_from": synced_from,
+                "synced_through": synced_through,
+                "synced_at": synced_at,
+            },
+        )
+    )
+    db.commit()
+    return TransactionSyncResult(added=added, truncated=truncated)
+
+
+def has_synced(db: Session, account_number: str) -> bool:
+    return db.get(BrokerTransactionSyncORM, account_number) is not None
+
+
+def list_ledger_transactions(
+    db: Session,
+    account_number: str,
+    start_date: date,
+    end_date: date,
+) -> list[TastyTransaction]:
+    """Return stored transactions in broker order (oldest first)."""
+    payloads = db.scalars(
+        select(BrokerTransactionORM.payload)
+        .where(
+            BrokerTransactionORM.account_number == account_number,
+            BrokerTransactionORM.transaction_date >= start_date,
+            BrokerTransactionORM.transaction_date <= end_date,
+        )
+        .order_by(BrokerTransactionORM.executed_at, BrokerTransactionORM.id)
+    ).all()
+    return [TastyTransaction.model_validate_json(payload) for payload in payloads]
+
+
+def _fetch_range(
+    db: Session,
+    token: str,
+    account_number: str,
+    start_date: date,
+    end_date: date,
+    *,
+    newest_first: bool = False,
+) -> tuple[int, bool, date | None]:
+    """
+    Store every page of the range; returns (new rows, fully paged, reached).
+
+    Pages are sorted oldest first, so a range cut short by the page cap is
+    stored from start_date up to the reached date. With newest_first, pages
+    past the first are requested from the last one back when the broker
+    reports a page count, and the range is stored from the reached date to
+    end_date instead. reached is None when nothing usable was stored.
+    """
+    added = 0
+    stored_dates: list[date] = []
+
+    def store_page(page_offset: int):
+        nonlocal added
+        page = tastytrade.fetch_transactions(
+            token,
+            account_number,
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            page_offset=page_offset,
+            per_page=TRANSACTION_PAGE_SIZE,
+        )
+        rows = [
+            row
+            for row in (_row(account_number, item) for item in page.items)
+            if row is not None
+        ]
+        if rows:
+            result = db.execute(
+                insert(BrokerTransactionORM)
+                .values(rows)
+                .on_conflict_do_nothing()
+            )
+            added += max(result.rowcount, 0)
+            db.commit()
+            stored_dates.extend(row["transaction_date"] for row in rows)
+        return page
+
+    page = store_page(0)
+    if not page.has_more:
+        return added, True, None
+
+    total_pages = page.total_pages
+    if newest_first and total_pages is not None and total_pages > MAX_TRANSACTION_PAGES:
+        # The first page is not contiguous with the pages read from the end.
+        stored_dates.clear()
+        for page_offset in range(total_pages - 1, total_pages - MAX_TRANSACTION_PAGES, -1):
+            store_page(page_offset)
+        return added, False, min(stored_dates, default=None)
+
+    for page_offset in range(1, MAX_TRANSACTION_PAGES):
+        if not store_page(page_offset).has_more:
+            return added, True, None
+    if newest_first:
+        return added, False, None
+    return added, False, max(stored_dates, default=None)
+
+
+def _row(account_number: str, transaction: TastyTransaction) -> dict | None:
+    executed_at = _occurred_at(transaction)
+    if executed_at is None:
+        logging.warning(
+            "Skipping transaction %s for account %s: no usable timestamp.",
+            transaction.id,
+            account_number,
+        )
+        return None
+    return {
+        "account_number": account_number,
+        "transaction_id": str(transaction.id),
+        "transaction_date": _transaction_date(transaction, executed_at),
+        "executed_at": executed_at.replace(tzinfo=None),
+        "payload": transaction.model_dump_json(by_alias=True),
+    }
+
+
+def _transaction_date(transaction: TastyTransaction, executed_at: datetime) -> date:
+    if transaction.transaction_date:
+        try:
+            return date.fromisoformat(str(transaction.transaction_date)[:10])
+        except ValueError:
+            pass
+    return executed_at.date()
+
+
+def _occurred_at(transaction: TastyTransaction) -> datetime | None:
+    value = (
+        transaction.executed_at
+        or transaction.created_at
+        or transaction.transaction_date
+    )
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    parsed = parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
@@ -15,6 +15,47 @@ class Settings:
     tastytrade_url: str = os.getenv("TASTYTRADE_URL", "https://api.tastyworks.com")
     tastytrade_timeout_seconds: float = float(os.getenv("TASTYTRADE_TIMEOUT_SECONDS", "20"))
     tastytrade_user_agent: str = "trade-journal/0.1"
+    tastytrade_pool_size: int = int(os.getenv("TASTYTRADE_POOL_SIZE", "10"))
+    tastytrade_keep_alive: bool = _env_bool("TASTYTRADE_KEEP_ALIVE", True)
+    tastytrade_rate_limit_per_second: float = float(
+        os.getenv("TASTYTRADE_RATE_LIMIT_PER_SECOND", "10")
+    )
+    tastytrade_rate_limit_burst: int = int(os.getenv("TASTYTRADE_RATE_LIMIT_BURST", "20"))
+    tastytrade_max_retries: int = int(os.getenv("TASTYTRADE_MAX_RETRIES", "3"))
+    tastytrade_retry_backoff_seconds: float = float(
+        os.getenv("TASTYTRADE_RETRY_BACKOFF_SECONDS", "0.5")
+    )
+    tastytrade_token_refresh_lead_seconds: float = float(
+        os.getenv("TASTYTRADE_TOKEN_REFRESH_LEAD_SECONDS", "60")
+    )
+    positions_snapshot_ttl_seconds: float = float(
+        os.getenv("POSITIONS_SNAPSHOT_TTL_SECONDS", "15")
+    )
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    cache_max_bytes: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    cache_sweep_interval_seconds: float = float(
+        os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "60")
+    )
+    chart_bar_retention_seconds: int = int(os.getenv("CHART_BAR_RETENTION_SECONDS", "86400"))
+    activity_inbox_fetch_workers: int = int(os.getenv("ACTIVITY_INBOX_FETCH_WORKERS", "8"))
+    activity_inbox_prefetch_pages: bool = _env_bool("ACTIVITY_INBOX_PREFETCH_PAGES", True)
+    research_context_fetch_workers: int = int(os.getenv("RESEARCH_CONTEXT_FETCH_WORKERS", "6"))
+    research_context_batch_size: int = int(os.getenv("RESEARCH_CONTEXT_BATCH_SIZE", "100"))
+    research_context_batch_max_chars: int = int(
+        os.getenv("RESEARCH_CONTEXT_BATCH_MAX_CHARS", "1500")
+    )
+    research_context_batch_slow_seconds: float = float(
+        os.getenv("RESEARCH_CONTEXT_BATCH_SLOW_SECONDS", "5")
+    )
+    activity_chart_fetch_workers: int = int(os.getenv("ACTIVITY_CHART_FETCH_WORKERS", "4"))
+    activity_chart_fetch_timeout_seconds: float = float(
+        os.getenv("ACTIVITY_CHART_FETCH_TIMEOUT_SECONDS", "10")
+    )
+    activity_chart_fetch_deadline_seconds: float = float(
+        os.getenv("ACTIVITY_CHART_FETCH_DEADLINE_SECONDS", "20")
+    )
+    quote_cache_ttl_seconds: int = int(os.getenv("QUOTE_CACHE_TTL_SECONDS", "5"))
+    volatility_cache_ttl_seconds: int = int(os.getenv("VOLATILITY_CACHE_TTL_SECONDS", "300"))
     live_trading_enabled: bool = _env_bool("LIVE_TRADING_ENABLED", False)
     brokerage_watchlist_writes_enabled: bool = _env_bool("BROKERAGE_WATCHLIST_WRITES_ENABLED", False)
     cors_origins: tuple[str, ...] = tuple(
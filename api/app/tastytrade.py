@@ -1,12 +1,23 @@
+import asyncio
+import functools
+import logging
 import os
+import random
+import re
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from sqlalchemy.orm import Session
-from typing import Generic, Tuple, List, TypeVar
+from typing import Any, Callable, Generic, Mapping, Tuple, List, TypeVar
 from urllib.parse import quote
 
 from app import crud
+from app.db import SessionLocal
 from app.settings import settings
 from app.tastytrade_schema import (
     TastyAccount,
@@ -27,6 +38,18 @@ BASE_URL = settings.tastytrade_url
 REQUEST_TIMEOUT_SECONDS = settings.tastytrade_timeout_seconds
 USER_AGENT = settings.tastytrade_user_agent
 
+# 429 is always safe to retry: the request was rejected before it was handled.
+# Other 5xx answers are only retried where repeating the request is harmless.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+_RETRYABLE_SERVER_STATUSES = frozenset({500, 502, 503, 504})
+_MAX_RETRY_DELAY_SECONDS = 30.0
+
+_ENDPOINT_TEMPLATES = (
+    (re.compile(r"^/accounts/[^/]+"), "/accounts/{account_number}"),
+    (re.compile(r"/earnings-reports/[^/]+$"), "/earnings-reports/{symbol}"),
+    (re.compile(r"^/watchlists/[^/]+$"), "/watchlists/{name}"),
+)
+
 
 def _headers(token: str | None = None, *, content_type: str | None = None) -> dict[str, str]:
     headers = {
@@ -40,159 +63,119 @@ def _headers(token: str | None = None, *, content_type: str | None = None) -> di
     return headers
 
 
-def _request_json(method: str, path: str, **kwargs) -> dict:
-    response = requests.request(
-        method,
-        f"{BASE_URL}{path}",
-        timeout=REQUEST_TIMEOUT_SECONDS,
-        **kwargs,
-    )
-    response.raise_for_status()
-    return response.json()
-
-def login_to_tastytrade() -> Tuple[str, datetime]:
-    """
-    Authenticate with the Tastytrade API and get an OAuth access token.
-    Returns a tuple of (auth_header_value, expiration_datetime).
-    """
-
-    client_secret = os.getenv("TASTYTRADE_SECRET")
-    refresh_token = os.getenv("TASTYTRADE_REFRESH")
-    if not client_secret or not refresh_token:
-        raise RuntimeError("Tastytrade OAuth credentials not set in environment variables.")
+def _endpoint_template(path: str) -> str:
+    """Collapse account numbers and symbols so latency is grouped per endpoint."""
+    template = path.split("?", 1)[0]
+    for pattern, replacement in _ENDPOINT_TEMPLATES:
+        template = pattern.sub(replacement, template)
+    return template
 
-    payload = {
-        "grant_type": "refresh_token",
-        "refresh_token": refresh_token,
-        "client_secret": client_secret,
-    }
 
-    data = _request_json(
-        "POST",
-        "/oauth/token",
-        data=payload,
-        headers=_headers(content_type="application/x-www-form-urlencoded"),
-    )
+def _items_from_response(data: dict) -> list[dict]:
+    return data.get("data", {}).get("items", [])
 
-    access_token = data["access_token"]
-    token_type = data.get("token_type", "Bearer")
-    expires_value = data.get("expires_in", 0)
-    try:
-        expires_in = int(float(expires_value))
-    except (TypeError, ValueError):
-        expires_in = 0
-    buffer_seconds = 30  # refresh a little early to avoid using an expired token
-    exp_dt = datetime.now(timezone.utc) + timedelta(seconds=max(expires_in - buffer_seconds, 0))
-    bearer_token = f"{token_type} {access_token}".strip()
-    return bearer_token, exp_dt
 
-def get_active_token(db: Session) -> str:
-    """
-    Retrieve a valid access token, using a cached token if possible or logging in if needed.
-    This function checks the token stored in the database and refreshes it if expired.
-    """
-    token_entry = crud.get_session_token(db)
+def _should_retry(method: str, status_code: int) -> bool:
+    if status_code == 429:
+        return True
+    return method.upper() in _IDEMPOTENT_METHODS and status_code in _RETRYABLE_SERVER_STATUSES
 
-    if token_entry:
-        if token_entry.expiration.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
-            return token_entry.token
-    # If no token found or it's expired, log in again to get a new token
-    new_token, new_expiration = login_to_tastytrade()
-    crud.save_session_token(db, new_token, new_expiration)
-    return new_token
 
-def _items_from_response(data: dict) -> list[dict]:
-    return data.get("data", {}).get("items", [])
+def _retry_after_seconds(response) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), _MAX_RETRY_DELAY_SECONDS)
 
 
-def fetch_accounts(token: str) -> List[TastyAccount]:
+class TokenBucket:
     """
-    Fetch all accounts for the logged-in user via the Tastytrade API.
+    Thread-safe token bucket refilled at ``rate`` tokens per second.
 
-    Returns typed account models with account_number and nickname fields.
+    acquire() blocks until a token is available, and pause() stops every
+    caller for a while (e.g. after a 429). A rate of 0 disables limiting.
     """
-    data = _request_json("GET", "/customers/me/accounts", headers=_headers(token))
 
-    accounts: list[TastyAccount] = []
-    for item in _items_from_response(data):
-        acct = item.get("account", {})
-        accounts.append(TastyAccount.model_validate(acct))
-    return accounts
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
 
-def fetch_positions(token: str, account_number: str) -> List[TastyPosition]:
-    """
-    Retrieve all positions for a given account from the Tastytrade API.
-    Returns a list of position dictionaries for the specified account.
-    """
-    data = _request_json(
-        "GET",
-        f"/accounts/{account_number}/positions?net-positions=true&include-marks=true",
-        headers=_headers(token),
-    )
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    self._tokens = min(
+                        self.capacity,
+                        self._tokens + (now - self._updated) * self.rate,
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
 
-    return [TastyPosition.model_validate(item) for item in _items_from_response(data)]
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
 
-def fetch_market_data(token: str, equity: List[str], equity_option: List[str], future: List[str], future_option: List[str]) -> List[TastyMarketData]:
-    """
-    Fetch market data for the given symbols from the Tastytrade API.
-    Returns a list of market data dictionaries.
-    """
-    params = {
-        "equity": ",".join(equity),
-        "equity-option": ",".join(equity_option),
-        "future": ",".join(future),
-        "future-option": ",".join(future_option)
-    }
-    data = _request_json(
-        "GET",
-        "/market-data/by-type",
-        headers=_headers(token),
-        params=params,
-    )
-    return [TastyMarketData.model_validate(item) for item in _items_from_response(data)]
-
-def fetch_volatility_data(token: str, symbols: List[str]) -> List[TastyVolatilityMetric]:
-    """
-    Fetch volatility data for the given symbols from the Tastytrade API.
-    Returns a list of volatility data dictionaries.
-    """
-    params = {
-        "symbols": ",".join(symbols)
-    }
-    data = _request_json(
-        "GET",
-        "/market-metrics",
-        headers=_headers(token),
-        params=params,
-    )
-    return [TastyVolatilityMetric.model_validate(item) for item in _items_from_response(data)]
 
-def fetch_account_balance(token: str, account_number: str) -> TastyAccountBalance:
-    """
-    Fetch the account balance for a specific account from the Tastytrade API.
-    Returns a dictionary with balance information.
-    """
-    data = _request_json(
-        "GET",
-        f"/accounts/{account_number}/balances",
-        headers=_headers(token),
-    )
+@dataclass
+class EndpointLatency:
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
 
-    return TastyAccountBalance.model_validate(data["data"])
+    def record(self, elapsed: float, *, failed: bool) -> None:
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.last_seconds = elapsed
 
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 4),
+            "average_seconds": (
+                round(self.total_seconds / self.calls, 4) if self.calls else None
+            ),
+            "max_seconds": round(self.max_seconds, 4),
+            "last_seconds": round(self.last_seconds, 4),
+        }
 
-def place_complex_order(token: str, account_number: str, payload: dict) -> TastyComplexOrderResponse:
-    """
-    Submit a complex order (OCO/OTO/etc.) to the Tastytrade API.
-    Returns the raw API response data.
-    """
-    data = _request_json(
-        "POST",
-        f"/accounts/{account_number}/complex-orders",
-        headers=_headers(token, content_type="application/json"),
-        json=payload,
-    )
-    return TastyComplexOrderResponse.model_validate(data.get("data", data))
 
 PageItem = TypeVar("PageItem")
 
@@ -261,12 +244,638 @@ def _page_from_response(
     )
 
 
+class TastytradeClient:
+    """
+    Tastytrade API client that owns one pooled, keep-alive HTTP session.
+
+    Every request reuses connections from the session pool instead of opening
+    a new TCP and TLS connection, and latency is counted per endpoint.
+    Pass ``session`` to drive the client from a stand-in transport.
+
+    Each endpoint draws from its own token bucket; ``rate_limits`` overrides
+    the (per second, burst) budget for individual "METHOD /template" keys.
+    429 and retryable 5xx answers are retried with jittered exponential
+    backoff, honouring Retry-After when the server sends one.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        *,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+        pool_size: int = settings.tastytrade_pool_size,
+        keep_alive: bool = settings.tastytrade_keep_alive,
+        session: requests.Session | None = None,
+        rate_limit: Tuple[float, float] = (
+            settings.tastytrade_rate_limit_per_second,
+            settings.tastytrade_rate_limit_burst,
+        ),
+        rate_limits: Mapping[str, Tuple[float, float]] | None = None,
+        max_retries: int = settings.tastytrade_max_retries,
+        retry_backoff_seconds: float = settings.tastytrade_retry_backoff_seconds,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = session or self._build_session(pool_size, keep_alive)
+        self.rate_limit = rate_limit
+        self.rate_limits = dict(rate_limits or {})
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._latency: dict[str, EndpointLatency] = {}
+        self._latency_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_size: int, keep_alive: bool) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        self.session.close()
+
+    def request_json(self, method: str, path: str, **kwargs) -> dict:
+        endpoint = f"{method} {_endpoint_template(path)}"
+        bucket = self._bucket(endpoint)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+                if attempt < self.max_retries and _should_retry(method, response.status_code):
+                    self._record_latency(endpoint, time.perf_counter() - started, failed=True)
+                    delay = self._retry_delay(response, attempt)
+                    if response.status_code == 429:
+                        bucket.pause(delay)
+                    logging.warning(
+                        f"{endpoint} returned {response.status_code}; "
+                        f"retrying in {delay:.2f}s"
+                    )
+                    self._sleep(delay)
+                    attempt += 1
+                    continue
+                response.raise_for_status()
+                data = response.json()
+            except Exception:
+                self._record_latency(endpoint, time.perf_counter() - started, failed=True)
+                raise
+            self._record_latency(endpoint, time.perf_counter() - started, failed=False)
+            return data
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        with self._latency_lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                rate, burst = self.rate_limits.get(endpoint, self.rate_limit)
+                bucket = TokenBucket(rate, burst, sleep=self._sleep)
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def _retry_delay(self, response, attempt: int) -> float:
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(
+            self.retry_backoff_seconds * 2 ** attempt,
+            _MAX_RETRY_DELAY_SECONDS,
+        )
+        return random.uniform(0, ceiling)
+
+    def _record_latency(self, endpoint: str, elapsed: float, *, failed: bool) -> None:
+        with self._latency_lock:
+            self._latency.setdefault(endpoint, EndpointLatency()).record(
+                elapsed,
+                failed=failed,
+            )
+
+    def latency_stats(self) -> dict[str, dict]:
+        """Return per-endpoint call counts and latency in seconds."""
+        with self._latency_lock:
+            return {
+                endpoint: latency.snapshot()
+                for endpoint, latency in sorted(self._latency.items())
+            }
+
+    def reset_latency_stats(self) -> None:
+        with self._latency_lock:
+            self._latency.clear()
+
+    def login(self) -> Tuple[str, datetime]:
+        """
+        Authenticate with the Tastytrade API and get an OAuth access token.
+        Returns a tuple of (auth_header_value, expiration_datetime).
+        """
+
+        client_secret = os.getenv("TASTYTRADE_SECRET")
+        refresh_token = os.getenv("TASTYTRADE_REFRESH")
+        if not client_secret or not refresh_token:
+            raise RuntimeError("Tastytrade OAuth credentials not set in environment variables.")
+
+        payload = {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_secret": client_secret,
+        }
+
+        data = self.request_json(
+            "POST",
+            "/oauth/token",
+            data=payload,
+            headers=_headers(content_type="application/x-www-form-urlencoded"),
+        )
+
+        access_token = data["access_token"]
+        token_type = data.get("token_type", "Bearer")
+        expires_value = data.get("expires_in", 0)
+        try:
+            expires_in = int(float(expires_value))
+        except (TypeError, ValueError):
+            expires_in = 0
+        buffer_seconds = 30  # refresh a little early to avoid using an expired token
+        exp_dt = datetime.now(timezone.utc) + timedelta(seconds=max(expires_in - buffer_seconds, 0))
+        bearer_token = f"{token_type} {access_token}".strip()
+        return bearer_token, exp_dt
+
+    def fetch_accounts(self, token: str) -> List[TastyAccount]:
+        """
+        Fetch all accounts for the logged-in user via the Tastytrade API.
+
+        Returns typed account models with account_number and nickname fields.
+        """
+        data = self.request_json("GET", "/customers/me/accounts", headers=_headers(token))
+
+        accounts: list[TastyAccount] = []
+        for item in _items_from_response(data):
+            acct = item.get("account", {})
+            accounts.append(TastyAccount.model_validate(acct))
+        return accounts
+
+    def fetch_positions(self, token: str, account_number: str) -> List[TastyPosition]:
+        """
+        Retrieve all positions for a given account from the Tastytrade API.
+        Returns a list of position dictionaries for the specified account.
+        """
+        data = self.request_json(
+            "GET",
+            f"/accounts/{account_number}/positions?net-positions=true&include-marks=true",
+            headers=_headers(token),
+        )
+
+        return [TastyPosition.model_validate(item) for item in _items_from_response(data)]
+
+    def fetch_market_data(
+        self,
+        token: str,
+        equity: List[str],
+        equity_option: List[str],
+        future: List[str],
+        future_option: List[str],
+    ) -> List[TastyMarketData]:
+        """
+        Fetch market data for the given symbols from the Tastytrade API.
+        Returns a list of market data dictionaries.
+        """
+        params = {
+            "equity": ",".join(equity),
+            "equity-option": ",".join(equity_option),
+            "future": ",".join(future),
+            "future-option": ",".join(future_option)
+        }
+        data = self.request_json(
+            "GET",
+            "/market-data/by-type",
+            headers=_headers(token),
+            params=params,
+        )
+        return [TastyMarketData.model_validate(item) for item in _items_from_response(data)]
+
+    def fetch_volatility_data(self, token: str, symbols: List[str]) -> List[TastyVolatilityMetric]:
+        """
+        Fetch volatility data for the given symbols from the Tastytrade API.
+        Returns a list of volatility data dictionaries.
+        """
+        params = {
+            "symbols": ",".join(symbols)
+        }
+        data = self.request_json(
+            "GET",
+            "/market-metrics",
+            headers=_headers(token),
+            params=params,
+        )
+        return [TastyVolatilityMetric.model_validate(item) for item in _items_from_response(data)]
+
+    def fetch_account_balance(self, token: str, account_number: str) -> TastyAccountBalance:
+        """
+        Fetch the account balance for a specific account from the Tastytrade API.
+        Returns a dictionary with balance information.
+        """
+        data = self.request_json(
+            "GET",
+            f"/accounts/{account_number}/balances",
+            headers=_headers(token),
+        )
+
+        return TastyAccountBalance.model_validate(data["data"])
+
+    def place_complex_order(self, token: str, account_number: str, payload: dict) -> TastyComplexOrderResponse:
+        """
+        Submit a complex order (OCO/OTO/etc.) to the Tastytrade API.
+        Returns the raw API response data.
+        """
+        data = self.request_json(
+            "POST",
+            f"/accounts/{account_number}/complex-orders",
+            headers=_headers(token, content_type="application/json"),
+            json=payload,
+        )
+        return TastyComplexOrderResponse.model_validate(data.get("data", data))
+
+    def fetch_watchlists(self, token: str) -> List[TastyWatchlist]:
+        data = self.request_json("GET", "/watchlists", headers=_headers(token))
+        return [
+            TastyWatchlist.model_validate(item)
+            for item in _items_from_response(data)
+        ]
+
+    def add_symbol_to_watchlist(
+        self,
+        token: str,
+        watchlist_name: str,
+        symbol: str,
+        *,
+        instrument_type: str = "Equity",
+    ) -> tuple[TastyWatchlist, bool]:
+        """Append one symbol while preserving every existing watchlist property."""
+        requested_name = watchlist_name.strip()
+        normalized_symbol = symbol.strip().upper()
+        if not requested_name:
+            raise ValueError("Watchlist name is required.")
+        if not normalized_symbol:
+            raise ValueError("Symbol is required.")
+
+        watchlists = self.fetch_watchlists(token)
+        watchlist = next(
+            (
+                item
+                for item in watchlists
+                if item.name.casefold() == requested_name.casefold()
+            ),
+            None,
+        )
+        if watchlist is None:
+            raise LookupError("Brokerage watchlist not found.")
+        if any(
+            entry.symbol.upper() == normalized_symbol
+            for entry in watchlist.watchlist_entries
+        ):
+            return watchlist, False
+
+        entries = [
+            entry.to_tasty_dict()
+            for entry in watchlist.watchlist_entries
+        ]
+        entries.append(
+            TastyWatchlistEntry(
+                symbol=normalized_symbol,
+                instrument_type=instrument_type,
+            ).to_tasty_dict()
+        )
+        payload = {
+            "name": watchlist.name,
+            "watchlist-entries": entries,
+        }
+        if watchlist.group_name is not None:
+            payload["group-name"] = watchlist.group_name
+        if watchlist.order_index is not None:
+            payload["order-index"] = watchlist.order_index
+
+        self.request_json(
+            "PUT",
+            f"/watchlists/{quote(watchlist.name, safe='')}",
+            headers=_headers(token, content_type="application/json"),
+            json=payload,
+        )
+        return TastyWatchlist.model_validate(payload), True
+
+    def fetch_orders(
+        self,
+        token: str,
+        account_number: str,
+        *,
+        start_date: str,
+        end_date: str,
+        page_offset: int = 0,
+        per_page: int = 100,
+    ) -> TastyPage[TastyOrder]:
+        _validate_page_window(
+            start_date,
+            end_date,
+            per_page=per_page,
+            maximum_per_page=100,
+        )
+        params = {
+            "start-date": start_date,
+            "end-date": end_date,
+            "sort": "Asc",
+            "page-offset": page_offset,
+            "per-page": per_page,
+        }
+        data = self.request_json(
+            "GET",
+            f"/accounts/{account_number}/orders",
+            headers=_headers(token),
+            params=params,
+        )
+        return _page_from_response(
+            data, TastyOrder, page_offset=page_offset, per_page=per_page
+        )
+
+    def fetch_transactions(
+        self,
+        token: str,
+        account_number: str,
+        *,
+        start_date: str,
+        end_date: str,
+        page_offset: int = 0,
+        per_page: int = 2000,
+    ) -> TastyPage[TastyTransaction]:
+        _validate_page_window(
+            start_date,
+            end_date,
+            per_page=per_page,
+            maximum_per_page=2000,
+        )
+        params = {
+            "start-date": start_date,
+            "end-date": end_date,
+            "sort": "Asc",
+            "page-offset": page_offset,
+            "per-page": per_page,
+        }
+        data = self.request_json(
+            "GET",
+            f"/accounts/{account_number}/transactions",
+            headers=_headers(token),
+            params=params,
+        )
+        return _page_from_response(
+            data, TastyTransaction, page_offset=page_offset, per_page=per_page
+        )
+
+    def fetch_historical_earnings(
+        self,
+        token: str,
+        symbol: str,
+        *,
+        start_date: str,
+        end_date: str,
+    ) -> List[TastyEarningsReport]:
+        _validate_page_window(
+            start_date,
+            end_date,
+            per_page=1,
+            maximum_per_page=1,
+        )
+        data = self.request_json(
+            "GET",
+            (
+                "/market-metrics/historic-corporate-events/"
+                f"earnings-reports/{symbol.upper()}"
+            ),
+            headers=_headers(token),
+            params={"start-date": start_date, "end-date": end_date},
+        )
+        return [
+            TastyEarningsReport.model_validate(item)
+            for item in _items_from_response(data)
+        ]
+
+
+# Global client instance
+_client: TastytradeClient | None = None
+_client_lock = threading.Lock()
+
+# Dedicated workers for the asyncio surface, sized to the connection pool so
+# slow broker calls never occupy the event loop or the shared AnyIO threadpool.
+_async_executor: ThreadPoolExecutor | None = None
+
+
+def get_client() -> TastytradeClient:
+    """Get the shared Tastytrade client (singleton pattern)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TastytradeClient()
+    return _client
+
+
+def _get_async_executor() -> ThreadPoolExecutor:
+    global _async_executor
+    if _async_executor is None:
+        with _client_lock:
+            if _async_executor is None:
+                _async_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.tastytrade_pool_size),
+                    thread_name_prefix="tastytrade",
+                )
+    return _async_executor
+
+
+def close_client() -> None:
+    """Close pooled connections and async workers; the next call rebuilds them."""
+    global _client, _async_executor
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _async_executor is not None:
+            _async_executor.shutdown(wait=False, cancel_futures=True)
+            _async_executor = None
+
+
+async def run_async(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await a blocking broker call on the dedicated Tastytrade workers."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_async_executor(),
+        functools.partial(func, *args, **kwargs),
+    )
+
+
+def _request_json(method: str, path: str, **kwargs) -> dict:
+    return get_client().request_json(method, path, **kwargs)
+
+
+def login_to_tastytrade() -> Tuple[str, datetime]:
+    """
+    Authenticate with the Tastytrade API and get an OAuth access token.
+    Returns a tuple of (auth_header_value, expiration_datetime).
+    """
+    return get_client().login()
+
+
+class TokenManager:
+    """
+    Process-wide holder for the Tastytrade access token.
+
+    The token and its expiry live in memory, so valid lookups never touch the
+    database. Refreshes are single-flight, and a background timer renews the
+    token shortly before expiry. The session_tokens row is only a persistence
+    fallback across restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory=SessionLocal,
+        refresh_lead_seconds: float = settings.tastytrade_token_refresh_lead_seconds,
+    ):
+        self._session_factory = session_factory
+        self.refresh_lead_seconds = refresh_lead_seconds
+        self._current: tuple[str, datetime] | None = None
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    @staticmethod
+    def _is_valid(current: tuple[str, datetime] | None) -> bool:
+        return current is not None and current[1] > datetime.now(timezone.utc)
+
+    def get_token(self, db: Session | None = None) -> str:
+        """Return a valid token, logging in at most once across concurrent callers."""
+        current = self._current
+        if self._is_valid(current):
+            return current[0]
+
+        with self._lock:
+            current = self._current
+            if self._is_valid(current):
+                return current[0]
+
+            if current is None and db is not None:
+                token_entry = crud.get_session_token(db)
+                if token_entry:
+                    stored = (
+                        token_entry.token,
+                        token_entry.expiration.replace(tzinfo=timezone.utc),
+                    )
+                    if self._is_valid(stored):
+                        self._store(stored)
+                        return stored[0]
+
+            return self._login_and_store(db)
+
+    def refresh(self) -> None:
+        """Renew the token now; a failure keeps the current token until it expires."""
+        with self._lock:
+            try:
+                self._login_and_store(None)
+            except Exception as e:
+                logging.error(f"Background Tastytrade token refresh failed: {e}")
+
+    def clear(self) -> None:
+        """Forget the in-memory token and cancel any scheduled refresh."""
+        with self._lock:
+            self._current = None
+            self._cancel_timer()
+
+    def _login_and_store(self, db: Session | None) -> str:
+        new_token, new_expiration = login_to_tastytrade()
+        self._store((new_token, new_expiration))
+        self._persist(db, new_token, new_expiration)
+        return new_token
+
+    def _persist(self, db: Session | None, token: str, expiration: datetime) -> None:
+        if db is not None:
+            crud.save_session_token(db, token, expiration)
+            return
+        session = self._session_factory()
+        try:
+            crud.save_session_token(session, token, expiration)
+        except Exception as e:
+            logging.error(f"Failed to persist refreshed Tastytrade token: {e}")
+        finally:
+            session.close()
+
+    def _store(self, current: tuple[str, datetime]) -> None:
+        self._current = current
+        self._cancel_timer()
+        delay = (current[1] - datetime.now(timezone.utc)).total_seconds() - self.refresh_lead_seconds
+        if delay <= 0:
+            # Too close to expiry to schedule; the next caller refreshes inline.
+            return
+        self._timer = threading.Timer(delay, self.refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+_token_manager = TokenManager()
+
+
+def get_token_manager() -> TokenManager:
+    """Get the shared token manager."""
+    return _token_manager
+
+
+def get_active_token(db: Session) -> str:
+    """
+    Retrieve a valid access token, using the in-memory token when possible.
+    The database row is consulted only after a restart, and a login happens
+    only when no stored token is still valid.
+    """
+    return get_token_manager().get_token(db)
+
+
+def fetch_accounts(token: str) -> List[TastyAccount]:
+    return get_client().fetch_accounts(token)
+
+
+def fetch_positions(token: str, account_number: str) -> List[TastyPosition]:
+    return get_client().fetch_positions(token, account_number)
+
+
+def fetch_market_data(token: str, equity: List[str], equity_option: List[str], future: List[str], future_option: List[str]) -> List[TastyMarketData]:
+    return get_client().fetch_market_data(token, equity, equity_option, future, future_option)
+
+
+def fetch_volatility_data(token: str, symbols: List[str]) -> List[TastyVolatilityMetric]:
+    return get_client().fetch_volatility_data(token, symbols)
+
+
+def fetch_account_balance(token: str, account_number: str) -> TastyAccountBalance:
+    return get_client().fetch_account_balance(token, account_number)
+
+
+def place_complex_order(token: str, account_number: str, payload: dict) -> TastyComplexOrderResponse:
+    return get_client().place_complex_order(token, account_number, payload)
+
+
 def fetch_watchlists(token: str) -> List[TastyWatchlist]:
-    data = _request_json("GET", "/watchlists", headers=_headers(token))
-    return [
-        TastyWatchlist.model_validate(item)
-        for item in _items_from_response(data)
-    ]
+    return get_client().fetch_watchlists(token)
 
 
 def add_symbol_to_watchlist(
@@ -276,57 +885,12 @@ def add_symbol_to_watchlist(
     *,
     instrument_type: str = "Equity",
 ) -> tuple[TastyWatchlist, bool]:
-    """Append one symbol while preserving every existing watchlist property."""
-    requested_name = watchlist_name.strip()
-    normalized_symbol = symbol.strip().upper()
-    if not requested_name:
-        raise ValueError("Watchlist name is required.")
-    if not normalized_symbol:
-        raise ValueError("Symbol is required.")
-
-    watchlists = fetch_watchlists(token)
-    watchlist = next(
-        (
-            item
-            for item in watchlists
-            if item.name.casefold() == requested_name.casefold()
-        ),
-        None,
+    return get_client().add_symbol_to_watchlist(
+        token,
+        watchlist_name,
+        symbol,
+        instrument_type=instrument_type,
     )
-    if watchlist is None:
-        raise LookupError("Brokerage watchlist not found.")
-    if any(
-        entry.symbol.upper() == normalized_symbol
-        for entry in watchlist.watchlist_entries
-    ):
-        return watchlist, False
-
-    entries = [
-        entry.to_tasty_dict()
-        for entry in watchlist.watchlist_entries
-    ]
-    entries.append(
-        TastyWatchlistEntry(
-            symbol=normalized_symbol,
-            instrument_type=instrument_type,
-        ).to_tasty_dict()
-    )
-    payload = {
-        "name": watchlist.name,
-        "watchlist-entries": entries,
-    }
-    if watchlist.group_name is not None:
-        payload["group-name"] = watchlist.group_name
-    if watchlist.order_index is not None:
-        payload["order-index"] = watchlist.order_index
-
-    _request_json(
-        "PUT",
-        f"/watchlists/{quote(watchlist.name, safe='')}",
-        headers=_headers(token, content_type="application/json"),
-        json=payload,
-    )
-    return TastyWatchlist.model_validate(payload), True
 
 
 def fetch_orders(
@@ -338,27 +902,13 @@ def fetch_orders(
     page_offset: int = 0,
     per_page: int = 100,
 ) -> TastyPage[TastyOrder]:
-    _validate_page_window(
-        start_date,
-        end_date,
+    return get_client().fetch_orders(
+        token,
+        account_number,
+        start_date=start_date,
+        end_date=end_date,
+        page_offset=page_offset,
         per_page=per_page,
-        maximum_per_page=100,
-    )
-    params = {
-        "start-date": start_date,
-        "end-date": end_date,
-        "sort": "Asc",
-        "page-offset": page_offset,
-        "per-page": per_page,
-    }
-    data = _request_json(
-        "GET",
-        f"/accounts/{account_number}/orders",
-        headers=_headers(token),
-        params=params,
-    )
-    return _page_from_response(
-        data, TastyOrder, page_offset=page_offset, per_page=per_page
     )
 
 
@@ -371,27 +921,13 @@ def fetch_transactions(
     page_offset: int = 0,
     per_page: int = 2000,
 ) -> TastyPage[TastyTransaction]:
-    _validate_page_window(
-        start_date,
-        end_date,
+    return get_client().fetch_transactions(
+        token,
+        account_number,
+        start_date=start_date,
+        end_date=end_date,
+        page_offset=page_offset,
         per_page=per_page,
-        maximum_per_page=2000,
-    )
-    params = {
-        "start-date": start_date,
-        "end-date": end_date,
-        "sort": "Asc",
-        "page-offset": page_offset,
-        "per-page": per_page,
-    }
-    data = _request_json(
-        "GET",
-        f"/accounts/{account_number}/transactions",
-        headers=_headers(token),
-        params=params,
-    )
-    return _page_from_response(
-        data, TastyTransaction, page_offset=page_offset, per_page=per_page
     )
 
 
@@ -402,22 +938,116 @@ def fetch_historical_earnings(
     start_date: str,
     end_date: str,
 ) -> List[TastyEarningsReport]:
-    _validate_page_window(
-        start_date,
-        end_date,
-        per_page=1,
-        maximum_per_page=1,
+    return get_client().fetch_historical_earnings(
+        token,
+        symbol,
+        start_date=start_date,
+        end_date=end_date,
     )
-    data = _request_json(
-        "GET",
-        (
-            "/market-metrics/historic-corporate-events/"
-            f"earnings-reports/{symbol.upper()}"
-        ),
-        headers=_headers(token),
-        params={"start-date": start_date, "end-date": end_date},
+
+
+# Asyncio surface. Each wrapper resolves the blocking function at call time,
+# so patching the module-level function also covers its async counterpart.
+
+async def get_active_token_async(db: Session) -> str:
+    return await run_async(get_active_token, db)
+
+
+async def fetch_accounts_async(token: str) -> List[TastyAccount]:
+    return await run_async(fetch_accounts, token)
+
+
+async def fetch_positions_async(token: str, account_number: str) -> List[TastyPosition]:
+    return await run_async(fetch_positions, token, account_number)
+
+
+async def fetch_market_data_async(token: str, equity: List[str], equity_option: List[str], future: List[str], future_option: List[str]) -> List[TastyMarketData]:
+    return await run_async(fetch_market_data, token, equity, equity_option, future, future_option)
+
+
+async def fetch_volatility_data_async(token: str, symbols: List[str]) -> List[TastyVolatilityMetric]:
+    return await run_async(fetch_volatility_data, token, symbols)
+
+
+async def fetch_account_balance_async(token: str, account_number: str) -> TastyAccountBalance:
+    return await run_async(fetch_account_balance, token, account_number)
+
+
+async def place_complex_order_async(token: str, account_number: str, payload: dict) -> TastyComplexOrderResponse:
+    return await run_async(place_complex_order, token, account_number, payload)
+
+
+async def fetch_watchlists_async(token: str) -> List[TastyWatchlist]:
+    return await run_async(fetch_watchlists, token)
+
+
+async def add_symbol_to_watchlist_async(
+    token: str,
+    watchlist_name: str,
+    symbol: str,
+    *,
+    instrument_type: str = "Equity",
+) -> tuple[TastyWatchlist, bool]:
+    return await run_async(
+        add_symbol_to_watchlist,
+        token,
+        watchlist_name,
+        symbol,
+        instrument_type=instrument_type,
+    )
+
+
+async def fetch_orders_async(
+    token: str,
+    account_number: str,
+    *,
+    start_date: str,
+    end_date: str,
+    page_offset: int = 0,
+    per_page: int = 100,
+) -> TastyPage[TastyOrder]:
+    return await run_async(
+        fetch_orders,
+        token,
+        account_number,
+        start_date=start_date,
+        end_date=end_date,
+        page_offset=page_offset,
+        per_page=per_page,
+    )
+
+
+async def fetch_transactions_async(
+    token: str,
+    account_number: str,
+    *,
+    start_date: str,
+    end_date: str,
+    page_offset: int = 0,
+    per_page: int = 2000,
+) -> TastyPage[TastyTransaction]:
+    return await run_async(
+        fetch_transactions,
+        token,
+        account_number,
+        start_date=start_date,
+        end_date=end_date,
+        page_offset=page_offset,
+        per_page=per_page,
+    )
+
+
+async def fetch_historical_earnings_async(
+    token: str,
+    symbol: str,
+    *,
+    start_date: str,
+    end_date: str,
+) -> List[TastyEarningsReport]:
+    return await run_async(
+        fetch_historical_earnings,
+        token,
+        symbol,
+        start_date=start_date,
+        end_date=end_date,
     )
-    return [
-        TastyEarningsReport.model_validate(item)
-        for item in _items_from_response(data)
-    ]
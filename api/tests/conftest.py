@@ -1,6 +1,11 @@
+import json
 import os
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
 import pytest
 import pytest_asyncio
+import requests
 from httpx import AsyncClient
 
 # Use a temporary SQLite database for tests
@@ -13,7 +18,20 @@ os.environ.setdefault("DATABASE_URL", f"sqlite:///{TEST_DB_PATH}")
 if os.path.exists(TEST_DB_PATH):
     os.remove(TEST_DB_PATH)
 
+from app import tastytrade  # noqa: E402
+from app.db import SessionLocal  # noqa: E402
 from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    BrokerActivitySessionORM,
+    BrokerTransactionORM,
+    BrokerTransactionSyncORM,
+    ChartBarORM,
+    ChartBarRangeORM,
+)
+from app.services.cache_service import get_cache  # noqa: E402
+from app.services.positions_snapshot_service import (  # noqa: E402
+    get_positions_snapshot_cache,
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -23,8 +41,86 @@ def cleanup_db():
     if os.path.exists(TEST_DB_PATH):
         os.remove(TEST_DB_PATH)
 
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    """Keep shared caches and local read models from leaking between tests."""
+    _clear_shared_caches()
+    yield
+    _clear_shared_caches()
+
+
+def _clear_shared_caches():
+    get_cache().clear()
+    get_positions_snapshot_cache().clear()
+    with SessionLocal() as db:
+        db.query(ChartBarORM).delete()
+        db.query(ChartBarRangeORM).delete()
+        db.query(BrokerActivitySessionORM).delete()
+        db.query(BrokerTransactionORM).delete()
+        db.query(BrokerTransactionSyncORM).delete()
+        db.commit()
+
+
 @pytest_asyncio.fixture
 async def client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
 
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "tastytrade")
+
+
+class FixtureResponse:
+    def __init__(self, payload, status_code: int = 200, headers: dict | None = None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return self.payload
+
+
+class FixtureSession:
+    """
+    Stand-in for requests.Session that replays tests/fixtures/tastytrade.
+
+    Responses are keyed by "METHOD /path" or "/path" (query string ignored) and
+    may be a fixture file name, a payload dict, or a FixtureResponse.
+    """
+
+    def __init__(self, responses: dict | None = None):
+        self.responses = dict(responses or {})
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        path = urlsplit(url).path
+        self.calls.append(SimpleNamespace(method=method, url=url, path=path, kwargs=kwargs))
+        response = self.responses.get(f"{method} {path}", self.responses.get(path))
+        if response is None:
+            raise AssertionError(f"No Tastytrade fixture for {method} {path}.")
+        if isinstance(response, FixtureResponse):
+            return response
+        if isinstance(response, str):
+            with open(os.path.join(FIXTURE_DIR, response)) as fixture:
+                return FixtureResponse(json.load(fixture))
+        return FixtureResponse(response)
+
+    def close(self):
+        return None
+
+
+@pytest.fixture
+def tastytrade_session(monkeypatch):
+    """Route the shared Tastytrade client through a fixture-backed session."""
+    session = FixtureSession()
+    monkeypatch.setattr(
+        tastytrade,
+        "_client",
+        tastytrade.TastytradeClient(session=session, retry_backoff_seconds=0),
+    )
+    return session
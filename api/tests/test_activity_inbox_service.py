@@ -1,9 +1,11 @@
 import json
+import threading
 from datetime import date, datetime, timezone
 from pathlib import Path
 
 from app import tastytrade
 from app.services.activity_inbox_service import (
+    _fetch_pages,
     build_activity_review_events,
     fetch_activity_inbox,
 )
@@ -327,3 +329,81 @@ def test_fetch_activity_inbox_keeps_order_failure_non_fatal(monkeypatch):
         "ok",
     ]
     assert "secret" not in str(inbox.model_dump())
+
+
+def test_fetch_activity_inbox_fetches_accounts_concurrently_in_order(
+    monkeypatch,
+):
+    accounts = ["FAKE-A", "FAKE-B"]
+    barrier = threading.Barrier(4, timeout=5)
+    monkeypatch.setattr(
+        tastytrade,
+        "fetch_accounts",
+        lambda token: [
+            TastyAccount(account_number=number) for number in accounts
+        ],
+    )
+
+    def empty_page(token, account_number, **kwargs):
+        barrier.wait()
+        if account_number == "FAKE-A" and kwargs["per_page"] == 100:
+            raise RuntimeError("secret")
+        return TastyPage(
+            items=[],
+            page_offset=0,
+            per_page=kwargs["per_page"],
+            total_items=0,
+            total_pages=0,
+            has_more=False,
+        )
+
+    monkeypatch.setattr(tastytrade, "fetch_orders", empty_page)
+    monkeypatch.setattr(tastytrade, "fetch_transactions", empty_page)
+
+    inbox = fetch_activity_inbox(
+        "Bearer FAKE",
+        SESSION_DATE,
+        fetched_at=FETCHED_AT,
+    )
+
+    assert [
+        (source.endpoint, source.status.value)
+        for source in inbox.source_status
+    ] == [
+        ("/customers/me/accounts", "ok"),
+        ("/accounts/FAKE-A/orders", "unavailable"),
+        ("/accounts/FAKE-A/transactions", "ok"),
+        ("/accounts/FAKE-B/orders", "ok"),
+        ("/accounts/FAKE-B/transactions", "ok"),
+    ]
+    assert inbox.warnings == ["Orders are unavailable for account FAKE-A."]
+
+
+def test_fetch_pages_prefetches_remaining_pages_from_total_pages():
+    offsets = []
+    lock = threading.Lock()
+
+    def fetcher(token, account_number, *, page_offset, per_page, **kwargs):
+        with lock:
+            offsets.append(page_offset)
+        return TastyPage(
+            items=[page_offset],
+            page_offset=page_offset,
+            per_page=per_page,
+            total_items=3,
+            total_pages=3,
+            has_more=page_offset < 2,
+        )
+
+    items, truncated = _fetch_pages(
+        fetcher,
+        "Bearer FAKE",
+        "FAKE-OPTIONS",
+        "2026-07-14",
+        per_page=1,
+        prefetch=True,
+    )
+
+    assert items == [0, 1, 2]
+    assert truncated is False
+    assert sorted(offsets) == [0, 1, 2]
@@ -0,0 +1,164 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Base
+from app.schemas.brokerage import (
+    BrokerActivityInboxV1,
+    BrokerActivityMarketContextV1,
+    BrokerActivityReviewEventV1,
+    BrokerActivitySymbolContextV1,
+    DataStatus,
+    SourceMetadataV1,
+)
+from app.services.activity_inbox_store import (
+    is_session_settled,
+    load_activity_inbox,
+)
+
+
+SESSION_DATE = date(2026, 7, 14)
+FETCHED_AT = datetime(2026, 7, 15, 12, 0, tzinfo=timezone.utc)
+SETTLED = datetime(2026, 7, 15, 9, 20, tzinfo=timezone.utc)
+
+
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return Session(engine)
+
+
+def source(account_number: str, name: str, status=DataStatus.OK):
+    return SourceMetadataV1(
+        source="tastytrade",
+        endpoint=f"/accounts/{account_number}/{name}",
+        fetched_at=FETCHED_AT,
+        status=status,
+    )
+
+
+def review_event(account_number: str) -> BrokerActivityReviewEventV1:
+    return BrokerActivityReviewEventV1(
+        activity_group_id=f"tastytrade:{account_number}:group-fill:1",
+        session_date=SESSION_DATE,
+        account_number=account_number,
+        review_kind="opening",
+        occurred_at=FETCHED_AT,
+        underlying_symbol="AAPL",
+        grouping_status="explicit",
+        leg_count=0,
+        legs=[],
+        summary="AAPL opening activity",
+    )
+
+
+class FakeBroker:
+    def __init__(self, transactions_status=DataStatus.OK):
+        self.transactions_status = transactions_status
+        self.calls = []
+
+    def fetch(self, token, session_date, *, stored_accounts=None):
+        stored_accounts = stored_accounts or {}
+        self.calls.append(sorted(stored_accounts))
+        events = []
+        statuses = []
+        for account_number in ("FAKE-A", "FAKE-B"):
+            stored = stored_accounts.get(account_number)
+            if stored is not None:
+                events.extend(stored.events)
+                statuses.extend(stored.source_status)
+                continue
+            events.append(review_event(account_number))
+            statuses.append(source(account_number, "orders"))
+            statuses.append(
+                source(
+                    account_number,
+                    "transactions",
+                    self.transactions_status
+                    if account_number == "FAKE-B"
+                    else DataStatus.OK,
+                )
+            )
+        return BrokerActivityInboxV1(
+            session_date=session_date,
+            generated_at=FETCHED_AT,
+            events=events,
+            source_status=statuses,
+        )
+
+
+def enrich(inbox, benchmark_status=DataStatus.OK):
+    for event in inbox.events:
+        if event.market_context is None:
+            event.market_context = BrokerActivityMarketContextV1(
+                underlying=BrokerActivitySymbolContextV1(
+                    symbol="AAPL",
+                    source_symbol="AAPL",
+                    status=DataStatus.PARTIAL,
+                    activity_price=103,
+                ),
+                benchmark=BrokerActivitySymbolContextV1(
+                    symbol="SPY",
+                    source_symbol="SPY",
+                    status=benchmark_status,
+                ),
+            )
+    return inbox
+
+
+def test_settled_accounts_are_served_from_the_store():
+    broker = FakeBroker(transactions_status=DataStatus.UNAVAILABLE)
+    with session() as db:
+        first = load_activity_inbox(
+            db, "Bearer FAKE", SESSION_DATE, fetch=broker.fetch, enrich=enrich, now=SETTLED
+        )
+        second = load_activity_inbox(
+            db, "Bearer FAKE", SESSION_DATE, fetch=broker.fetch, enrich=enrich, now=SETTLED
+        )
+
+    assert broker.calls == [[], ["FAKE-A"]]
+    assert second.model_dump() == first.model_dump()
+    assert second.events[0].market_context.underlying.activity_price == 103
+
+
+def test_accounts_with_unavailable_chart_context_are_not_stored():
+    broker = FakeBroker()
+    statuses = iter([DataStatus.UNAVAILABLE, DataStatus.OK, DataStatus.OK])
+    with session() as db:
+        for _ in range(3):
+            load_activity_inbox(
+                db,
+                "Bearer FAKE",
+                SESSION_DATE,
+                fetch=broker.fetch,
+                enrich=lambda inbox: enrich(inbox, next(statuses)),
+                now=SETTLED,
+            )
+
+    assert broker.calls == [[], [], ["FAKE-A", "FAKE-B"]]
+
+
+def test_unsettled_session_is_always_refetched():
+    broker = FakeBroker()
+    with session() as db:
+        for _ in range(2):
+            load_activity_inbox(
+                db,
+                "Bearer FAKE",
+                SESSION_DATE,
+                fetch=broker.fetch,
+                enrich=enrich,
+                now=datetime(2026, 7, 14, 21, 0, tzinfo=timezone.utc),
+            )
+
+    assert broker.calls == [[], []]
+
+
+def test_session_settles_early_the_next_morning():
+    assert not is_session_settled(
+        SESSION_DATE, datetime(2026, 7, 15, 7, 59, tzinfo=timezone.utc)
+    )
+    assert is_session_settled(
+        SESSION_DATE, datetime(2026, 7, 15, 8, 0, tzinfo=timezone.utc)
+    )
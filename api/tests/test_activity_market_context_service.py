@@ -1,3 +1,5 @@
+import threading
+import time
 from datetime import date, datetime, timezone
 from zoneinfo import ZoneInfo
 
@@ -5,8 +7,9 @@ from app.schemas.brokerage import (
     BrokerActivityInboxV1,
     BrokerActivityReviewEventV1,
 )
-from app.schemas.charts import Bar, ChartResponse
+from app.schemas.charts import Bar, ChartBatchItem, ChartResponse
 from app.services.activity_market_context_service import (
+    SessionBars,
     enrich_activity_market_context,
 )
 
@@ -166,3 +169,103 @@ def test_entry_time_context_keeps_activity_when_chart_is_unavailable():
     assert context.benchmark.status.value == "unavailable"
     assert "upstream detail" not in str(result.model_dump())
     assert result.events[0].summary == "AAPL opening activity"
+
+
+def test_entry_time_context_fetches_all_symbols_in_one_batch():
+    bar = Bar(
+        time=timestamp_ms(14, 0),
+        open=102,
+        high=104,
+        low=101,
+        close=103,
+        volume=200,
+    )
+    calls = []
+
+    def batch(symbols, resolution, from_ts, to_ts):
+        calls.append((tuple(symbols), resolution))
+        return {
+            "^GSPC": ChartBatchItem(symbol="^GSPC", status="ok", bars=[bar]),
+            "SPY": ChartBatchItem(symbol="SPY", status="unavailable"),
+        }
+
+    inbox = BrokerActivityInboxV1(
+        session_date=SESSION_DATE,
+        generated_at=datetime.now(timezone.utc),
+        events=[event("SPX")],
+        source_status=[],
+    )
+
+    result = enrich_activity_market_context(inbox, batch_fetcher=batch)
+
+    assert calls == [(("^GSPC", "SPY"), "5m")]
+    context = result.events[0].market_context
+    assert context.underlying.source_symbol == "^GSPC"
+    assert context.underlying.activity_price == 103
+    assert context.benchmark.status.value == "unavailable"
+
+
+def test_entry_time_context_marks_slow_symbols_unavailable():
+    bar = Bar(
+        time=timestamp_ms(14, 0),
+        open=102,
+        high=104,
+        low=101,
+        close=103,
+        volume=200,
+    )
+    release = threading.Event()
+
+    def fetcher(symbol, resolution, from_ts, to_ts):
+        if symbol == "AAPL":
+            release.wait(5)
+        return chart(bar)
+
+    inbox = BrokerActivityInboxV1(
+        session_date=SESSION_DATE,
+        generated_at=datetime.now(timezone.utc),
+        events=[event()],
+        source_status=[],
+    )
+
+    started = time.monotonic()
+    try:
+        result = enrich_activity_market_context(
+            inbox,
+            chart_fetcher=fetcher,
+            fetch_timeout_seconds=0.2,
+            deadline_seconds=2,
+        )
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 1
+    context = result.events[0].market_context
+    assert context.underlying.status.value == "unavailable"
+    assert context.benchmark.activity_price == 103
+    assert "Entry-time price context is unavailable for AAPL." in result.events[0].warnings
+
+
+def test_session_bars_nearest_matches_linear_scan():
+    bars = [
+        Bar(
+            time=timestamp_ms(9, 30) + index * 300_000,
+            open=100 + index,
+            high=101 + index,
+            low=99 + index,
+            close=100.5 + index,
+            volume=10,
+        )
+        for index in range(79)
+    ]
+    session = SessionBars.from_bars(bars)
+
+    assert session.session_open == 100
+    assert session.session_high == 179
+    assert session.session_low == 99
+    assert session.session_close == 178.5
+    start = timestamp_ms(9, 0) / 1000
+    for offset in range(0, 8 * 3600, 37):
+        probe = start + offset
+        expected = min(bars, key=lambda bar: abs(bar.time / 1000 - probe))
+        assert session.nearest(probe) is expected
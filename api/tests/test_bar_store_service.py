@@ -0,0 +1,213 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base
+from app.schemas.charts import Bar
+from app.services.bar_archive_service import SqliteBarArchive
+from app.services.bar_store_service import (
+    BarSeries,
+    BarStore,
+    CoveredRange,
+    merge_series,
+    missing_segments,
+)
+from app.services.cache_service import InMemoryCache
+
+
+def _bar(ts: int) -> Bar:
+    return Bar(time=ts * 1000, open=1, high=2, low=0.5, close=1.5, volume=10)
+
+
+def _recording_fetch(calls):
+    def fetch(start, end):
+        calls.append((start, end))
+        return [_bar(ts) for ts in range(start - start % 60 + 60, end + 1, 60)]
+
+    return fetch
+
+
+def test_missing_segments_only_returns_uncovered_head_and_tail():
+    series = merge_series(
+        None,
+        [],
+        CoveredRange(start=1_000, end=2_000, fetched_at=10_000),
+        ttl=60,
+        interval_seconds=60,
+        now=10_000,
+    )
+
+    gaps = missing_segments(series, 500, 2_500, ttl=60, interval_seconds=60, now=10_000)
+
+    assert gaps == [(500, 1_000), (2_000, 2_500)]
+    assert missing_segments(series, 1_200, 1_800, ttl=60, interval_seconds=60, now=10_000) == []
+
+
+def test_stale_live_tail_is_refetched_but_closed_bars_are_kept():
+    series = merge_series(
+        None,
+        [],
+        CoveredRange(start=1_000, end=5_000, fetched_at=5_000),
+        ttl=60,
+        interval_seconds=300,
+        now=5_000,
+    )
+
+    assert missing_segments(series, 1_000, 5_000, ttl=60, interval_seconds=300, now=5_030) == []
+    assert missing_segments(series, 1_000, 5_000, ttl=60, interval_seconds=300, now=6_000) == [
+        (4_700, 5_000)
+    ]
+
+
+def test_bar_store_serves_sub_windows_and_fetches_only_the_extension():
+    store = BarStore(InMemoryCache())
+    calls = []
+    fetch = _recording_fetch(calls)
+
+    first = store.get_bars("spy", "1m", 6_000, 12_000, fetch, ttl=3_600)
+    inner = store.get_bars("SPY", "1m", 7_000, 9_000, fetch, ttl=3_600)
+    extended = store.get_bars("SPY", "1m", 6_000, 13_000, fetch, ttl=3_600)
+
+    assert calls == [(6_000, 12_000), (12_000, 13_000)]
+    assert [bar.time for bar in inner] == [ts * 1000 for ts in range(7_020, 9_001, 60)]
+    assert extended[0].time == first[0].time
+    assert extended[-1].time == 12_960_000
+    assert len({bar.time for bar in extended}) == len(extended)
+
+
+def test_empty_segment_is_covered_only_next_to_known_bars():
+    store = BarStore(InMemoryCache())
+    calls = []
+    fetch = _recording_fetch(calls)
+
+    assert store.get_bars("SPY", "1m", 6_000, 12_000, lambda start, end: [], ttl=3_600) == []
+    assert store.get_series("SPY", "1m") is None
+    store.get_bars("SPY", "1m", 6_000, 12_000, fetch, ttl=3_600)
+    store.get_bars("SPY", "1m", 12_000, 13_000, lambda start, end: [], ttl=3_600)
+    store.get_bars("SPY", "1m", 6_000, 13_000, fetch, ttl=3_600)
+
+    assert calls == [(6_000, 12_000)]
+    assert store.get_series("SPY", "1m").ranges[-1].end == 13_000
+
+
+def test_windows_ending_now_reuse_a_fresh_fetch():
+    store = BarStore(InMemoryCache())
+    calls = []
+    fetch = _recording_fetch(calls)
+    now = int(time.time())
+
+    store.get_bars("SPY", "1m", now - 3_600, now, fetch, ttl=60)
+    bars = store.get_bars("SPY", "1m", now - 3_598, now + 2, fetch, ttl=60)
+
+    assert calls == [(now - 3_600, now)]
+    assert bars[-1].time // 1000 <= now
+    series = store.get_series("SPY", "1m")
+    assert missing_segments(
+        series, now - 3_600, now + 59, ttl=60, interval_seconds=60, now=now + 61
+    ) == [(now - 60, now + 59)]
+    assert missing_segments(
+        series, now - 3_600, now + 60, ttl=60, interval_seconds=60, now=now
+    ) == [(now, now + 60)]
+    archived = BarSeries(
+        ranges=(CoveredRange(start=now - 3_600, end=now - 60, fetched_at=now),)
+    )
+    assert missing_segments(
+        archived, now - 3_600, now - 1, ttl=60, interval_seconds=60, now=now
+    ) == [(now - 60, now - 1)]
+
+
+def test_partial_refetch_that_stays_empty_returns_no_bars():
+    class Archive:
+        def load(self, symbol, interval, interval_seconds):
+            return BarSeries(
+                bars=(_bar(6_060),),
+                ranges=(CoveredRange(start=6_000, end=7_000, fetched_at=7_060),),
+            )
+
+        def save(self, *args):
+            pass
+
+    # Too small to hold the archived series, so store() finds nothing to extend.
+    store = BarStore(InMemoryCache(max_bytes=1), archive=Archive())
+
+    assert store.get_bars("SPY", "1m", 6_000, 12_000, lambda start, end: [], ttl=3_600) == []
+
+
+def _archive() -> SqliteBarArchive:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return SqliteBarArchive(sessionmaker(bind=engine))
+
+
+def test_archive_survives_restart_and_only_fetches_live_tail():
+    archive = _archive()
+    now = int(time.time())
+    from_ts, to_ts = now - 3_600, now
+    calls = []
+    BarStore(InMemoryCache(), archive=archive).get_bars(
+        "aapl", "1m", from_ts, to_ts, _recording_fetch(calls), ttl=60
+    )
+
+    restarted = BarStore(InMemoryCache(), archive=archive)
+    bars = restarted.get_bars(
+        "AAPL", "1m", from_ts, to_ts, _recording_fetch(calls), ttl=60
+    )
+
+    assert len(calls) == 2
+    tail_start, tail_end = calls[1]
+    assert tail_end == to_ts
+    assert to_ts - tail_start <= 120
+    assert [bar.time for bar in bars] == sorted({bar.time for bar in bars})
+    assert bars[0].time // 1000 >= from_ts
+
+
+def test_archive_skips_bars_that_were_still_open():
+    archive = _archive()
+    fetched_at = 10_000
+    archive.save(
+        "spy",
+        "1m",
+        [(9_000, 10_000, fetched_at, [_bar(9_900), _bar(9_960)])],
+        60,
+    )
+
+    series = archive.load("SPY", "1m", 60)
+
+    assert [bar.time for bar in series.bars] == [9_900_000]
+    assert series.ranges == (CoveredRange(start=9_000, end=9_940, fetched_at=10_000),)
+    assert archive.load("QQQ", "1m", 60) is None
+
+
+def test_archive_does_not_record_ranges_without_closed_bars():
+    archive = _archive()
+    archive.save("spy", "1m", [(9_000, 10_000, 10_000, [])], 60)
+    archive.save("spy", "1m", [(9_000, 10_000, 10_000, [_bar(9_960)])], 60)
+
+    assert archive.load("SPY", "1m", 60) is None
+
+
+def test_concurrent_archive_saves_keep_every_range():
+    archive = _archive()
+    barrier = threading.Barrier(8)
+
+    def save(index):
+        start = index * 1_000
+        barrier.wait()
+        archive.save("spy", "1m", [(start, start + 1_000, 100_000, [_bar(start + 60)])], 60)
+
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    series = archive.load("SPY", "1m", 60)
+    assert len(series.bars) == 8
+    assert [(item.start, item.end) for item in series.ranges] == [(0, 8_000)]
@@ -69,11 +69,14 @@ async def test_confirmed_live_bracket_order_submits(client, monkeypatch):
         "app.routers.v1.trades.settings",
         SimpleNamespace(live_trading_enabled=True),
     )
-    monkeypatch.setattr("app.routers.v1.trades._get_tastytrade_token_or_403", lambda db: "TOKEN")
+    async def fake_token(db):
+        return "TOKEN"
+
+    monkeypatch.setattr("app.routers.v1.trades._get_tastytrade_token_or_403", fake_token)
 
     placed = {}
 
-    def fake_place(token, account_number, payload):
+    async def fake_place(token, account_number, payload):
         placed.update(token=token, account_number=account_number, payload=payload)
         return {"status": "accepted"}
 
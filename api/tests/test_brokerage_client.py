@@ -1,47 +1,27 @@
 import pytest
-import json
-from pathlib import Path
 
 from app import tastytrade
 
 
-FIXTURE_DIR = Path(__file__).parent / "fixtures" / "tastytrade"
-
-
-def load_fixture(name: str) -> dict:
-    with (FIXTURE_DIR / name).open() as fixture:
-        return json.load(fixture)
-
-
-def test_fetch_watchlists_uses_read_only_endpoint(monkeypatch):
-    captured = {}
-
-    def fake_request(method, path, **kwargs):
-        captured.update(method=method, path=path, kwargs=kwargs)
-        return load_fixture("watchlists.json")
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+def test_fetch_watchlists_uses_read_only_endpoint(tastytrade_session):
+    tastytrade_session.responses["/watchlists"] = "watchlists.json"
 
     watchlists = tastytrade.fetch_watchlists("Bearer FAKE")
 
-    assert captured["method"] == "GET"
-    assert captured["path"] == "/watchlists"
-    assert captured["kwargs"]["headers"]["Authorization"] == "Bearer FAKE"
+    call = tastytrade_session.calls[0]
+    assert call.method == "GET"
+    assert call.path == "/watchlists"
+    assert call.kwargs["headers"]["Authorization"] == "Bearer FAKE"
     assert watchlists[0].name == "Core Options"
 
 
 def test_add_symbol_replaces_complete_watchlist_without_losing_entries(
-    monkeypatch,
+    tastytrade_session,
 ):
-    calls = []
-
-    def fake_request(method, path, **kwargs):
-        calls.append((method, path, kwargs))
-        if method == "GET":
-            return load_fixture("watchlists.json")
-        return {"data": {}}
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+    tastytrade_session.responses.update({
+        "GET /watchlists": "watchlists.json",
+        "PUT /watchlists/Core%20Options": {"data": {}},
+    })
 
     watchlist, added = tastytrade.add_symbol_to_watchlist(
         "Bearer FAKE",
@@ -57,10 +37,10 @@ def test_add_symbol_replaces_complete_watchlist_without_losing_entries(
         "AMD",
         "TSLA",
     ]
-    method, path, kwargs = calls[1]
-    assert method == "PUT"
-    assert path == "/watchlists/Core%20Options"
-    assert kwargs["json"] == {
+    call = tastytrade_session.calls[1]
+    assert call.method == "PUT"
+    assert call.path == "/watchlists/Core%20Options"
+    assert call.kwargs["json"] == {
         "name": "Core Options",
         "group-name": "Personal",
         "order-index": 1,
@@ -73,14 +53,10 @@ def test_add_symbol_replaces_complete_watchlist_without_losing_entries(
     }
 
 
-def test_add_existing_symbol_is_idempotent_and_does_not_replace(monkeypatch):
-    calls = []
-
-    def fake_request(method, path, **kwargs):
-        calls.append((method, path, kwargs))
-        return load_fixture("watchlists.json")
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+def test_add_existing_symbol_is_idempotent_and_does_not_replace(
+    tastytrade_session,
+):
+    tastytrade_session.responses["/watchlists"] = "watchlists.json"
 
     watchlist, added = tastytrade.add_symbol_to_watchlist(
         "Bearer FAKE", "core options", "aapl"
@@ -88,17 +64,13 @@ def test_add_existing_symbol_is_idempotent_and_does_not_replace(monkeypatch):
 
     assert watchlist.name == "Core Options"
     assert added is False
-    assert [call[0] for call in calls] == ["GET"]
-
+    assert [call.method for call in tastytrade_session.calls] == ["GET"]
 
-def test_fetch_orders_retains_pagination_and_bounded_dates(monkeypatch):
-    captured = {}
 
-    def fake_request(method, path, **kwargs):
-        captured.update(method=method, path=path, kwargs=kwargs)
-        return load_fixture("orders_FAKE_OPTIONS.json")
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+def test_fetch_orders_retains_pagination_and_bounded_dates(tastytrade_session):
+    tastytrade_session.responses[
+        "/accounts/FAKE-OPTIONS/orders"
+    ] = "orders_FAKE_OPTIONS.json"
 
     page = tastytrade.fetch_orders(
         "Bearer FAKE",
@@ -107,24 +79,19 @@ def test_fetch_orders_retains_pagination_and_bounded_dates(monkeypatch):
         end_date="2026-07-14",
     )
 
-    assert captured["method"] == "GET"
-    assert captured["path"] == "/accounts/FAKE-OPTIONS/orders"
-    assert captured["kwargs"]["params"]["start-date"] == "2026-07-14"
-    assert captured["kwargs"]["params"]["end-date"] == "2026-07-14"
-    assert captured["kwargs"]["params"]["sort"] == "Asc"
-    assert captured["kwargs"]["params"]["per-page"] == 100
+    call = tastytrade_session.calls[0]
+    assert call.method == "GET"
+    assert call.path == "/accounts/FAKE-OPTIONS/orders"
+    assert call.kwargs["params"]["start-date"] == "2026-07-14"
+    assert call.kwargs["params"]["end-date"] == "2026-07-14"
+    assert call.kwargs["params"]["sort"] == "Asc"
+    assert call.kwargs["params"]["per-page"] == 100
     assert page.total_items == 1
     assert page.has_more is False
     assert page.items[0].legs[0].action == "Sell to Open"
 
 
-def test_fetch_orders_rejects_page_size_above_live_limit(monkeypatch):
-    monkeypatch.setattr(
-        tastytrade,
-        "_request_json",
-        lambda *args, **kwargs: pytest.fail("Request should not be sent."),
-    )
-
+def test_fetch_orders_rejects_page_size_above_live_limit(tastytrade_session):
     with pytest.raises(ValueError, match="between 1 and 100"):
         tastytrade.fetch_orders(
             "Bearer FAKE",
@@ -133,16 +100,15 @@ def test_fetch_orders_rejects_page_size_above_live_limit(monkeypatch):
             end_date="2026-07-14",
             per_page=101,
         )
+    assert tastytrade_session.calls == []
 
 
-def test_fetch_transactions_requests_max_safe_page_and_keeps_metadata(monkeypatch):
-    captured = {}
-
-    def fake_request(method, path, **kwargs):
-        captured.update(method=method, path=path, kwargs=kwargs)
-        return load_fixture("transactions_FAKE_OPTIONS.json")
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+def test_fetch_transactions_requests_max_safe_page_and_keeps_metadata(
+    tastytrade_session,
+):
+    tastytrade_session.responses[
+        "/accounts/FAKE-OPTIONS/transactions"
+    ] = "transactions_FAKE_OPTIONS.json"
 
     page = tastytrade.fetch_transactions(
         "Bearer FAKE",
@@ -151,21 +117,20 @@ def test_fetch_transactions_requests_max_safe_page_and_keeps_metadata(monkeypatc
         end_date="2026-07-14",
     )
 
-    assert captured["path"] == "/accounts/FAKE-OPTIONS/transactions"
-    assert captured["kwargs"]["params"]["per-page"] == 2000
+    call = tastytrade_session.calls[0]
+    assert call.path == "/accounts/FAKE-OPTIONS/transactions"
+    assert call.kwargs["params"]["per-page"] == 2000
     assert page.total_items == 2
     assert page.has_more is False
     assert page.items[0].ext_group_fill_id == "FAKE-GROUP-1"
 
 
-def test_fetch_historical_earnings_does_not_claim_upcoming_date(monkeypatch):
-    captured = {}
-
-    def fake_request(method, path, **kwargs):
-        captured.update(method=method, path=path, kwargs=kwargs)
-        return load_fixture("earnings_AAPL.json")
-
-    monkeypatch.setattr(tastytrade, "_request_json", fake_request)
+def test_fetch_historical_earnings_does_not_claim_upcoming_date(
+    tastytrade_session,
+):
+    tastytrade_session.responses[
+        "/market-metrics/historic-corporate-events/earnings-reports/AAPL"
+    ] = "earnings_AAPL.json"
 
     reports = tastytrade.fetch_historical_earnings(
         "Bearer FAKE",
@@ -174,8 +139,9 @@ def test_fetch_historical_earnings_does_not_claim_upcoming_date(monkeypatch):
         end_date="2026-07-15",
     )
 
-    assert captured["path"].endswith("/earnings-reports/AAPL")
-    assert captured["kwargs"]["params"] == {
+    call = tastytrade_session.calls[0]
+    assert call.path.endswith("/earnings-reports/AAPL")
+    assert call.kwargs["params"] == {
         "start-date": "2026-01-01",
         "end-date": "2026-07-15",
     }
@@ -191,13 +157,8 @@ def test_fetch_historical_earnings_does_not_claim_upcoming_date(monkeypatch):
     ],
 )
 def test_fetch_transactions_rejects_unbounded_or_invalid_windows(
-    monkeypatch, start_date, end_date, per_page, message
+    tastytrade_session, start_date, end_date, per_page, message
 ):
-    def unexpected_request(*args, **kwargs):
-        raise AssertionError("Invalid request should not reach Tastytrade.")
-
-    monkeypatch.setattr(tastytrade, "_request_json", unexpected_request)
-
     with pytest.raises(ValueError, match=message):
         tastytrade.fetch_transactions(
             "Bearer FAKE",
@@ -206,3 +167,4 @@ def test_fetch_transactions_rejects_unbounded_or_invalid_windows(
             end_date=end_date,
             per_page=per_page,
         )
+    assert tastytrade_session.calls == []
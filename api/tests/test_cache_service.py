@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+
+from app.schemas.charts import Bar
+from app.services.bar_store_service import BarSeries, CoveredRange
+from app.services.cache_service import InMemoryCache, approximate_size
+
+
+def _age_entry(cache: InMemoryCache, key: str, seconds: float) -> None:
+    cache._cache[key].timestamp -= seconds
+
+
+def test_get_or_refresh_serves_stale_value_while_refreshing():
+    cache = InMemoryCache()
+    refreshed = threading.Event()
+    cache.set("quote", "old", ttl=10, stale_ttl=30)
+    _age_entry(cache, "quote", 15)
+
+    def loader():
+        refreshed.set()
+        return "new"
+
+    assert cache.get("quote") is None
+    assert cache.get_or_refresh("quote", loader, ttl=10, stale_ttl=30) == "old"
+    assert refreshed.wait(timeout=2)
+    for _ in range(100):
+        if cache.get("quote") == "new":
+            break
+        time.sleep(0.01)
+    assert cache.get("quote") == "new"
+
+
+def test_get_or_refresh_single_flights_concurrent_misses():
+    cache = InMemoryCache()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def loader():
+        calls.append(1)
+        release.wait(timeout=2)
+        return "bars"
+
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_refresh("bars", loader, ttl=60))
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["bars"] * 5
+
+
+def test_get_or_refresh_does_not_cache_failures_or_expired_values():
+    cache = InMemoryCache()
+    cache.set("bars", "ancient", ttl=10, stale_ttl=5)
+    _age_entry(cache, "bars", 20)
+
+    def fail():
+        raise RuntimeError("yahoo offline")
+
+    with pytest.raises(RuntimeError, match="yahoo offline"):
+        cache.get_or_refresh("bars", fail, ttl=10)
+    assert cache.get_or_refresh("bars", lambda: "fresh", ttl=10) == "fresh"
+    assert cache.cleanup_expired() == 0
+
+
+def test_cache_evicts_least_recently_used_entries_over_entry_limit():
+    cache = InMemoryCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_tracks_approximate_bytes_against_budget():
+    cache = InMemoryCache(max_bytes=approximate_size(["x" * 1000]) * 2)
+    cache.set("one", ["x" * 1000])
+    cache.set("two", ["y" * 1000])
+    cache.set("three", ["z" * 1000])
+    cache.set("huge", ["w" * 100_000])
+
+    stats = cache.stats()
+    assert cache.get("huge") is None
+    assert cache.get("one") is None
+    assert stats["entries"] == 2
+    assert stats["approximate_bytes"] <= stats["max_bytes"]
+
+
+def test_bar_series_size_comes_from_counts_not_a_walk():
+    bars = tuple(
+        Bar.model_construct(
+            time=index * 60_000, open=1.0 + index, high=2.0 + index,
+            low=0.5, close=1.5, volume=10_000 + index,
+        )
+        for index in range(500)
+    )
+    series = BarSeries(bars=bars, ranges=(CoveredRange(start=0, end=30_000, fetched_at=30_000),))
+    walked = approximate_size((vars(series), series.bars, series.ranges))
+
+    assert approximate_size(series) == series.cache_size()
+    assert abs(series.cache_size() - walked) < walked * 0.1
+
+
+def test_close_stops_refresh_workers_until_the_next_stale_read():
+    cache = InMemoryCache()
+    cache.set("quote", "old", ttl=10, stale_ttl=30)
+    _age_entry(cache, "quote", 15)
+    cache.get_or_refresh("quote", lambda: "new", ttl=10, stale_ttl=30)
+    executor = cache._refresh_executor
+
+    cache.close()
+
+    assert cache._refresh_executor is None
+    assert executor._shutdown
+    _age_entry(cache, "quote", 15)
+    cache.get_or_refresh("quote", lambda: "newer", ttl=10, stale_ttl=30)
+    assert cache._refresh_executor is not executor
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_admin_cache_endpoint_reports_stats(client, monkeypatch):
+    cache = InMemoryCache()
+    cache.set("quote", "SPY")
+    cache.get("quote")
+    cache.get("missing")
+    monkeypatch.setattr("app.routers.v1.admin.get_cache", lambda: cache)
+
+    response = await client.get("/v1/admin/cache")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["entries"] == 1
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+    assert data["approximate_bytes"] > 0
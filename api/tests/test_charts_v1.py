@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, timezone
 
+from app.services.cache_service import InMemoryCache
+
 
 # Sample yfinance DataFrame response
 sample_yfinance_data = pd.DataFrame({
@@ -128,8 +130,7 @@ async def test_get_chart_history_preserves_epoch_as_timezone_aware_utc(client):
         mock_ticker.history.return_value = sample_yfinance_data
         mock_ticker_class.return_value = mock_ticker
         with patch('app.services.charts_service.get_cache') as mock_cache:
-            mock_cache_obj = MagicMock()
-            mock_cache_obj.get.return_value = None
+            mock_cache_obj = InMemoryCache()
             mock_cache.return_value = mock_cache_obj
             from_ts = 1784112300
             to_ts = 1784136300
@@ -164,8 +165,7 @@ async def test_get_chart_history_filters_null_values(client):
         
         # Clear cache to ensure fresh request
         with patch('app.services.charts_service.get_cache') as mock_cache:
-            mock_cache_obj = MagicMock()
-            mock_cache_obj.get.return_value = None
+            mock_cache_obj = InMemoryCache()
             mock_cache.return_value = mock_cache_obj
             
             resp = await client.get("/v1/charts/history/AAPL")
@@ -196,6 +196,24 @@ async def test_get_chart_history_empty_response(client):
         assert "No data found for symbol" in data["detail"]
 
 
+@pytest.mark.asyncio
+async def test_get_chart_history_does_not_cache_an_empty_response(client):
+    """An empty yfinance frame may be a transient error, so the next request retries"""
+    params = {"resolution": "1d", "from_ts": 1640995200, "to_ts": 1641254400}
+    with patch('app.services.charts_service.yf.Ticker') as mock_ticker_class:
+        mock_ticker = MagicMock()
+        mock_ticker.history.side_effect = [empty_yfinance_data, sample_yfinance_data]
+        mock_ticker_class.return_value = mock_ticker
+
+        failed = await client.get("/v1/charts/history/AAPL", params=params)
+        recovered = await client.get("/v1/charts/history/AAPL", params=params)
+
+    assert failed.status_code == 404
+    assert recovered.status_code == 200
+    assert len(recovered.json()["bars"]) == 3
+    assert mock_ticker.history.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_get_chart_history_yfinance_error(client):
     """Test handling of yfinance exceptions"""
@@ -231,8 +249,7 @@ async def test_get_chart_history_resolution_mapping(client):
             
             # Clear cache between test iterations to avoid cached responses
             with patch('app.services.charts_service.get_cache') as mock_cache:
-                mock_cache_obj = MagicMock()
-                mock_cache_obj.get.return_value = None
+                mock_cache_obj = InMemoryCache()
                 mock_cache.return_value = mock_cache_obj
                 
                 resp = await client.get(f"/v1/charts/history/AAPL?resolution={input_resolution}")
@@ -265,8 +282,7 @@ async def test_get_chart_history_volume_handling(client):
         
         # Clear cache to ensure fresh request
         with patch('app.services.charts_service.get_cache') as mock_cache:
-            mock_cache_obj = MagicMock()
-            mock_cache_obj.get.return_value = None
+            mock_cache_obj = InMemoryCache()
             mock_cache.return_value = mock_cache_obj
             
             resp = await client.get("/v1/charts/history/AAPL")
@@ -308,12 +324,147 @@ async def test_get_chart_history_symbol_case_handling(client):
         
         # Clear cache to ensure fresh request
         with patch('app.services.charts_service.get_cache') as mock_cache:
-            mock_cache_obj = MagicMock()
-            mock_cache_obj.get.return_value = None
+            mock_cache_obj = InMemoryCache()
             mock_cache.return_value = mock_cache_obj
             
             resp = await client.get("/v1/charts/history/aapl")  # lowercase
             
             assert resp.status_code == 200
             # Verify ticker was created with uppercase symbol
-            mock_ticker_class.assert_called_once_with('AAPL')
\ No newline at end of file
+            mock_ticker_class.assert_called_once_with('AAPL')
+
+@pytest.mark.asyncio
+async def test_get_chart_history_serves_overlapping_window_from_bar_store(client):
+    with patch('app.services.charts_service.yf.Ticker') as mock_ticker_class:
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = sample_yfinance_data
+        mock_ticker_class.return_value = mock_ticker
+
+        first = await client.get(
+            "/v1/charts/history/AAPL",
+            params={"resolution": "1d", "from_ts": 1640995200, "to_ts": 1641254400},
+        )
+        second = await client.get(
+            "/v1/charts/history/AAPL",
+            params={"resolution": "1d", "from_ts": 1640995200, "to_ts": 1641254399},
+        )
+
+        assert first.status_code == second.status_code == 200
+        assert second.json()["bars"] == first.json()["bars"]
+        mock_ticker.history.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_chart_history_columns_returns_parallel_arrays(client):
+    """Columnar history drops null OHLC rows and converts the index to epoch ms"""
+    aware = sample_yfinance_data_with_nulls.tz_localize("America/New_York")
+    with patch('app.services.charts_service.yf.Ticker') as mock_ticker_class:
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = aware
+        mock_ticker_class.return_value = mock_ticker
+
+        resp = await client.get("/v1/charts/history/AAPL/columns")
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["s"] == "ok"
+    assert data["t"] == [
+        int(aware.index[0].timestamp() * 1000),
+        int(aware.index[2].timestamp() * 1000),
+    ]
+    assert data["o"] == [100.0, 102.0]
+    assert data["c"] == [103.0, 105.0]
+    assert data["v"] == [1000000, 1200000]
+
+
+@pytest.mark.asyncio
+async def test_get_chart_history_columns_reuses_bars_in_the_store(client):
+    """Columns for a window already fetched as bars come from the bar store"""
+    params = {"resolution": "1d", "from_ts": 1640995200, "to_ts": 1641254400}
+    with patch('app.services.charts_service.yf.Ticker') as mock_ticker_class:
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = sample_yfinance_data
+        mock_ticker_class.return_value = mock_ticker
+
+        bars = await client.get("/v1/charts/history/AAPL", params=params)
+        columns = await client.get("/v1/charts/history/AAPL/columns", params=params)
+
+    assert bars.status_code == columns.status_code == 200
+    mock_ticker.history.assert_called_once()
+    data = columns.json()
+    assert data["t"] == [bar["time"] for bar in bars.json()["bars"]]
+    assert data["h"] == [bar["high"] for bar in bars.json()["bars"]]
+    assert data["v"] == [bar["volume"] for bar in bars.json()["bars"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_history_uses_one_download_and_reports_per_symbol_status(client):
+    """Batch history downloads every uncached symbol at once and reuses the bar store"""
+    index = pd.DatetimeIndex([
+        datetime(2022, 1, 3, 14, 30, tzinfo=timezone.utc),
+        datetime(2022, 1, 4, 14, 30, tzinfo=timezone.utc),
+    ])
+    frames = {
+        "AAPL": sample_yfinance_data.iloc[:2].set_axis(index),
+        "MSFT": sample_yfinance_data.iloc[1:].set_axis(index),
+        "NOPE": pd.DataFrame(np.nan, index=index, columns=sample_yfinance_data.columns),
+    }
+    downloaded = pd.concat(frames, axis=1)
+    payload = {
+        "symbols": ["aapl", "MSFT", "nope", "AAPL"],
+        "from_ts": 1641168000,
+        "to_ts": 1641340800,
+    }
+
+    with patch('app.services.charts_service.yf.download', return_value=downloaded) as download:
+        first = await client.post("/v1/charts/history:batch", json=payload)
+        second = await client.post("/v1/charts/history:batch", json={**payload, "symbols": ["AAPL", "MSFT"]})
+
+    assert first.status_code == 200
+    items = first.json()["items"]
+    assert [item["symbol"] for item in items] == ["AAPL", "MSFT", "NOPE"]
+    assert [item["status"] for item in items] == ["ok", "ok", "unavailable"]
+    assert items[0]["bars"][0]["open"] == 100.0
+    assert items[1]["bars"][0]["open"] == 101.0
+    assert download.call_count == 1
+    assert sorted(download.call_args.args[0]) == ["AAPL", "MSFT", "NOPE"]
+    assert second.json()["items"][1]["bars"] == items[1]["bars"]
+
+
+@pytest.mark.asyncio
+async def test_batch_history_does_not_cover_symbols_the_download_dropped(client):
+    """Dropped symbols stay uncovered and each symbol stores only its own gaps"""
+    from app.services.bar_store_service import BarStore
+    from app.services.cache_service import get_cache
+
+    index = pd.DatetimeIndex([
+        datetime(2022, 1, 3, 14, 30, tzinfo=timezone.utc),
+        datetime(2022, 1, 4, 14, 30, tzinfo=timezone.utc),
+    ])
+    payload = {"symbols": ["IBM"], "from_ts": 1641168000, "to_ts": 1641254400}
+    seeded = pd.concat({"IBM": sample_yfinance_data.iloc[:1].set_axis(index[:1])}, axis=1)
+    both = pd.concat(
+        {
+            "IBM": sample_yfinance_data.iloc[:2].set_axis(index),
+            "ORCL": sample_yfinance_data.iloc[1:].set_axis(index),
+        },
+        axis=1,
+    )
+    wider = {**payload, "to_ts": 1641340800}
+
+    with patch('app.services.charts_service.yf.download', side_effect=[seeded, both, both]) as download:
+        await client.post("/v1/charts/history:batch", json=payload)
+        first = await client.post("/v1/charts/history:batch", json={**wider, "symbols": ["IBM", "ORCL", "GONE"]})
+        second = await client.post("/v1/charts/history:batch", json={**wider, "symbols": ["IBM", "GONE"]})
+
+    items = {item["symbol"]: item for item in first.json()["items"]}
+    assert items["IBM"]["status"] == items["ORCL"]["status"] == "ok"
+    assert items["GONE"]["status"] == "unavailable"
+    assert [item["status"] for item in second.json()["items"]] == ["ok", "unavailable"]
+    assert download.call_args.args[0] == ["GONE"]
+
+    store = BarStore(get_cache())
+    assert store.get_series("GONE", "1d") is None
+    ibm = store.get_series("IBM", "1d")
+    assert [(item.start, item.end) for item in ibm.ranges] == [(1641168000, 1641340800)]
+    assert [bar.open for bar in ibm.bars] == [100.0, 101.0]
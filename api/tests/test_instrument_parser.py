@@ -0,0 +1,52 @@
+from datetime import date
+
+from app.services.instrument_parser import (
+    OptionSymbol,
+    expiration_date_text,
+    expiration_day,
+    parse_option_symbol,
+)
+from app.services.trades_service import days_to_expiration, parse_equity_option_symbol
+
+
+def test_parse_option_symbol_reads_every_occ_field():
+    assert parse_option_symbol("AAPL  220617C00150000") == OptionSymbol(
+        root="AAPL",
+        expiration=date(2022, 6, 17),
+        option_type="C",
+        strike=150.0,
+    )
+    assert parse_option_symbol("SPXW  261120P05012500").strike == 5012.5
+    assert parse_equity_option_symbol("AAPL  220617P00150500") == (150.5, "P")
+
+
+def test_unparseable_option_symbols_return_none():
+    assert parse_option_symbol("AAPL") is None
+    assert parse_option_symbol("AAPL  220617X00150000") is None
+    assert parse_option_symbol("AAPL  220617C0015000X") is None
+    assert parse_option_symbol("AAPL  2206XXC00150000").expiration is None
+    assert parse_equity_option_symbol("") == (None, None)
+
+
+def test_expiration_parsing_is_cached_per_value():
+    parse_option_symbol.cache_clear()
+    expiration_day.cache_clear()
+    expiration_date_text.cache_clear()
+
+    for _ in range(3):
+        parse_option_symbol("AAPL  220617C00150000")
+        assert days_to_expiration(
+            "2026-08-21T20:00:00.000+00:00",
+            today=date(2026, 8, 11),
+        ) == 10
+
+    assert parse_option_symbol.cache_info().misses == 1
+    assert expiration_day.cache_info().misses == 1
+    assert expiration_date_text.cache_info().misses == 1
+
+
+def test_expiration_text_falls_back_for_non_iso_values():
+    assert expiration_date_text("2026-08-21T20:00:00Z") == "2026-08-21"
+    assert expiration_date_text("Aug-21T20") == "Aug-21"
+    assert expiration_date_text("") == ""
+    assert expiration_day("not a date") is None
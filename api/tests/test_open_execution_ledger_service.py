@@ -1,4 +1,4 @@
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from app.services.cache_service import InMemoryCache
 from app.services.open_execution_ledger_service import load_open_execution_groups
@@ -13,12 +13,13 @@ def _transaction(
     order_id: int | None = 100,
     group_fill_id: str | None = None,
     action: str = "Buy to Open",
+    executed_at: str = "2026-07-07T15:30:00Z",
 ) -> TastyTransaction:
     return TastyTransaction.model_validate({
         "id": transaction_id,
         "transaction-type": "Trade",
         "transaction-sub-type": action,
-        "executed-at": "2026-07-07T15:30:00Z",
+        "executed-at": executed_at,
         "symbol": symbol,
         "underlying-symbol": "SPX",
         "instrument-type": "Equity Option",
@@ -40,7 +41,7 @@ def test_order_id_groups_four_opening_legs_when_group_fill_is_absent(monkeypatch
     ]
     calls = []
     monkeypatch.setattr(
-        "app.services.open_execution_ledger_service.tastytrade.fetch_transactions",
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
         lambda *args, **kwargs: (
             calls.append(kwargs) or TastyPage(
                 items=transactions, page_offset=0, per_page=2000, has_more=False,
@@ -78,7 +79,7 @@ def test_group_fill_takes_priority_and_closing_rows_are_excluded(monkeypatch):
         _transaction(3, "SPX A", order_id=200, action="Sell to Close"),
     ]
     monkeypatch.setattr(
-        "app.services.open_execution_ledger_service.tastytrade.fetch_transactions",
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
         lambda *args, **kwargs: TastyPage(
             items=transactions, page_offset=0, per_page=2000, has_more=False,
             total_items=len(transactions), total_pages=1,
@@ -99,7 +100,7 @@ def test_group_fill_takes_priority_and_closing_rows_are_excluded(monkeypatch):
 def test_missing_provenance_is_retained_with_partial_source_status(monkeypatch):
     transaction = _transaction(1, "SPX A", order_id=None)
     monkeypatch.setattr(
-        "app.services.open_execution_ledger_service.tastytrade.fetch_transactions",
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
         lambda *args, **kwargs: TastyPage(
             items=[transaction], page_offset=0, per_page=2000, has_more=False,
             total_items=1, total_pages=1,
@@ -121,7 +122,7 @@ def test_transaction_source_failure_returns_unavailable_collection(monkeypatch):
         raise RuntimeError("broker offline")
 
     monkeypatch.setattr(
-        "app.services.open_execution_ledger_service.tastytrade.fetch_transactions",
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
         fail,
     )
 
@@ -133,3 +134,189 @@ def test_transaction_source_failure_returns_unavailable_collection(monkeypatch):
     assert result.groups == []
     assert result.source.status.value == "unavailable"
     assert result.warnings == ["Brokerage transaction history is unavailable."]
+
+
+def test_ledger_syncs_only_past_the_high_water_mark(monkeypatch):
+    calls = []
+
+    def fetch(token, account_number, **kwargs):
+        calls.append((kwargs["start_date"], kwargs["end_date"], kwargs["page_offset"]))
+        page = kwargs["page_offset"]
+        if kwargs["start_date"] == "2026-01-01":
+            # Longer than the old 20-page cap.
+            return TastyPage(
+                items=[_transaction(page + 1, f"SPX {page}", order_id=page)],
+                page_offset=page, per_page=2000, has_more=page < 24,
+                total_items=25, total_pages=25,
+            )
+        return TastyPage(
+            items=[_transaction(100, "SPX NEW", order_id=900)],
+            page_offset=0, per_page=2000, has_more=False,
+            total_items=1, total_pages=1,
+        )
+
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        fetch,
+    )
+
+    first = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+    second = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 17),
+        cache=InMemoryCache(),
+    )
+
+    assert len(first.groups) == 25
+    assert first.truncated is False
+    assert len(calls) == 26
+    assert calls[-1] == ("2026-07-10", "2026-07-17", 0)
+    assert len(second.groups) == 26
+
+
+def test_failed_sync_serves_the_local_ledger_as_partial(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        lambda *args, **kwargs: TastyPage(
+            items=[_transaction(1, "SPX A")], page_offset=0, per_page=2000,
+            has_more=False, total_items=1, total_pages=1,
+        ),
+    )
+    load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("broker offline")
+
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        fail,
+    )
+    result = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 17),
+        cache=InMemoryCache(),
+    )
+
+    assert len(result.groups) == 1
+    assert result.source.status.value == "partial"
+    assert "Transaction sync failed" in result.warnings[0]
+
+
+def test_transactions_without_a_timestamp_are_skipped(monkeypatch):
+    undated = _transaction(2, "SPX UNDATED", order_id=200)
+    undated.executed_at = None
+
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        lambda *args, **kwargs: TastyPage(
+            items=[_transaction(1, "SPX A"), undated], page_offset=0,
+            per_page=2000, has_more=False, total_items=2, total_pages=1,
+        ),
+    )
+
+    result = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+
+    assert [group.legs[0].symbol for group in result.groups] == ["SPX A"]
+    assert result.source.status.value == "ok"
+
+
+def _weekly_page(page: int, **kwargs) -> TastyPage:
+    executed = date(2026, 1, 1) + timedelta(weeks=page)
+    return TastyPage(
+        items=[
+            _transaction(
+                page + 1, f"SPX {page}", order_id=page,
+                executed_at=f"{executed.isoformat()}T15:30:00Z",
+            )
+        ],
+        page_offset=page, per_page=2000, **kwargs,
+    )
+
+
+def test_sync_that_hits_the_page_cap_is_truncated_and_continued(monkeypatch):
+    calls = []
+
+    def fetch(token, account_number, **kwargs):
+        calls.append((kwargs["start_date"], kwargs["page_offset"]))
+        return _weekly_page(
+            kwargs["page_offset"], has_more=True, total_items=10, total_pages=10
+        )
+
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        fetch,
+    )
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.MAX_TRANSACTION_PAGES", 2
+    )
+
+    first = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+    load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+
+    assert first.truncated is True
+    assert first.source.status.value == "partial"
+    assert len(first.groups) == 2
+    # The second sync resumes from the newest date the first one stored.
+    assert calls == [
+        ("2026-01-01", 0), ("2026-01-01", 1),
+        ("2026-01-08", 0), ("2026-01-08", 1),
+    ]
+
+
+def test_earlier_range_over_the_page_cap_is_paged_from_the_end(monkeypatch):
+    calls = []
+
+    def fetch(token, account_number, **kwargs):
+        calls.append((kwargs["start_date"], kwargs["end_date"], kwargs["page_offset"]))
+        if kwargs["start_date"] >= "2026-06-01":
+            return TastyPage(
+                items=[], page_offset=0, per_page=2000, has_more=False,
+                total_items=0, total_pages=0,
+            )
+        return _weekly_page(
+            kwargs["page_offset"], has_more=True, total_items=10, total_pages=10
+        )
+
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.tastytrade.fetch_transactions",
+        fetch,
+    )
+    monkeypatch.setattr(
+        "app.services.transaction_ledger_service.MAX_TRANSACTION_PAGES", 3
+    )
+
+    load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 6, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+    calls.clear()
+    earlier = load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+    load_open_execution_groups(
+        "TOKEN", "FAKE", date(2026, 1, 1), date(2026, 7, 10),
+        cache=InMemoryCache(),
+    )
+
+    assert earlier.truncated is True
+    # Pages 9 and 8 hold 2026-03-05 and 2026-02-26, so dates after 02-26 are stored.
+    assert calls[:3] == [
+        ("2026-01-01", "2026-06-01", 0),
+        ("2026-01-01", "2026-06-01", 9),
+        ("2026-01-01", "2026-06-01", 8),
+    ]
+    assert ("2026-01-01", "2026-02-27", 0) in calls[3:]
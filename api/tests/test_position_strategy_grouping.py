@@ -1,4 +1,15 @@
-from app.services.trades_service import group_positions_and_compute_totals
+import random
+
+import pytest
+
+from app.services.trades_service import (
+    PositionLeg,
+    _pair_unambiguous_cross_expiration_legs,
+    _position_quantity,
+    augment_positions_with_market_data,
+    extract_expiration_date,
+    group_positions_and_compute_totals,
+)
 
 
 def _leg(
@@ -108,3 +119,216 @@ def test_multiple_legs_in_one_expiration_disable_cross_expiration_inference():
     ])
 
     assert len(groups) == 2
+
+
+def test_group_and_account_totals_reduce_each_accounts_legs():
+    short_put = {
+        **_leg("AAPL P", "2026-08-21", 180, "Short", option_type="P"),
+        "average-open-price": "2.345",
+        "approximate-p-l": "40.5",
+        "market_data": {
+            "mark": "1.94",
+            "computed_position_delta": "12.4",
+            "computed_position_theta": "3.3",
+        },
+    }
+    long_call = {
+        **_leg("AAPL C", "2026-09-18", 220, "Long"),
+        "market_data": {"computed_position_delta": "30.2", "computed_delta": "0.3"},
+    }
+    accounts = [
+        {"account_number": "A", "nickname": "A", "positions": [short_put, long_call]},
+        {"account_number": "EMPTY", "nickname": "Empty", "positions": []},
+    ]
+
+    first, empty = group_positions_and_compute_totals(accounts, {"AAPL": 1.5})
+    put_group, call_group = first["groups"]
+
+    assert put_group["total_credit_received"] == 234.5
+    assert put_group["open_value_dollars"] == 234.5
+    assert put_group["current_value_dollars"] == 194.0
+    assert put_group["unrealized_pl_dollars"] == 40.5
+    assert put_group["assignment_exposure_dollars"] == 18000.0
+    assert put_group["delta_shares"] == 12.4
+    assert put_group["beta_delta_shares"] == 18.6
+    assert call_group["total_credit_received"] == -100.0
+    assert call_group["total_delta"] == 0.3
+    assert first["delta_shares"] == 42.6
+    assert first["theta_dollars_per_day"] == 3.3
+    assert first["total_position_delta"] == 42
+    assert first["total_beta_delta_shares"] == 63.9
+    assert empty["groups"] == []
+    assert empty["delta_shares"] == 0.0
+    assert empty["total_position_delta"] == 0
+
+
+def test_position_legs_update_and_emit_their_payloads_in_place():
+    short_put = _leg("AAPL  260821P00180000", "2026-08-21", 180, "Short", option_type="P")
+    long_call = _leg("AAPL  260918C00220000", "2026-09-18", 220, "Long")
+    del short_put["strike"]
+    payloads = [short_put, long_call]
+    legs = [PositionLeg.from_payload(payload) for payload in payloads]
+    accounts = [{"account_number": "A", "nickname": "A", "positions": legs}]
+    market_map = {
+        short_put["symbol"]: {"mark": "0.40", "delta": "-0.2", "theta": "0.05"},
+        long_call["symbol"]: {"mark": "1.50", "delta": "0.3"},
+    }
+
+    augment_positions_with_market_data(accounts, market_map, {})
+
+    assert legs[0].payload is short_put
+    assert legs[0].mark == 0.4
+    assert legs[0].strike == short_put["strike"] == 180.0
+    assert short_put["approximate-p-l"] == 60.0
+    assert short_put["unrealized-pl-dollars"] == 60.0
+    assert legs[1].p_l == long_call["approximate-p-l"] == 50.0
+
+    from_legs = group_positions_and_compute_totals(accounts, {})
+    from_dicts = group_positions_and_compute_totals(
+        [{**accounts[0], "positions": payloads}], {}
+    )
+
+    assert from_legs == from_dicts
+    assert from_legs[0]["groups"][0]["positions"][0] is short_put
+    assert from_legs[0]["groups"][0]["assignment_exposure_dollars"] == 18000.0
+
+
+def test_shared_symbol_legs_get_their_own_computed_market_data():
+    symbol = "AAPL  260821C00200000"
+    missing_basis = _leg(symbol, "2026-08-21", 200, "Short")
+    del missing_basis["average-open-price"]
+    long_call = PositionLeg.from_payload(_leg(symbol, "2026-08-21", 200, "Long"))
+    short_call = PositionLeg.from_payload(missing_basis)
+    quote = {"symbol": symbol, "mark": "1.5", "delta": "0.4"}
+    accounts = [
+        {"account_number": "A", "nickname": "A", "positions": [long_call]},
+        {"account_number": "B", "nickname": "B", "positions": [short_call]},
+    ]
+
+    augment_positions_with_market_data(accounts, {symbol: quote}, {})
+
+    assert long_call.payload["market_data"] is quote
+    assert quote["computed_delta"] == 0.4
+    assert short_call.payload["market_data"]["computed_delta"] == -0.4
+    assert long_call.p_l == 50.0
+    # An absent average-open price counts as a zero basis.
+    assert short_call.p_l == -150.0
+
+
+def _pairwise_pairing(positions: list[dict], *, same_strike: bool) -> list[tuple[int, int]]:
+    """The original all-pairs pairing rules, kept as a reference."""
+    expirations = [
+        extract_expiration_date(position.get("expires-at", ""))
+        for position in positions
+    ]
+    eligible = {
+        index
+        for index, expiration in enumerate(expirations)
+        if expirations.count(expiration) == 1
+    }
+
+    def candidate(left: dict, right: dict) -> bool:
+        if (
+            left.get("instrument-type") != "Equity Option"
+            or right.get("instrument-type") != "Equity Option"
+            or left.get("option-type") not in {"C", "P"}
+            or left.get("option-type") != right.get("option-type")
+            or left.get("quantity-direction") == right.get("quantity-direction")
+            or extract_expiration_date(left.get("expires-at", ""))
+            == extract_expiration_date(right.get("expires-at", ""))
+            or _position_quantity(left) != _position_quantity(right)
+        ):
+            return False
+        return (left.get("strike") == right.get("strike")) == same_strike
+
+    candidates = {
+        left_index: [
+            right_index
+            for right_index, right in enumerate(positions)
+            if left_index in eligible
+            and right_index in eligible
+            and candidate(left, right)
+        ]
+        for left_index, left in enumerate(positions)
+    }
+    paired: set[int] = set()
+    pairs = []
+    for left_index, matches in candidates.items():
+        if left_index in paired or len(matches) != 1:
+            continue
+        right_index = matches[0]
+        if right_index in paired or candidates[right_index] != [left_index]:
+            continue
+        paired.update({left_index, right_index})
+        pairs.append((left_index, right_index))
+    return pairs
+
+
+_FIXTURE_BOOKS = [
+    [
+        _leg("AAPL FRONT", "2026-08-21", 200, "Short"),
+        _leg("AAPL BACK", "2026-09-18", 200, "Long"),
+    ],
+    [
+        _leg("AAPL FRONT", "2026-08-21", 205, "Short"),
+        _leg("AAPL BACK", "2026-09-18", 200, "Long"),
+    ],
+    [
+        _leg("AAPL SHORT ONE", "2026-08-21", 205, "Short"),
+        _leg("AAPL SHORT TWO", "2026-08-21", 210, "Short"),
+        _leg("AAPL LONG", "2026-09-18", 200, "Long"),
+    ],
+    [
+        _leg("AAPL AUG LP", "2026-08-21", 190, "Long", option_type="P"),
+        _leg("AAPL AUG SP", "2026-08-21", 195, "Short", option_type="P"),
+        _leg("AAPL AUG SC", "2026-08-21", 205, "Short"),
+        _leg("AAPL AUG LC", "2026-08-21", 210, "Long"),
+        _leg("AAPL SEP LP", "2026-09-18", 185, "Long", option_type="P"),
+        _leg("AAPL SEP SP", "2026-09-18", 190, "Short", option_type="P"),
+        _leg("AAPL SEP SC", "2026-09-18", 210, "Short"),
+        _leg("AAPL SEP LC", "2026-09-18", 215, "Long"),
+    ],
+    [
+        _leg("AAPL AUG SHORT", "2026-08-21", 200, "Short"),
+        _leg("AAPL AUG LONG", "2026-08-21", 210, "Long"),
+        _leg("AAPL SEP LONG", "2026-09-18", 200, "Long"),
+    ],
+]
+
+
+def _random_book(rng: random.Random) -> list[dict]:
+    book = []
+    for index in range(rng.randint(0, 14)):
+        leg = _leg(
+            f"SPX {index}",
+            f"2026-{rng.randint(8, 12):02d}-{rng.randint(1, 28):02d}",
+            rng.choice([5000, 5050, 5100]),
+            rng.choice(["Long", "Short", "Short"]),
+            option_type=rng.choice(["C", "P", "C"]),
+        )
+        leg["quantity"] = rng.choice(["1", "1", "2"])
+        if rng.random() < 0.1:
+            leg["instrument-type"] = "Equity"
+        book.append(leg)
+    return book
+
+
+@pytest.mark.parametrize("same_strike", [True, False])
+def test_indexed_pairing_matches_pairwise_rules(same_strike):
+    rng = random.Random(22)
+    books = _FIXTURE_BOOKS + [_random_book(rng) for _ in range(300)]
+
+    for book in books:
+        expected = _pairwise_pairing(book, same_strike=same_strike)
+        groups, remaining = _pair_unambiguous_cross_expiration_legs(
+            book,
+            same_strike=same_strike,
+        )
+
+        assert [
+            (book.index(left), book.index(right)) for left, right in groups
+        ] == expected
+        paired = {index for pair in expected for index in pair}
+        assert remaining == [
+            leg for index, leg in enumerate(book) if index not in paired
+        ]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.services.positions_snapshot_service import PositionsSnapshotCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_rebuild():
+    cache = PositionsSnapshotCache(ttl_seconds=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"account_number": "123"}]
+
+    snapshots = await asyncio.gather(*(cache.get(loader) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert {snapshot.version for snapshot in snapshots} == {1}
+    assert snapshots[0].accounts_data == [{"account_number": "123"}]
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshot_rebuilds_and_failures_are_not_cached():
+    cache = PositionsSnapshotCache(ttl_seconds=0)
+    results = iter([RuntimeError("broker offline"), [{"account_number": "123"}]])
+
+    async def loader():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with pytest.raises(RuntimeError, match="broker offline"):
+        await cache.get(loader)
+    snapshot = await cache.get(loader)
+
+    assert snapshot.version == 1
+    assert cache.peek() is None
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from app.services import quote_cache_service
+from app.services.cache_service import InMemoryCache
+from app.services.quote_cache_service import (
+    fetch_market_data_cached,
+    fetch_volatility_data_cached,
+)
+
+
+def test_market_data_partial_hit_requests_only_missing_symbols(monkeypatch):
+    cache = InMemoryCache()
+    requests = []
+
+    def fetch_market_data(token, equity, equity_option, future, future_option):
+        requests.append((equity, equity_option, future, future_option))
+        return [
+            {"symbol": symbol, "mark": "1"}
+            for symbol in equity + equity_option + future + future_option
+        ]
+
+    monkeypatch.setattr(
+        quote_cache_service.tastytrade, "fetch_market_data", fetch_market_data
+    )
+
+    first = fetch_market_data_cached("FAKE", ["SPY"], [], ["/ESZ6"], [], cache=cache)
+    second = fetch_market_data_cached(
+        "FAKE", ["QQQ", "SPY"], [], ["/ESZ6"], [], cache=cache
+    )
+
+    assert requests == [(["SPY"], [], ["/ESZ6"], []), (["QQQ"], [], [], [])]
+    assert [item.symbol for item in second] == ["QQQ", "SPY", "/ESZ6"]
+    assert second[1] is first[0]
+    as_of = {item.symbol: item.to_tasty_dict()["as-of"] for item in second}
+    assert as_of["SPY"] == as_of["/ESZ6"]
+    assert datetime.fromisoformat(as_of["QQQ"]) >= datetime.fromisoformat(as_of["SPY"])
+
+
+def test_volatility_full_hit_skips_broker_until_expired(monkeypatch):
+    cache = InMemoryCache()
+    requests = []
+
+    def fetch_volatility_data(token, symbols):
+        requests.append(symbols)
+        return [{"symbol": symbol, "implied-volatility-index-rank": "0.2"} for symbol in symbols]
+
+    monkeypatch.setattr(
+        quote_cache_service.tastytrade, "fetch_volatility_data", fetch_volatility_data
+    )
+
+    fetch_volatility_data_cached("FAKE", ["SPY", "SPY", "QQQ"], cache=cache)
+    cached = fetch_volatility_data_cached("FAKE", ["QQQ"], cache=cache)
+    cache._cache["metrics:QQQ"].timestamp -= 301
+    fetch_volatility_data_cached("FAKE", ["QQQ", "SPY"], ttl=300, cache=cache)
+
+    assert requests == [["SPY", "QQQ"], ["QQQ"]]
+    assert [item.symbol for item in cached] == ["QQQ"]
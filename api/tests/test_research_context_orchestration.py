@@ -1,5 +1,9 @@
+import threading
 from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
 
+import pytest
+import requests
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
@@ -207,7 +211,7 @@ def test_batch_context_survives_persistence_failure(monkeypatch):
 
     monkeypatch.setattr(
         orchestration,
-        "upsert_research_metric",
+        "upsert_research_metrics",
         fail_persistence,
     )
 
@@ -226,3 +230,129 @@ def test_batch_context_survives_persistence_failure(monkeypatch):
     ]
     assert context.items[0].price.mark == 110.0
     assert "private database detail" not in str(context.model_dump())
+
+
+def test_sources_are_fetched_concurrently_with_isolated_failures(monkeypatch):
+    # Watchlists, two market batches, two volatility batches and holdings.
+    barrier = threading.Barrier(6, timeout=5)
+
+    def watchlists(token):
+        barrier.wait()
+        return []
+
+    def market_data(token, equity, equity_option, future, future_option):
+        barrier.wait()
+        return [TastyMarketData(symbol=equity[0], mark="110", close="108")]
+
+    def volatility(token, symbols):
+        barrier.wait()
+        raise RuntimeError("metrics offline")
+
+    def holdings(token, fetched_at):
+        barrier.wait()
+        return empty_holdings()
+
+    monkeypatch.setattr(tastytrade, "fetch_watchlists", watchlists)
+    monkeypatch.setattr(tastytrade, "fetch_market_data", market_data)
+    monkeypatch.setattr(tastytrade, "fetch_volatility_data", volatility)
+    monkeypatch.setattr(orchestration, "fetch_holding_snapshot", holdings)
+    symbols = [f"S{index:03d}" for index in range(150)]
+
+    with session() as db:
+        context = orchestration.fetch_research_symbol_context(
+            db,
+            "Bearer FAKE",
+            symbols,
+            fetched_at=FETCHED_AT,
+        )
+
+    statuses = {
+        source.endpoint: source.status for source in context.source_status
+    }
+    assert statuses["/market-metrics"] == DataStatus.UNAVAILABLE
+    assert statuses["/market-data/by-type"] != DataStatus.UNAVAILABLE
+    assert statuses["/watchlists"] != DataStatus.UNAVAILABLE
+    assert context.items[100].price.mark == 110
+
+
+def test_failed_batch_only_drops_its_own_symbols(monkeypatch):
+    monkeypatch.setattr(tastytrade, "fetch_watchlists", lambda token: [])
+
+    def market_data(token, equity, equity_option, future, future_option):
+        if "S000" in equity:
+            raise RuntimeError("throttled")
+        return [
+            TastyMarketData(symbol=symbol, mark="110", close="108")
+            for symbol in equity
+        ]
+
+    monkeypatch.setattr(tastytrade, "fetch_market_data", market_data)
+    monkeypatch.setattr(tastytrade, "fetch_volatility_data", lambda token, symbols: [])
+    monkeypatch.setattr(
+        orchestration,
+        "fetch_holding_snapshot",
+        lambda token, fetched_at: empty_holdings(),
+    )
+    symbols = [f"S{index:03d}" for index in range(150)]
+
+    with session() as db:
+        context = orchestration.fetch_research_symbol_context(
+            db,
+            "Bearer FAKE",
+            symbols,
+            fetched_at=FETCHED_AT,
+        )
+
+    statuses = {
+        source.endpoint: source.status for source in context.source_status
+    }
+    assert statuses["/market-data/by-type"] == DataStatus.PARTIAL
+    assert context.items[0].price.mark is None
+    assert context.items[100].price.mark == 110
+
+
+def test_oversized_batches_are_split_and_shrink_later_batches():
+    response = SimpleNamespace(status_code=414)
+    calls = []
+
+    def fetch(batch):
+        calls.append(len(batch))
+        if len(batch) > 2:
+            raise requests.HTTPError("414 Error", response=response)
+        return batch
+
+    sizer = orchestration._BatchSizer(8)
+
+    assert orchestration._fetch_batch(fetch, list("abcdefgh"), sizer) == list("abcdefgh")
+    assert calls == [8, 4, 2, 2, 4, 2, 2]
+    assert 2 <= sizer.size < 8
+
+    def fail(batch):
+        calls.append(len(batch))
+        raise RuntimeError("auth")
+
+    calls.clear()
+    with pytest.raises(RuntimeError):
+        orchestration._fetch_batch(fail, list("abcd"), sizer)
+    assert calls == [4]
+
+
+def test_slow_batches_shrink_and_fast_batches_grow_the_batch_size():
+    sizer = orchestration._BatchSizer(100)
+
+    sizer.record(100, elapsed=6, slow_seconds=5)
+    assert sizer.size == 50
+    sizer.record(50, elapsed=1, slow_seconds=5)
+    assert sizer.size == 60
+
+
+def test_batches_respect_query_length():
+    symbols = [f"SYM{index}" for index in range(10)]
+
+    batches = list(orchestration._batches(symbols, 100, max_chars=20))
+
+    assert [",".join(batch) for batch in batches] == [
+        "SYM0,SYM1,SYM2,SYM3",
+        "SYM4,SYM5,SYM6,SYM7",
+        "SYM8,SYM9",
+    ]
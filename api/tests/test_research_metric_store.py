@@ -6,8 +6,10 @@ from sqlalchemy.orm import Session
 from app.models import Base, ResearchMetricSnapshotORM
 from app.schemas.brokerage import ResearchMetricObservationV1
 from app.services.research_metric_store import (
+    list_recent_research_metrics,
     list_research_metric_history,
     upsert_research_metric,
+    upsert_research_metrics,
 )
 
 
@@ -125,3 +127,54 @@ def test_partial_same_day_refresh_does_not_erase_existing_values():
 
         assert updated.mark == 210.25
         assert updated.iv_rank_percent == 47.5
+
+
+def test_bulk_upsert_matches_single_row_semantics():
+    with session() as db:
+        upsert_research_metrics(
+            db,
+            [
+                observation(date(2026, 7, 15), iv_rank_percent=42.0),
+                observation(date(2026, 7, 15), symbol="msft"),
+            ],
+        )
+        partial = observation(date(2026, 7, 15), iv_rank_percent=47.5)
+        partial = partial.model_copy(update={"mark": None})
+
+        written = upsert_research_metrics(db, [partial])
+        history = list_research_metric_history(db, "AAPL")
+        count = db.scalar(
+            select(func.count()).select_from(ResearchMetricSnapshotORM)
+        )
+
+        assert written == 1
+        assert count == 2
+        assert history[0].mark == 210.25
+        assert history[0].iv_rank_percent == 47.5
+
+
+def test_recent_metrics_returns_latest_sessions_per_symbol():
+    with session() as db:
+        upsert_research_metrics(
+            db,
+            [
+                observation(date(2026, 7, day), symbol=symbol)
+                for day in range(6, 17)
+                for symbol in ("AAPL", "MSFT")
+            ],
+        )
+
+        recent = list_recent_research_metrics(
+            db,
+            ["aapl", "MSFT", "NVDA"],
+            end_date=date(2026, 7, 15),
+            limit=6,
+        )
+
+        assert recent["AAPL"] == list_research_metric_history(
+            db, "AAPL", end_date=date(2026, 7, 15), limit=6
+        )
+        assert [item.observation_date.day for item in recent["MSFT"]] == [
+            10, 11, 12, 13, 14, 15,
+        ]
+        assert recent["NVDA"] == []
@@ -6,3 +6,24 @@ def test_settings_defaults():
     assert settings.tastytrade_url == "https://api.tastyworks.com"
     assert settings.tastytrade_timeout_seconds == 20
     assert settings.tastytrade_user_agent == "trade-journal/0.1"
+    assert settings.tastytrade_pool_size == 10
+    assert settings.tastytrade_keep_alive is True
+    assert settings.tastytrade_token_refresh_lead_seconds == 60
+    assert settings.positions_snapshot_ttl_seconds == 15
+    assert settings.cache_max_entries == 512
+    assert settings.cache_max_bytes == 64 * 1024 * 1024
+    assert settings.activity_inbox_fetch_workers == 8
+    assert settings.activity_inbox_prefetch_pages is True
+    assert settings.research_context_fetch_workers == 6
+    assert settings.research_context_batch_size == 100
+    assert settings.research_context_batch_max_chars == 1500
+    assert settings.research_context_batch_slow_seconds == 5
+    assert settings.activity_chart_fetch_workers == 4
+    assert settings.activity_chart_fetch_timeout_seconds == 10
+    assert settings.activity_chart_fetch_deadline_seconds == 20
+    assert settings.quote_cache_ttl_seconds == 5
+    assert settings.tastytrade_rate_limit_per_second == 10
+    assert settings.tastytrade_rate_limit_burst == 20
+    assert settings.tastytrade_max_retries == 3
+    assert settings.tastytrade_retry_backoff_seconds == 0.5
+    assert settings.volatility_cache_ttl_seconds == 300
@@ -1,91 +1,324 @@
-from app import tastytrade
-from app.settings import settings
-
-
-class FakeResponse:
-    def __init__(self, payload):
-        self.payload = payload
-
-    def raise_for_status(self):
-        return None
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
-    def json(self):
-        return self.payload
+import pytest
+import requests
 
+from app import tastytrade
+from app.settings import settings
+from tests.conftest import FixtureResponse
 
-def test_request_json_uses_base_url_and_timeout(monkeypatch):
-    captured = {}
-
-    def fake_request(method, url, **kwargs):
-        captured["method"] = method
-        captured["url"] = url
-        captured["kwargs"] = kwargs
-        return FakeResponse({"data": {"items": []}})
 
-    monkeypatch.setattr(tastytrade.requests, "request", fake_request)
+def test_request_json_uses_base_url_and_timeout(tastytrade_session):
+    tastytrade_session.responses["/customers/me/accounts"] = {"data": {"items": []}}
 
     tastytrade._request_json("GET", "/customers/me/accounts", headers={"Accept": "application/json"})
 
-    assert captured["method"] == "GET"
-    assert captured["url"] == f"{tastytrade.BASE_URL}/customers/me/accounts"
-    assert captured["kwargs"]["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
+    call = tastytrade_session.calls[0]
+    assert call.method == "GET"
+    assert call.url == f"{tastytrade.BASE_URL}/customers/me/accounts"
+    assert call.kwargs["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
     assert tastytrade.REQUEST_TIMEOUT_SECONDS == settings.tastytrade_timeout_seconds
-    assert captured["kwargs"]["headers"] == {"Accept": "application/json"}
-
-
-def test_fetch_market_data_uses_shared_request_helper(monkeypatch):
-    captured = {}
+    assert call.kwargs["headers"] == {"Accept": "application/json"}
 
-    def fake_request(method, url, **kwargs):
-        captured["method"] = method
-        captured["url"] = url
-        captured["kwargs"] = kwargs
-        return FakeResponse({
-            "data": {
-                "items": [
-                    {
-                        "symbol": "SPY",
-                        "mark": "500",
-                    }
-                ]
-            }
-        })
 
-    monkeypatch.setattr(tastytrade.requests, "request", fake_request)
+def test_fetch_market_data_uses_shared_request_helper(tastytrade_session):
+    tastytrade_session.responses["/market-data/by-type"] = {
+        "data": {"items": [{"symbol": "SPY", "mark": "500"}]}
+    }
 
     items = tastytrade.fetch_market_data("Bearer TOKEN", ["SPY"], [], [], [])
 
+    call = tastytrade_session.calls[0]
     assert items[0].symbol == "SPY"
-    assert captured["method"] == "GET"
-    assert captured["url"].endswith("/market-data/by-type")
-    assert captured["kwargs"]["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
-    assert captured["kwargs"]["headers"]["Authorization"] == "Bearer TOKEN"
-    assert captured["kwargs"]["headers"]["User-Agent"] == settings.tastytrade_user_agent
-    assert captured["kwargs"]["params"]["equity"] == "SPY"
-
-
-def test_login_uses_form_content_type_and_timeout(monkeypatch):
-    captured = {}
-
-    def fake_request(method, url, **kwargs):
-        captured["method"] = method
-        captured["url"] = url
-        captured["kwargs"] = kwargs
-        return FakeResponse({
-            "access_token": "ACCESS",
-            "token_type": "Bearer",
-            "expires_in": "3600",
-        })
+    assert call.method == "GET"
+    assert call.url.endswith("/market-data/by-type")
+    assert call.kwargs["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
+    assert call.kwargs["headers"]["Authorization"] == "Bearer TOKEN"
+    assert call.kwargs["headers"]["User-Agent"] == settings.tastytrade_user_agent
+    assert call.kwargs["params"]["equity"] == "SPY"
 
+
+def test_login_uses_form_content_type_and_timeout(monkeypatch, tastytrade_session):
+    tastytrade_session.responses["/oauth/token"] = {
+        "access_token": "ACCESS",
+        "token_type": "Bearer",
+        "expires_in": "3600",
+    }
     monkeypatch.setenv("TASTYTRADE_SECRET", "SECRET")
     monkeypatch.setenv("TASTYTRADE_REFRESH", "REFRESH")
-    monkeypatch.setattr(tastytrade.requests, "request", fake_request)
 
     token, _ = tastytrade.login_to_tastytrade()
 
+    call = tastytrade_session.calls[0]
     assert token == "Bearer ACCESS"
-    assert captured["method"] == "POST"
-    assert captured["url"].endswith("/oauth/token")
-    assert captured["kwargs"]["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
-    assert captured["kwargs"]["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
-    assert captured["kwargs"]["data"]["grant_type"] == "refresh_token"
+    assert call.method == "POST"
+    assert call.url.endswith("/oauth/token")
+    assert call.kwargs["timeout"] == tastytrade.REQUEST_TIMEOUT_SECONDS
+    assert call.kwargs["headers"]["Content-Type"] == "application/x-www-form-urlencoded"
+    assert call.kwargs["data"]["grant_type"] == "refresh_token"
+
+
+def test_default_client_mounts_one_pooled_keep_alive_session():
+    client = tastytrade.TastytradeClient(pool_size=4)
+
+    adapter = client.session.get_adapter(tastytrade.BASE_URL)
+
+    assert isinstance(client.session, requests.Session)
+    assert adapter._pool_maxsize == 4
+    assert client.session.headers["Connection"] == "keep-alive"
+    assert (
+        tastytrade.TastytradeClient(keep_alive=False).session.headers["Connection"]
+        == "close"
+    )
+
+
+def test_fixtures_drive_shared_client_across_fetch_functions(tastytrade_session):
+    tastytrade_session.responses.update({
+        "/customers/me/accounts": "accounts.json",
+        "/accounts/SIM123/positions": "positions_SIM123.json",
+        "/accounts/SIM123/balances": "balance_SIM123.json",
+    })
+
+    accounts = tastytrade.fetch_accounts("Bearer FAKE")
+    positions = tastytrade.fetch_positions("Bearer FAKE", accounts[0].account_number)
+    balance = tastytrade.fetch_account_balance("Bearer FAKE", "SIM123")
+
+    assert tastytrade.get_client().session is tastytrade_session
+    assert accounts[0].account_number == "SIM123"
+    assert positions[0].instrument_type == "Equity Option"
+    assert balance.margin_equity == "10000"
+    assert [call.path for call in tastytrade_session.calls] == [
+        "/customers/me/accounts",
+        "/accounts/SIM123/positions",
+        "/accounts/SIM123/balances",
+    ]
+
+
+def test_latency_counters_group_requests_per_endpoint(tastytrade_session):
+    tastytrade_session.responses.update({
+        "/accounts/SIM123/positions": "positions_SIM123.json",
+        "/accounts/OTHER/positions": FixtureResponse({}, status_code=503),
+    })
+
+    tastytrade.fetch_positions("Bearer FAKE", "SIM123")
+    with pytest.raises(requests.HTTPError):
+        tastytrade.fetch_positions("Bearer FAKE", "OTHER")
+
+    stats = tastytrade.get_client().latency_stats()
+    positions = stats["GET /accounts/{account_number}/positions"]
+    assert list(stats) == ["GET /accounts/{account_number}/positions"]
+    # The 503 is retried, and every attempt is counted.
+    assert positions["calls"] == 2 + settings.tastytrade_max_retries
+    assert positions["errors"] == 1 + settings.tastytrade_max_retries
+    assert positions["max_seconds"] >= positions["last_seconds"] >= 0
+
+
+class SequenceSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(method)
+        return self.responses.pop(0)
+
+
+def _fake_clock_client(session, endpoint, **kwargs):
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    client = tastytrade.TastytradeClient(session=session, sleep=sleep, **kwargs)
+    bucket = client._bucket(endpoint)
+    bucket._clock = lambda: now[0]
+    bucket._updated = now[0]
+    return client, sleeps
+
+
+def test_429_is_retried_after_retry_after():
+    session = SequenceSession(
+        FixtureResponse({}, status_code=429, headers={"Retry-After": "2"}),
+        FixtureResponse({"data": {"items": [{"symbol": "SPY"}]}}),
+    )
+    client, sleeps = _fake_clock_client(session, "GET /market-data/by-type")
+
+    items = client.fetch_market_data("Bearer FAKE", ["SPY"], [], [], [])
+
+    assert [item.symbol for item in items] == ["SPY"]
+    assert session.calls == ["GET", "GET"]
+    assert sleeps == [2]
+
+
+def test_server_errors_back_off_with_jitter_for_reads_only(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(tastytrade.random, "uniform", lambda low, high: high)
+    session = SequenceSession(
+        FixtureResponse({}, status_code=503),
+        FixtureResponse({}, status_code=502),
+        FixtureResponse({"data": {"items": []}}),
+        FixtureResponse({}, status_code=503),
+    )
+    client = tastytrade.TastytradeClient(
+        session=session,
+        retry_backoff_seconds=0.5,
+        sleep=sleeps.append,
+    )
+
+    assert client.fetch_watchlists("Bearer FAKE") == []
+    with pytest.raises(requests.HTTPError):
+        client.place_complex_order("Bearer FAKE", "SIM123", {})
+
+    assert sleeps == [0.5, 1.0]
+    assert session.calls == ["GET", "GET", "GET", "POST"]
+
+
+def test_retries_stop_after_max_retries():
+    session = SequenceSession(*[FixtureResponse({}, status_code=429)] * 3)
+    client = tastytrade.TastytradeClient(
+        session=session,
+        max_retries=2,
+        sleep=lambda seconds: None,
+    )
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_watchlists("Bearer FAKE")
+
+    assert len(session.calls) == 3
+
+
+def test_token_bucket_limits_each_endpoint_separately():
+    session = SequenceSession(*[FixtureResponse({"data": {"items": []}})] * 4)
+    client, sleeps = _fake_clock_client(
+        session,
+        "GET /market-metrics",
+        rate_limit=(1000, 1000),
+        rate_limits={"GET /market-metrics": (2, 1)},
+    )
+
+    for _ in range(3):
+        client.fetch_volatility_data("Bearer FAKE", ["SPY"])
+    client.fetch_watchlists("Bearer FAKE")
+
+    assert sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_pause_holds_back_every_caller():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = tastytrade.TokenBucket(100, 10, clock=lambda: now[0], sleep=sleep)
+    bucket.pause(3)
+    bucket.acquire()
+
+    assert sleeps == [3]
+
+
+@pytest.mark.asyncio
+async def test_async_surface_runs_on_dedicated_broker_workers(monkeypatch):
+    threads = []
+
+    def fake_positions(token, account_number):
+        threads.append(threading.current_thread().name)
+        return [account_number]
+
+    monkeypatch.setattr(tastytrade, "fetch_positions", fake_positions)
+
+    results = await asyncio.gather(
+        tastytrade.fetch_positions_async("Bearer FAKE", "SIM123"),
+        tastytrade.fetch_positions_async("Bearer FAKE", "SIM456"),
+    )
+
+    assert results == [["SIM123"], ["SIM456"]]
+    assert all(name.startswith("tastytrade") for name in threads)
+    tastytrade.close_client()
+    assert tastytrade._async_executor is None
+
+
+def _fake_login(calls, *, delay=0.0, lifetime=timedelta(hours=1)):
+    def login():
+        calls.append(threading.current_thread().name)
+        time.sleep(delay)
+        return f"Bearer TOKEN-{len(calls)}", datetime.now(timezone.utc) + lifetime
+
+    return login
+
+
+def test_token_manager_single_flights_concurrent_logins(monkeypatch):
+    calls = []
+    saved = []
+    monkeypatch.setattr(tastytrade, "login_to_tastytrade", _fake_login(calls, delay=0.05))
+    monkeypatch.setattr(tastytrade.crud, "get_session_token", lambda db: None)
+    monkeypatch.setattr(
+        tastytrade.crud, "save_session_token", lambda db, token, exp: saved.append(token)
+    )
+    manager = tastytrade.TokenManager(refresh_lead_seconds=3600)
+    tokens = []
+
+    threads = [
+        threading.Thread(target=lambda: tokens.append(manager.get_token(db=object())))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert saved == ["Bearer TOKEN-1"]
+    assert tokens == ["Bearer TOKEN-1"] * 5
+
+
+def test_token_manager_serves_memory_then_falls_back_to_stored_row(monkeypatch):
+    lookups = []
+    stored = SimpleNamespace(
+        token="Bearer STORED",
+        expiration=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1),
+    )
+
+    def get_session_token(db):
+        lookups.append(db)
+        return stored
+
+    monkeypatch.setattr(tastytrade.crud, "get_session_token", get_session_token)
+    monkeypatch.setattr(tastytrade, "login_to_tastytrade", _fake_login([]))
+    manager = tastytrade.TokenManager(refresh_lead_seconds=3600)
+
+    assert manager.get_token(db="db") == "Bearer STORED"
+    assert manager.get_token(db="db") == "Bearer STORED"
+    assert lookups == ["db"]
+
+
+def test_token_manager_refreshes_in_background_before_expiry(monkeypatch):
+    calls = []
+    saved = []
+    refreshed = threading.Event()
+
+    def save_session_token(db, token, exp):
+        saved.append((db, token))
+        if len(saved) == 2:
+            refreshed.set()
+
+    monkeypatch.setattr(
+        tastytrade, "login_to_tastytrade", _fake_login(calls, lifetime=timedelta(seconds=60.05))
+    )
+    monkeypatch.setattr(tastytrade.crud, "get_session_token", lambda db: None)
+    monkeypatch.setattr(tastytrade.crud, "save_session_token", save_session_token)
+    session = SimpleNamespace(close=lambda: None)
+    manager = tastytrade.TokenManager(session_factory=lambda: session, refresh_lead_seconds=60)
+
+    assert manager.get_token(db="db") == "Bearer TOKEN-1"
+    assert refreshed.wait(timeout=2)
+    assert saved[1] == (session, "Bearer TOKEN-2")
+    assert manager.get_token() == "Bearer TOKEN-2"
+    manager.clear()
@@ -1,6 +1,9 @@
 import json
+import threading
 from pathlib import Path
 
+import pytest
+
 from app.schemas.trades import LlmPositionsSummaryResponse, MarketDataSummaryResponse
 from app.services import trades_service
 from app.services.trades_service import (
@@ -13,7 +16,9 @@ from app.services.trades_service import (
     fetch_accounts,
     fetch_market_and_beta_data,
     group_positions_and_compute_totals,
+    load_positions_data_async,
 )
+from app.services.trades_errors import TastytradeFetchError
 from app.tastytrade_schema import (
     TastyAccount,
     TastyAccountBalance,
@@ -131,3 +136,133 @@ def test_llm_positions_summary_from_sanitized_tastytrade_fixtures(monkeypatch):
     assert account.groups[0].strategy.label == "jade_lizard"
     assert any(strategy.label == "calendar" for strategy in account.underlying_strategies)
     assert any(group.iv_rank_percent == 19.1 for group in account.groups)
+
+
+def _patch_fixture_broker(monkeypatch, account_numbers, fetch_positions=None):
+    positions = [
+        TastyPosition.model_validate(item)
+        for item in fixture_items("positions_SIM123.json")
+    ]
+    market_data = [
+        TastyMarketData.model_validate(item)
+        for item in fixture_items("market_data.json")
+    ]
+    volatility = [
+        TastyVolatilityMetric.model_validate(item)
+        for item in fixture_items("volatility.json")
+    ]
+    balance = TastyAccountBalance.model_validate(load_fixture("balance_SIM123.json")["data"])
+    volatility_calls = []
+
+    def fetch_volatility(token, symbols):
+        volatility_calls.append(symbols)
+        return volatility
+
+    monkeypatch.setattr(
+        trades_service.tastytrade,
+        "fetch_positions",
+        fetch_positions or (lambda token, account: positions),
+    )
+    monkeypatch.setattr(trades_service.tastytrade, "fetch_market_data", lambda *args: market_data)
+    monkeypatch.setattr(trades_service.tastytrade, "fetch_volatility_data", fetch_volatility)
+    monkeypatch.setattr(trades_service.tastytrade, "fetch_account_balance", lambda *args: balance)
+    accounts = [
+        {"account_number": number, "nickname": number}
+        for number in account_numbers
+    ]
+    return accounts, positions, volatility_calls
+
+
+@pytest.mark.asyncio
+async def test_positions_pipeline_fans_out_accounts_and_merges_volatility(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    positions = [
+        TastyPosition.model_validate(item)
+        for item in fixture_items("positions_SIM123.json")
+    ]
+
+    def fetch_positions(token, account):
+        barrier.wait()
+        return positions
+
+    accounts, _, volatility_calls = _patch_fixture_broker(
+        monkeypatch, ["SIM123", "SIM456"], fetch_positions
+    )
+
+    accounts_data = await load_positions_data_async("FAKE", accounts)
+
+    assert [acct["account_number"] for acct in accounts_data] == ["SIM123", "SIM456"]
+    assert len(volatility_calls) == 1
+    assert volatility_calls[0] == sorted(set(volatility_calls[0]))
+    assert all(acct["balance_status"] != "unavailable" for acct in accounts_data)
+    assert any(
+        group["iv_rank"] == 19.1
+        for acct in accounts_data
+        for group in acct["groups"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_positions_pipeline_matches_sequential_stages(monkeypatch):
+    accounts, _, volatility_calls = _patch_fixture_broker(monkeypatch, ["SIM123", "SIM456"])
+
+    awaited = await load_positions_data_async("FAKE", accounts)
+    (
+        positions_by_account,
+        equity_option_syms,
+        future_option_syms,
+        equity_underlyings,
+        future_underlyings,
+    ) = collect_positions_and_symbols("FAKE", accounts)
+    market_map, beta_map = fetch_market_and_beta_data(
+        "FAKE",
+        equity_option_syms,
+        future_option_syms,
+        equity_underlyings,
+        future_underlyings,
+    )
+    augment_positions_with_market_data(positions_by_account, market_map, beta_map)
+    sequential = group_positions_and_compute_totals(positions_by_account, beta_map)
+    apply_volatility("FAKE", sequential)
+    apply_balance("FAKE", sequential)
+
+    for acct in awaited + sequential:
+        acct.pop("balance_fetched_at")
+    assert awaited == sequential
+    # One batched fetch for both accounts; the sequential stages read the
+    # per-symbol cache.
+    assert volatility_calls == [["QQQ", "SPY"]]
+
+
+@pytest.mark.asyncio
+async def test_async_positions_pipeline_raises_first_failing_account_in_order(monkeypatch):
+    def fetch_positions(token, account):
+        raise RuntimeError(f"{account} offline")
+
+    accounts, _, _ = _patch_fixture_broker(
+        monkeypatch, ["SIM123", "SIM456"], fetch_positions
+    )
+
+    with pytest.raises(
+        TastytradeFetchError,
+        match="Failed to fetch positions for account SIM123: SIM123 offline",
+    ):
+        await load_positions_data_async("FAKE", accounts)
+
+
+@pytest.mark.asyncio
+async def test_async_positions_pipeline_raises_first_failing_account(monkeypatch):
+    def fetch_positions(token, account):
+        if account == "SIM123":
+            raise RuntimeError(f"{account} offline")
+        return []
+
+    accounts, _, _ = _patch_fixture_broker(
+        monkeypatch, ["SIM123", "SIM456"], fetch_positions
+    )
+
+    with pytest.raises(
+        TastytradeFetchError,
+        match="Failed to fetch positions for account SIM123",
+    ):
+        await load_positions_data_async("FAKE", accounts)
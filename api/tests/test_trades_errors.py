@@ -26,7 +26,8 @@ def test_fetch_accounts_raises_domain_exception(monkeypatch):
         trades_service.fetch_accounts("FAKE")
 
 
-def test_router_translates_trade_service_exception(monkeypatch):
+@pytest.mark.asyncio
+async def test_router_translates_trade_service_exception(monkeypatch):
     def fail(db):
         raise TastytradeFetchError("Failed to fetch accounts: bad accounts")
 
@@ -34,46 +35,49 @@ def test_router_translates_trade_service_exception(monkeypatch):
     monkeypatch.setattr(trades, "fetch_accounts", fail)
 
     with pytest.raises(HTTPException) as exc_info:
-        trades._load_positions_data(db=None)
+        await trades._load_positions_data(db=None)
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.detail == "Failed to fetch accounts: bad accounts"
 
 
-def test_router_auth_helper_returns_403(monkeypatch):
+@pytest.mark.asyncio
+async def test_router_auth_helper_returns_403(monkeypatch):
     def fail(db):
         raise RuntimeError("bad auth")
 
     monkeypatch.setattr(trades.tastytrade, "get_active_token", fail)
 
     with pytest.raises(HTTPException) as exc_info:
-        trades._get_tastytrade_token_or_403(db=None)
+        await trades._get_tastytrade_token_or_403(db=None)
 
     assert exc_info.value.status_code == 403
     assert exc_info.value.detail == "Authentication to Tastytrade failed: bad auth"
 
 
-def test_router_market_data_helper_returns_500(monkeypatch):
+@pytest.mark.asyncio
+async def test_router_market_data_helper_returns_500(monkeypatch):
     def fail(*args):
         raise RuntimeError("bad market data")
 
     monkeypatch.setattr(trades.tastytrade, "fetch_market_data", fail)
 
     with pytest.raises(HTTPException) as exc_info:
-        trades._fetch_market_data_or_500("FAKE", [], [], [], [])
+        await trades._fetch_market_data_or_500("FAKE", ["SPY"], [], [], [])
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.detail == "Failed to fetch market data: bad market data"
 
 
-def test_router_volatility_helper_returns_500(monkeypatch):
+@pytest.mark.asyncio
+async def test_router_volatility_helper_returns_500(monkeypatch):
     def fail(*args):
         raise RuntimeError("bad volatility")
 
     monkeypatch.setattr(trades.tastytrade, "fetch_volatility_data", fail)
 
     with pytest.raises(HTTPException) as exc_info:
-        trades._fetch_volatility_data_or_500("FAKE", ["SPY"])
+        await trades._fetch_volatility_data_or_500("FAKE", ["SPY"])
 
     assert exc_info.value.status_code == 500
     assert exc_info.value.detail == "Failed to fetch volatility data: bad volatility"
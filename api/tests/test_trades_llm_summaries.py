@@ -253,6 +253,77 @@ def test_positions_summary_includes_underlying_strategy_across_expirations():
     assert strategies[0].expiration_dates == ["2026-06-19", "2026-07-17"]
 
 
+def test_positions_summary_rolls_up_underlying_legs_from_every_group():
+    def leg(expiration, strike, direction, **market_data):
+        return {
+            "symbol": f"QQQ {expiration} {strike}P",
+            "instrument-type": "Equity Option",
+            "underlying-symbol": "QQQ",
+            "expires-at": expiration,
+            "quantity": "1",
+            "quantity-direction": direction,
+            "average-open-price": "2.00",
+            "option-type": "P",
+            "strike": strike,
+            "beta": 1.5,
+            "market_data": market_data,
+        }
+
+    today = date.today()
+    near = (today + timedelta(days=10)).isoformat()
+    far = (today + timedelta(days=40)).isoformat()
+    summary = build_llm_positions_summary(
+        [
+            {
+                "account_number": "123",
+                "groups": [
+                    {
+                        "underlying_symbol": "QQQ",
+                        "positions": [
+                            leg(near, 400, "Short", mark="1.25", computed_position_delta="20.4"),
+                        ],
+                    },
+                    {"underlying_symbol": "SPY", "positions": []},
+                    {
+                        "underlying_symbol": "QQQ",
+                        "positions": [
+                            leg(far, 390, "Long", mark="0.5", computed_position_theta="-3.6"),
+                            leg(far, 380, "Short", computed_position_delta="10.3"),
+                        ],
+                    },
+                ],
+            }
+        ]
+    )
+
+    account = summary["accounts"][0]
+    (rollup,) = account["strategy_groups"]
+    assert rollup["leg_count"] == 3
+    assert rollup["expiration_dates"] == [near, far]
+    assert rollup["days_to_nearest_expiration"] == 10
+    assert rollup["net_open_credit_or_debit_dollars"] == 200.0
+    assert rollup["current_value_dollars"] == 75.0
+    assert rollup["unrealized_pl_dollars"] == -75.0
+    assert rollup["percent_credit_captured"] == -37.5
+    assert rollup["assignment_exposure_dollars"] == 78000.0
+    assert rollup["delta_shares"] == 31
+    assert rollup["theta_dollars_per_day"] == -4
+    assert rollup["beta_delta_shares"] == 46.5
+    group_legs = [
+        position
+        for group in account["groups"]
+        for position in group["positions"]
+    ]
+    assert rollup["legs"] == [
+        {
+            key: value
+            for key, value in position.items()
+            if key not in {"max_loss_dollars", "buying_power_effect_dollars"}
+        }
+        for position in group_legs
+    ]
+
+
 def test_positions_summary_exposes_management_ready_risk_fields():
     expiration = (date.today() + timedelta(days=10)).isoformat()
     summary = build_llm_positions_summary(
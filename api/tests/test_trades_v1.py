@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 
 
@@ -160,7 +162,9 @@ async def test_market_data(client, monkeypatch):
         }
     )
     assert resp.status_code == 200
-    assert resp.json() == [{"symbol": "/ESU5", "mark": "100", "close": "90"}]
+    data = resp.json()
+    assert datetime.fromisoformat(data[0].pop("as-of"))
+    assert data == [{"symbol": "/ESU5", "mark": "100", "close": "90"}]
 
 
 @pytest.mark.asyncio
@@ -199,7 +203,9 @@ async def test_market_data_summary_includes_open(client, monkeypatch):
     )
 
     assert resp.status_code == 200
-    assert resp.json()["items"][0] == {
+    item = resp.json()["items"][0]
+    assert datetime.fromisoformat(item.pop("as_of"))
+    assert item == {
         "symbol": "SPY",
         "mark": 500.25,
         "open": 501.5,
@@ -700,3 +706,50 @@ async def test_percent_used_bp(client, monkeypatch):
     assert resp.status_code == 200
     acct = resp.json()["accounts"][0]
     assert acct["percent_used_bp"] == 33
+
+
+@pytest.mark.asyncio
+async def test_positions_routes_share_snapshot_until_fresh_requested(client, monkeypatch):
+    account_calls = []
+
+    def fake_accounts(token):
+        account_calls.append(token)
+        return [{"account_number": "123", "nickname": "Main"}]
+
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.get_active_token", lambda db: "FAKE"
+    )
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.fetch_accounts", fake_accounts
+    )
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.fetch_positions",
+        lambda token, acct: [{
+            "instrument-type": "Equity Option",
+            "symbol": "SPY_C",
+            "underlying-symbol": "SPY",
+            "quantity": "1",
+            "quantity-direction": "Short",
+            "multiplier": "100",
+        }],
+    )
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.fetch_volatility_data", lambda *args: []
+    )
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.fetch_market_data", lambda *args: []
+    )
+    monkeypatch.setattr(
+        "app.routers.v1.trades.tastytrade.fetch_account_balance", lambda *args: {}
+    )
+
+    positions = await client.get("/v1/trades")
+    summary = await client.get("/v1/trades/summary")
+    fresh = await client.get("/v1/trades", params={"fresh": "true"})
+
+    assert positions.status_code == summary.status_code == fresh.status_code == 200
+    version = int(positions.headers["X-Positions-Snapshot-Version"])
+    assert int(summary.headers["X-Positions-Snapshot-Version"]) == version
+    assert float(summary.headers["X-Positions-Snapshot-Age"]) >= 0
+    assert int(fresh.headers["X-Positions-Snapshot-Version"]) == version + 1
+    assert account_calls == ["FAKE", "FAKE"]
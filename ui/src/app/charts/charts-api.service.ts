@@ -3,6 +3,8 @@ import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { environment } from '../../environments/environment';
 import {
+  ChartBatchResponse,
+  ChartColumnsResponse,
   ChartResponse,
   ChartParams,
   EquityAnalysisPackage,
@@ -18,6 +20,32 @@ export class ChartsApiService {
   constructor(private http: HttpClient) {}
 
   getHistory(params: ChartParams): Observable<ChartResponse> {
+    return this.http.get<ChartResponse>(
+      `${this.chartsBase}/history/${params.symbol}`,
+      { params: this.historyParams(params) }
+    );
+  }
+
+  getHistoryColumns(params: ChartParams): Observable<ChartColumnsResponse> {
+    return this.http.get<ChartColumnsResponse>(
+      `${this.chartsBase}/history/${params.symbol}/columns`,
+      { params: this.historyParams(params) }
+    );
+  }
+
+  getHistoryBatch(
+    symbols: string[],
+    resolution: string,
+    from_ts?: number,
+    to_ts?: number
+  ): Observable<ChartBatchResponse> {
+    return this.http.post<ChartBatchResponse>(
+      `${this.chartsBase}/history:batch`,
+      { symbols, resolution, from_ts, to_ts }
+    );
+  }
+
+  private historyParams(params: ChartParams): HttpParams {
     let httpParams = new HttpParams()
       .set('resolution', params.resolution);
 
@@ -29,10 +57,7 @@ export class ChartsApiService {
       httpParams = httpParams.set('to_ts', params.to_ts.toString());
     }
 
-    return this.http.get<ChartResponse>(
-      `${this.chartsBase}/history/${params.symbol}`,
-      { params: httpParams }
-    );
+    return httpParams;
   }
 
   getAnalysisPackage(params: ChartParams): Observable<EquityAnalysisPackage> {
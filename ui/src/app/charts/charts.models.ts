@@ -12,6 +12,28 @@ export interface ChartResponse {
   bars: Bar[];
 }
 
+/** Columnar history: parallel arrays, one entry per bar. */
+export interface ChartColumnsResponse {
+  s: string;
+  t: number[];
+  o: number[];
+  h: number[];
+  l: number[];
+  c: number[];
+  v: number[];
+}
+
+export interface ChartBatchItem {
+  symbol: string;
+  status: 'ok' | 'unavailable';
+  bars: Bar[];
+  detail?: string;
+}
+
+export interface ChartBatchResponse {
+  items: ChartBatchItem[];
+}
+
 export interface ChartParams {
   symbol: string;
   resolution: string;